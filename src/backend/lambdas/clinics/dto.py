@@ -15,6 +15,7 @@ class ClinicsQueryDTO:
     clinica_id: str | None
     page: int
     page_size: int
+    cursor: str | None = None
 
     @classmethod
     def from_event(cls, event):
@@ -25,6 +26,7 @@ class ClinicsQueryDTO:
         clinica_id = event_utils.optional_param(params, "clinicaId")
         page = event_utils.get_int_param(params, "page", default=1, minimum=1)
         page_size = event_utils.get_int_param(params, "pageSize", default=10, minimum=1)
+        cursor = event_utils.optional_param(params, "cursor")
         if clinica_id and (ubigeo_id or especialidad_id or seguro_id):
             raise ValidationError("When clinicaId is provided, remove other filters")
-        return cls(ubigeo_id, especialidad_id, seguro_id, clinica_id, page, page_size)
+        return cls(ubigeo_id, especialidad_id, seguro_id, clinica_id, page, page_size, cursor)
@@ -4,10 +4,25 @@ from __future__ import annotations
 from typing import Dict, List
 
 from shared.exceptions import ValidationError
+from shared.pagination import paginate
 from dto import ClinicsQueryDTO
 from repositories.clinics_repo import ClinicsRepository
 from repositories.ubigeo_repo import UbigeoRepository
 
+# Attributes _to_response_model renders; everything else is left unread
+CLINIC_FIELDS = (
+    "clinicaId",
+    "nombreClinica",
+    "ubicacion",
+    "direccion",
+    "ubigeoId",
+    "especialidadIds",
+    "seguroIds",
+    "doctorCount",
+    "url",
+    "urlLandingPage",
+)
+
 
 class ClinicsService:
     def __init__(self, clinics_repo: ClinicsRepository | None = None, ubigeo_repo: UbigeoRepository | None = None):
@@ -25,18 +40,16 @@ class ClinicsService:
             "clinicaId": dto.clinica_id,
         }
 
-        clinics = self._clinics_repo.list_clinics(filters)
-        total = len(clinics)
-        start = (dto.page - 1) * dto.page_size
-        end = start + dto.page_size
-        paged = clinics[start:end]
+        paged, pagination = paginate(
+            lambda limit, resume: self._clinics_repo.list_clinics(filters, limit, fields=CLINIC_FIELDS, resume=resume),
+            self._clinics_repo.resume_token,
+            filters,
+            dto.page,
+            dto.page_size,
+            dto.cursor,
+        )
         items = [self._to_response_model(clinic) for clinic in paged]
-        return {
-            "items": items,
-            "page": dto.page,
-            "pageSize": dto.page_size,
-            "total": total,
-        }
+        return {"items": items, **pagination}
 
     @staticmethod
     def _to_response_model(clinic: Dict[str, str]) -> Dict[str, object]:
@@ -49,5 +62,6 @@ class ClinicsService:
             "ubigeoId": clinic["ubigeoId"],
             "especialidadIds": clinic.get("especialidadIds", []),
             "seguroIds": clinic.get("seguroIds", []),
+            "doctorCount": clinic.get("doctorCount"),
             "url": clinic.get("url") or clinic.get("urlLandingPage", ""),
         }
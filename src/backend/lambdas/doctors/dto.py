@@ -14,6 +14,7 @@ class DoctorsQueryDTO:
     rimac_ensured: bool | None
     page: int
     page_size: int
+    cursor: str | None = None
 
     @classmethod
     def from_event(cls, event):
@@ -29,4 +30,5 @@ class DoctorsQueryDTO:
             rimac_ensured=rimac_ensured,
             page=event_utils.get_int_param(params, "page", default=1, minimum=1),
             page_size=event_utils.get_int_param(params, "pageSize", default=10, minimum=1),
+            cursor=event_utils.optional_param(params, "cursor"),
         )
@@ -4,11 +4,28 @@ from __future__ import annotations
 from typing import Dict, List
 
 from shared.exceptions import ValidationError
+from shared.pagination import paginate
 from dto import DoctorsQueryDTO
 from repositories.clinics_repo import ClinicsRepository
 from repositories.doctors_repo import DoctorsRepository
 from repositories.specialties_repo import SpecialtiesRepository
 
+# Attributes _to_response_model renders; everything else is left unread
+DOCTOR_FIELDS = (
+    "doctorId",
+    "nombreCompleto",
+    "nombres",
+    "apellidoPaterno",
+    "apellidoMaterno",
+    "photoUrl",
+    "fotoUrl",
+    "especialidadId",
+    "clinicaId",
+    "clinicaIds",
+)
+CLINIC_FIELDS = ("clinicaId", "nombreClinica")
+SPECIALTY_FIELDS = ("especialidadId", "nombre")
+
 
 class DoctorsService:
     def __init__(
@@ -28,34 +45,48 @@ class DoctorsService:
             "doctorId": dto.doctor_id,
             "rimacEnsured": dto.rimac_ensured,
         }
-        doctors = self._doctors_repo.list_doctors(filters)
-        total = len(doctors)
-        start = (dto.page - 1) * dto.page_size
-        end = start + dto.page_size
-        paged = doctors[start:end]
-        items = [self._to_response_model(doctor) for doctor in paged]
+        paged, pagination = paginate(
+            lambda limit, resume: self._doctors_repo.list_doctors(filters, limit, fields=DOCTOR_FIELDS, resume=resume),
+            self._doctors_repo.resume_token,
+            filters,
+            dto.page,
+            dto.page_size,
+            dto.cursor,
+        )
+
+        # Resolve every clinic and specialty of the page in one batch each
+        clinics = self._clinics_repo.get_clinics_many(
+            (self._primary_clinic_id(doctor) for doctor in paged), fields=CLINIC_FIELDS
+        )
+        specialties = self._specialties_repo.get_specialties_many(
+            (doctor.get("especialidadId") for doctor in paged), fields=SPECIALTY_FIELDS
+        )
+        items = [self._to_response_model(doctor, clinics, specialties) for doctor in paged]
         if dto.doctor_id and not items:
             raise ValidationError("Doctor not found")
-        return {
-            "items": items,
-            "page": dto.page,
-            "pageSize": dto.page_size,
-            "total": total,
-        }
+        return {"items": items, **pagination}
 
-    def _to_response_model(self, doctor: Dict[str, object]) -> Dict[str, object]:
+    @staticmethod
+    def _primary_clinic_id(doctor: Dict[str, object]) -> str | None:
         # Handle both old format (clinicaId) and new format (clinicaIds array)
-        clinica_id = None
         if "clinicaId" in doctor:
-            clinica_id = doctor["clinicaId"]
-        elif "clinicaIds" in doctor and doctor["clinicaIds"]:
-            clinica_id = doctor["clinicaIds"][0] if isinstance(doctor["clinicaIds"], list) else doctor["clinicaIds"]
-        
-        clinic = self._clinics_repo.get_clinic(clinica_id) if clinica_id else None
+            return doctor["clinicaId"]
+        if "clinicaIds" in doctor and doctor["clinicaIds"]:
+            return doctor["clinicaIds"][0] if isinstance(doctor["clinicaIds"], list) else doctor["clinicaIds"]
+        return None
+
+    def _to_response_model(
+        self,
+        doctor: Dict[str, object],
+        clinics: Dict[str, Dict[str, object]],
+        specialties: Dict[str, Dict[str, object]],
+    ) -> Dict[str, object]:
+        clinica_id = self._primary_clinic_id(doctor)
+        clinic = clinics.get(clinica_id) if clinica_id else None
         
         # Use especialidadId (the actual field in the data)
         especialidad_id = doctor.get("especialidadId")
-        specialty = self._specialties_repo.list_specialties(especialidad_id) if especialidad_id else []
+        specialty = specialties.get(especialidad_id) if especialidad_id else None
         
         # Handle both nombreCompleto and separated name fields
         doctor_name = doctor.get("nombreCompleto")
@@ -70,6 +101,6 @@ class DoctorsService:
             "doctorName": doctor_name,
             "clinicId": clinic["clinicaId"] if clinic else None,
             "clinicName": clinic["nombreClinica"] if clinic else None,
-            "especialidad": specialty[0]["nombre"] if specialty else None,
+            "especialidad": specialty["nombre"] if specialty else None,
             "photoUrl": doctor.get("photoUrl") or doctor.get("fotoUrl"),
         }
@@ -5,23 +5,48 @@ from dataclasses import dataclass
 
 from shared import event_utils
 from shared.exceptions import ValidationError
+from shared.repositories.autocomplete_index import SUGGESTION_TYPES
+from shared.repositories.doctor_sort import SORT_KEYS
+from shared.repositories.facets import FACETS
+from shared.repositories.specialty_resolver import MAX_QUERY_LENGTH
+from shared.repositories.ubigeo_graph import MAX_RADIUS
+from shared.text import normalize
+
+# Largest k an autocomplete request may ask for
+MAX_SUGGESTIONS = 20
+# Most searches one batch request may carry
+MAX_BATCH_QUERIES = 20
 
 
 @dataclass
 class SearchDoctorsQueryDTO:
-    ubigeo_id: str | None
-    especialidad_id: str | None
-    seguro_id: str | None
+    # Filters listing several values (comma-separated) match any of them
+    ubigeo_ids: tuple[str, ...] | None
+    especialidad_ids: tuple[str, ...] | None
+    seguro_ids: tuple[str, ...] | None
     rimac_ensured: bool | None
     page: int
     page_size: int
+    cursor: str | None = None
+    radius: int = 0
+    query: str | None = None
+    especialidad_text: str | None = None
+    facets: tuple[str, ...] = ()
+    sort: str | None = None
 
     @classmethod
     def from_event(cls, event):
         params = event_utils.get_query_params(event)
-        ubigeo_id = event_utils.optional_param(params, "ubigeoId")
-        especialidad_id = event_utils.optional_param(params, "especialidadId")
-        seguro_id = event_utils.optional_param(params, "seguroId")
+        ubigeo_ids = event_utils.get_list_param(params, "ubigeoId")
+        especialidad_ids = event_utils.get_list_param(params, "especialidadId")
+        # Free-text specialty, resolved to an id by the service; especialidadId wins when both are given
+        especialidad_text = None if especialidad_ids else event_utils.optional_param(params, "especialidad")
+        if especialidad_text is not None and len(normalize(especialidad_text)) > MAX_QUERY_LENGTH:
+            raise ValidationError(f"Parameter especialidad must have at most {MAX_QUERY_LENGTH} characters")
+        seguro_ids = event_utils.get_list_param(params, "seguroId")
+        query = event_utils.optional_param(params, "q")
+        if query is not None and len(normalize(query)) < 2:
+            raise ValidationError("Parameter q must have at least 2 letters or digits")
         
         rimac_param = event_utils.optional_param(params, "rimacEnsured")
         rimac_ensured = None
@@ -29,9 +54,139 @@ class SearchDoctorsQueryDTO:
             rimac_ensured = rimac_param.lower() in ("true", "1", "yes")
         
         # Require at least ONE search criterion
-        if not ubigeo_id and not especialidad_id and not seguro_id and rimac_ensured is None:
-            raise ValidationError("At least one search criterion required: ubigeoId, especialidadId, seguroId, or rimacEnsured")
+        if not (ubigeo_ids or especialidad_ids or especialidad_text or seguro_ids or query) and rimac_ensured is None:
+            raise ValidationError(
+                "At least one search criterion required: ubigeoId, especialidadId, especialidad, seguroId, rimacEnsured, or q"
+            )
         
         page = event_utils.get_int_param(params, "page", default=1, minimum=1)
         page_size = event_utils.get_int_param(params, "pageSize", default=10, minimum=1)
-        return cls(ubigeo_id, especialidad_id, seguro_id, rimac_ensured, page, page_size)
+        cursor = event_utils.optional_param(params, "cursor")
+
+        # expand=true is shorthand for radius=1
+        expand_param = event_utils.optional_param(params, "expand")
+        default_radius = 1 if expand_param and expand_param.lower() in ("true", "1", "yes") else 0
+        radius = event_utils.get_int_param(params, "radius", default=default_radius, minimum=0)
+        if radius > MAX_RADIUS:
+            raise ValidationError(f"Parameter radius must be <= {MAX_RADIUS}")
+        if radius and not ubigeo_ids:
+            raise ValidationError("radius requires ubigeoId")
+        if radius and query:
+            raise ValidationError("radius cannot be combined with q")
+        facets = event_utils.get_list_param(params, "facets", allowed=FACETS) or ()
+
+        sort = event_utils.optional_param(params, "sort")
+        if sort is not None and sort not in SORT_KEYS:
+            raise ValidationError(f"Parameter sort must be one of: {', '.join(SORT_KEYS)}")
+        if sort and (query or radius):
+            raise ValidationError("sort cannot be combined with q or radius")
+        return cls(
+            ubigeo_ids,
+            especialidad_ids,
+            seguro_ids,
+            rimac_ensured,
+            page,
+            page_size,
+            cursor,
+            radius,
+            query,
+            especialidad_text,
+            facets,
+            sort,
+        )
+
+    def cache_key(self) -> tuple:
+        """Identify the matches of this query: its filters, without paging, facets or raw text."""
+        return (
+            self.ubigeo_ids,
+            self.especialidad_ids,
+            self.seguro_ids,
+            self.rimac_ensured,
+            self.radius,
+            normalize(self.query) if self.query else None,
+            self.sort,
+        )
+
+
+@dataclass
+class SearchBatchDTO:
+    queries: tuple[SearchDoctorsQueryDTO, ...]
+
+    @classmethod
+    def from_event(cls, event):
+        """Parse ``{"queries": [{...}, ...]}``, where each entry holds the query parameters of one search."""
+        body = event_utils.get_json_body(event)
+        entries = body.get("queries") if isinstance(body, dict) else None
+        if not isinstance(entries, list) or not entries:
+            raise ValidationError("Body must have a non-empty queries array")
+        if len(entries) > MAX_BATCH_QUERIES:
+            raise ValidationError(f"A batch may hold at most {MAX_BATCH_QUERIES} queries")
+
+        queries = []
+        for position, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                raise ValidationError(f"queries[{position}] must be an object")
+            try:
+                queries.append(SearchDoctorsQueryDTO.from_event({"queryStringParameters": _query_params(entry)}))
+            except ValidationError as exc:
+                raise ValidationError(f"queries[{position}]: {exc}") from exc
+        return cls(tuple(queries))
+
+
+def _query_params(entry: dict) -> dict:
+    # JSON lists, booleans and numbers take their query-string spelling
+    params = {}
+    for name, value in entry.items():
+        if value is None:
+            continue
+        if isinstance(value, list):
+            value = ",".join(str(item) for item in value)
+        elif isinstance(value, bool):
+            value = "true" if value else "false"
+        params[name] = str(value)
+    return params
+
+
+@dataclass
+class AutocompleteQueryDTO:
+    prefix: str
+    limit: int
+    types: tuple[str, ...] | None = None
+
+    @classmethod
+    def from_event(cls, event):
+        params = event_utils.get_query_params(event)
+        prefix = event_utils.optional_param(params, "q")
+        if not prefix or not normalize(prefix):
+            raise ValidationError("Parameter q is required")
+        limit = event_utils.get_int_param(params, "k", default=8, minimum=1)
+        if limit > MAX_SUGGESTIONS:
+            raise ValidationError(f"Parameter k must be <= {MAX_SUGGESTIONS}")
+
+        types = event_utils.get_list_param(params, "types", allowed=SUGGESTION_TYPES)
+        return cls(prefix, limit, types)
+
+
+@dataclass
+class CoverageQueryDTO:
+    # Filters use the same names as /search/doctors and also accept IN-lists
+    filters: dict
+    group_by: tuple[str, ...]
+
+    @classmethod
+    def from_event(cls, event):
+        params = event_utils.get_query_params(event)
+        filters = {}
+        for name in FACETS:
+            values = event_utils.get_list_param(params, name)
+            if values:
+                filters[name] = values
+        rimac_param = event_utils.optional_param(params, "rimacEnsured")
+        if rimac_param is not None:
+            filters["rimacEnsured"] = rimac_param.lower() in ("true", "1", "yes")
+
+        group_by = event_utils.get_list_param(params, "groupBy", allowed=FACETS) or ("especialidadId",)
+        through_clinics = [name for name in group_by if name != "especialidadId"]
+        if len(through_clinics) > 1:
+            raise ValidationError("Parameter groupBy takes especialidadId and at most one of clinicaId, seguroId, ubigeoId")
+        return cls(filters, group_by)
@@ -1,23 +1,39 @@
 """Lambda handler for Search API doctor cards."""
 from __future__ import annotations
 
+import json
 from typing import Any, Dict
 
 from shared.exceptions import ValidationError
 from shared.http import json_response
-from dto import SearchDoctorsQueryDTO
+from dto import AutocompleteQueryDTO, CoverageQueryDTO, SearchBatchDTO, SearchDoctorsQueryDTO
+from services.autocomplete_service import AutocompleteService
 from services.search_service import SearchService
 
 service = SearchService()
+autocomplete_service = AutocompleteService()
 
 
 def handler(event: Dict[str, Any], _context: Any) -> Dict[str, Any]:
+    resource = (event.get("resource") or event.get("path") or "").lower()
     try:
-        dto = SearchDoctorsQueryDTO.from_event(event)
-        result = service.search_doctors(dto)
+        if resource.endswith("autocomplete"):
+            result = autocomplete_service.autocomplete(AutocompleteQueryDTO.from_event(event))
+        elif resource.endswith("batch"):
+            result = service.search_batch(SearchBatchDTO.from_event(event))
+        elif resource.endswith("coverage"):
+            result = service.coverage(CoverageQueryDTO.from_event(event))
+        else:
+            dto = SearchDoctorsQueryDTO.from_event(event)
+            result = service.search_doctors(dto)
         return json_response(200, result)
     except ValidationError as exc:
         return json_response(400, {"message": str(exc)})
     except Exception as exc:  # pragma: no cover - defensive logging placeholder
         print(f"[Search] Unexpected error: {exc}")
         return json_response(500, {"message": "Internal server error"})
+    finally:
+        # One structured line per invocation, for CloudWatch Logs Insights
+        stats = service.cache_stats()
+        if stats:
+            print(json.dumps({"searchCache": stats}))
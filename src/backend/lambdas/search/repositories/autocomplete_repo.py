@@ -0,0 +1,3 @@
+"""Re-export shared AutocompleteRepository for Search Lambda."""
+
+from shared.repositories.autocomplete_repo import AutocompleteRepository
@@ -0,0 +1,3 @@
+"""Re-export shared DoctorCardsRepository for Search Lambda."""
+
+from shared.repositories.doctor_cards_repo import DoctorCardsRepository, doctor_cards_enabled
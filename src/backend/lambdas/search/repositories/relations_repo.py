@@ -0,0 +1,3 @@
+"""Re-export shared RelationsRepository for Search Lambda."""
+
+from shared.repositories.relations_repo import RelationsRepository
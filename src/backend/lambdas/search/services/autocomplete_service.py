@@ -0,0 +1,16 @@
+"""Type-ahead suggestions for the search box."""
+from __future__ import annotations
+
+from typing import Dict
+
+from dto import AutocompleteQueryDTO
+from repositories.autocomplete_repo import AutocompleteRepository
+
+
+class AutocompleteService:
+    def __init__(self, autocomplete_repo: AutocompleteRepository | None = None):
+        self._autocomplete_repo = autocomplete_repo or AutocompleteRepository()
+
+    def autocomplete(self, dto: AutocompleteQueryDTO) -> Dict[str, object]:
+        suggestions = self._autocomplete_repo.complete(dto.prefix, dto.limit, dto.types)
+        return {"items": [suggestion.to_dict() for suggestion in suggestions]}
@@ -1,16 +1,95 @@
 """Search service for doctor cards."""
 from __future__ import annotations
 
-from typing import Dict, List
+import copy
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from shared.exceptions import ValidationError
-from dto import SearchDoctorsQueryDTO
+from shared.pagination import paginate
+from shared.repositories.doctor_cards import card_id, pick_clinic_id, render_card
+from shared.repositories.doctor_sort import sort_key, top_doctors
+from shared.repositories.facets import count_facets
+from shared.result_cache import ResultCache, result_cache_enabled
+from shared.text import normalize
+from dto import CoverageQueryDTO, SearchBatchDTO, SearchDoctorsQueryDTO
 from repositories.clinics_repo import ClinicsRepository
+from repositories.doctor_cards_repo import DoctorCardsRepository, doctor_cards_enabled
 from repositories.doctors_repo import DoctorsRepository
 from repositories.insurers_repo import InsurersRepository
+from repositories.relations_repo import RelationsRepository
 from repositories.specialties_repo import SpecialtiesRepository
 from repositories.ubigeo_repo import UbigeoRepository
 
+# Attributes a card is rendered from; everything else is left unread
+DOCTOR_CARD_FIELDS = (
+    "doctorId",
+    "nombreCompleto",
+    "nombres",
+    "apellidoPaterno",
+    "apellidoMaterno",
+    "photoUrl",
+    "fotoUrl",
+    "especialidadId",
+    "clinicaId",
+    "clinicaIds",
+)
+CLINIC_CARD_FIELDS = ("clinicaId", "nombreClinica", "ubicacion", "direccion", "seguroIds")
+
+
+@dataclass
+class _SearchPlan:
+    """How one search mode reads, pages and renders its hits."""
+
+    scope: Dict[str, object]
+    fetch: Callable[[Optional[int], Optional[Dict[str, Any]]], List[Any]]
+    resume_token: Callable[[Any], Dict[str, Any]]
+    # hit -> (doctor, cardId, extra card fields)
+    card: Callable[[Any], Tuple[Dict[str, object], str, Dict[str, object]]]
+    doctor_of: Callable[[Any], Dict[str, Any]] = lambda hit: hit
+    facet_counts: Callable[[Tuple[str, ...]], Dict[str, Dict[str, int]]] | None = None
+    # Number of matches without reading them, so page-number requests fetch one page only
+    count: Callable[[], int] | None = None
+    # False when ``fetch(None, None)`` reads every match from the tables where a page reads one page
+    cacheable: bool = True
+
+
+class _Matches:
+    """Every hit of one query in order, paged in memory; shared by requests once cached."""
+
+    def __init__(self, plan: _SearchPlan, hits: List[Any]):
+        self.plan = plan
+        self.hits = hits
+        self._positions: Dict[tuple, int] | None = None
+        self._facets: Dict[Tuple[str, ...], Dict[str, Dict[str, int]]] = {}
+
+    def fetch(self, limit: Optional[int], resume: Optional[Dict[str, Any]]) -> List[Any]:
+        start = 0
+        if resume is not None:
+            if self._positions is None:
+                self._positions = {
+                    _resume_key(self.plan.resume_token(hit)): position + 1 for position, hit in enumerate(self.hits)
+                }
+            start = self._positions.get(_resume_key(resume))
+            if start is None:
+                # The resume point left the matches; the plan reads on from where it sorted
+                return self.plan.fetch(limit, resume)
+        remaining = self.hits[start:]
+        return remaining[:limit] if limit is not None else remaining
+
+    def facets(self, names: Tuple[str, ...], count) -> Dict[str, Dict[str, int]]:
+        """Return the facet counters for ``names``, counted once per entry with ``count(names, plan, hits)``."""
+        counts = self._facets.get(names)
+        if counts is None:
+            counts = count(names, self.plan, self.hits)
+            self._facets[names] = counts
+        return counts
+
+
+def _resume_key(token: Dict[str, Any]) -> tuple:
+    # Index positions ("p") go stale across reloads and sort keys ("o") follow from the hit; the rest identify it
+    return tuple(sorted((key, value) for key, value in token.items() if key not in ("p", "o")))
+
 
 class SearchService:
     def __init__(
@@ -20,139 +99,312 @@ class SearchService:
         specialties_repo: SpecialtiesRepository | None = None,
         insurers_repo: InsurersRepository | None = None,
         ubigeo_repo: UbigeoRepository | None = None,
+        doctor_cards_repo: DoctorCardsRepository | None = None,
+        relations_repo: RelationsRepository | None = None,
     ):
         self._doctors_repo = doctors_repo or DoctorsRepository()
         self._clinics_repo = clinics_repo or ClinicsRepository()
         self._specialties_repo = specialties_repo or SpecialtiesRepository()
         self._insurers_repo = insurers_repo or InsurersRepository()
         self._ubigeo_repo = ubigeo_repo or UbigeoRepository()
+        self._doctor_cards_repo = doctor_cards_repo or DoctorCardsRepository()
+        self._relations_repo = relations_repo or RelationsRepository()
+        self._result_cache: ResultCache[_Matches] | None = ResultCache() if result_cache_enabled() else None
+        # Added to the scope of every cursor handed out
+        self._cursor_scope: Dict[str, object] = {}
 
     def search_doctors(self, dto: SearchDoctorsQueryDTO) -> Dict[str, object]:
-        # Validate ubigeo if provided
-        if dto.ubigeo_id and not self._ubigeo_repo.exists(dto.ubigeo_id):
-            raise ValidationError("Invalid ubigeoId")
+        # Validate ubigeos if provided
+        unknown = [ubigeo_id for ubigeo_id in dto.ubigeo_ids or () if not self._ubigeo_repo.exists(ubigeo_id)]
+        if unknown:
+            raise ValidationError(f"Invalid ubigeoId: {', '.join(unknown)}")
+
+        # Resolve free-text specialties ("cardiologo") to the closest especialidadId
+        resolved_ids = None
+        if dto.especialidad_text:
+            resolved_ids = self._specialties_repo.resolve(dto.especialidad_text)
+            if not resolved_ids:
+                return {**self._empty_payload(dto), "resolvedEspecialidadIds": []}
+            dto = replace(dto, especialidad_ids=(resolved_ids[0],))
+        result = self._search(dto)
+        if resolved_ids is not None:
+            result["resolvedEspecialidadIds"] = resolved_ids
+        return result
+
+    def search_batch(self, dto: SearchBatchDTO) -> Dict[str, object]:
+        """Answer every search of the batch, in order, against one read of the doctors data."""
+        service = self._pinned() if len(dto.queries) > 1 else self
+        results = []
+        for position, query in enumerate(dto.queries):
+            try:
+                results.append(service.search_doctors(query))
+            except ValidationError as exc:
+                raise ValidationError(f"queries[{position}]: {exc}") from exc
+        return {"results": results}
+
+    def _pinned(self) -> "SearchService":
+        # With the container index every search already shares its snapshot
+        doctors_repo = self._doctors_repo.pinned()
+        if doctors_repo is self._doctors_repo:
+            return self
+        service = copy.copy(self)
+        service._doctors_repo = doctors_repo
+        # The one-off index is dropped with the batch, so its matches are not cached either
+        service._result_cache = None
+        # It lists matches in table order, not in the order of the per-search reads, so its
+        # cursors resume only inside another batch
+        service._cursor_scope = {**self._cursor_scope, "batch": True}
+        return service
+
+    def coverage(self, dto: CoverageQueryDTO) -> Dict[str, object]:
+        """Count the doctors matching ``dto.filters`` per ``dto.group_by`` group, from the sparse relations."""
+        unknown = [ubigeo_id for ubigeo_id in dto.filters.get("ubigeoId", ()) if not self._ubigeo_repo.exists(ubigeo_id)]
+        if unknown:
+            raise ValidationError(f"Invalid ubigeoId: {', '.join(unknown)}")
+        total, groups = self._relations_repo.coverage(dto.filters, dto.group_by)
+        return {"groupBy": list(dto.group_by), "totalDoctors": total, "groups": groups}
 
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit and miss counters of the query result cache (empty when it is disabled)."""
+        return self._result_cache.stats() if self._result_cache is not None else {}
+
+    def _search(self, dto: SearchDoctorsQueryDTO) -> Dict[str, object]:
+        if self._result_cache is None:
+            return self._respond(dto, self._plan(dto))
+
+        # Page flips and repeated queries reuse every match of the first request
+        key = dto.cache_key()
+        version = self._doctors_repo.dataset_version()
+        matches = self._result_cache.get(key, version)
+        if matches is None:
+            plan = self._plan(dto)
+            if not plan.cacheable and not dto.facets:
+                return self._respond(dto, plan)
+            matches = _Matches(plan, plan.fetch(None, None))
+            self._result_cache.put(key, version, matches)
+        return self._respond(dto, matches.plan, matches)
+
+    def _respond(self, dto: SearchDoctorsQueryDTO, plan: _SearchPlan, matches: _Matches | None = None) -> Dict[str, object]:
+        hits, pagination = self._paginate(dto, plan, matches)
+        rows = [plan.card(hit) for hit in hits]
+        cards = self._cards([(doctor, key) for doctor, key, _ in rows])
+        items = [{**card, **extra} for card, (_, _, extra) in zip(cards, rows)]
+        return {"items": items, **pagination}
+
+    def _plan(self, dto: SearchDoctorsQueryDTO) -> _SearchPlan:
         # Step 1: Get clinics (filter by ubigeo and/or seguro if provided)
         clinic_filters = {}
-        if dto.ubigeo_id:
-            clinic_filters["ubigeoId"] = dto.ubigeo_id
-        if dto.seguro_id:
-            clinic_filters["seguroId"] = dto.seguro_id
-        
+        if dto.ubigeo_ids:
+            clinic_filters["ubigeoId"] = dto.ubigeo_ids
+        if dto.seguro_ids:
+            clinic_filters["seguroId"] = dto.seguro_ids
+
+        # Step 2: Get doctors (filter by especialidad and/or rimacEnsured if provided)
+        doctor_filters = {}
+        if dto.especialidad_ids:
+            doctor_filters["especialidadId"] = dto.especialidad_ids
+        if dto.rimac_ensured is not None:
+            doctor_filters["rimacEnsured"] = dto.rimac_ensured
+
+        if dto.radius:
+            return self._plan_nearby(dto, doctor_filters)
+
         # If we have clinic filters, apply them; otherwise get all clinics
         if clinic_filters:
-            clinics = self._clinics_repo.list_clinics(clinic_filters)
+            clinics = self._clinics_repo.list_clinics(clinic_filters, fields=CLINIC_CARD_FIELDS)
             clinic_ids = {clinic["clinicaId"] for clinic in clinics}
         else:
             # No clinic filters - we'll filter by doctors only
-            clinics = self._clinics_repo.list_clinics({})
+            clinics = self._clinics_repo.list_clinics({}, fields=CLINIC_CARD_FIELDS)
             clinic_ids = None  # Will skip clinic filtering
-
-        # Step 2: Get doctors (filter by especialidad and/or rimacEnsured if provided)
-        doctor_filters = {}
-        if dto.especialidad_id:
-            doctor_filters["especialidadId"] = dto.especialidad_id
-        if dto.rimac_ensured is not None:
-            doctor_filters["rimacEnsured"] = dto.rimac_ensured
-        
-        doctors = self._doctors_repo.list_doctors(doctor_filters)
-        
-        # Step 3: Filter doctors whose clinicaIds intersect with clinic_ids (if clinic filters were applied)
-        if clinic_ids is not None:
-            filtered_doctors = []
-            for doctor in doctors:
-                if "clinicaId" in doctor and doctor["clinicaId"] in clinic_ids:
-                    filtered_doctors.append(doctor)
-                elif "clinicaIds" in doctor:
-                    clinica_ids_list = doctor["clinicaIds"] if isinstance(doctor["clinicaIds"], list) else [doctor["clinicaIds"]]
-                    if any(cid in clinic_ids for cid in clinica_ids_list):
-                        filtered_doctors.append(doctor)
-            doctors = filtered_doctors
-        
-        total = len(doctors)
-        start = (dto.page - 1) * dto.page_size
-        end = start + dto.page_size
-        paged = doctors[start:end]
-
-        # Get specialty name if filtering by specialty
-        specialty_name = None
-        if dto.especialidad_id:
-            specialty = self._specialties_repo.list_specialties(dto.especialidad_id)
-            specialty_name = specialty[0]["nombre"] if specialty else None
-        
-        insurer_names = {ins["seguroId"]: ins["nombre"] for ins in self._insurers_repo.list_insurers(None)}
         clinic_lookup = {clinic["clinicaId"]: clinic for clinic in clinics}
 
-        cards = [
-            self._to_doctor_card(doctor, clinic_lookup, specialty_name, insurer_names)
-            for doctor in paged
-        ]
+        if dto.query:
+            return self._plan_by_name(dto, clinic_filters, clinic_lookup, clinic_ids, doctor_filters)
 
-        return {
-            "items": cards,
-            "page": dto.page,
-            "pageSize": dto.page_size,
-            "total": total,
+        # Step 3: Restrict doctors to the filtered clinics (if clinic filters were applied).
+        # With the in-memory index every filter is one bitmap AND in the planner.
+        use_planner = self._doctors_repo.planner() is not None
+        filters = {**clinic_filters, **doctor_filters}
+
+        def fetch(limit, resume):
+            if use_planner:
+                return self._doctors_repo.search_doctors(filters, limit, resume=resume, sort=dto.sort)
+            if dto.sort:
+                # Without the index there is no presorted order: read every match, then select the page
+                doctors = fetch_unsorted(None, None)
+                return top_doctors(doctors, dto.sort, limit, after=resume.get("o") if resume else None)
+            return fetch_unsorted(limit, resume)
+
+        def fetch_unsorted(limit, resume):
+            if clinic_ids is not None:
+                return self._doctors_repo.list_doctors_in_clinics(
+                    clinic_ids, doctor_filters, limit, fields=DOCTOR_CARD_FIELDS, resume=resume
+                )
+            return self._doctors_repo.list_doctors(doctor_filters, limit, fields=DOCTOR_CARD_FIELDS, resume=resume)
+
+        def card(doctor):
+            return doctor, card_id(doctor["doctorId"], pick_clinic_id(doctor, clinic_lookup)), {}
+
+        facet_counts = count = None
+        if use_planner:
+            def facet_counts(names):
+                return self._doctors_repo.facet_counts(filters, names)
+
+            def count():
+                return self._doctors_repo.count_doctors(filters)
+
+        def resume_token(doctor):
+            token = self._doctors_repo.resume_token(doctor)
+            # The sort key lets a page resume in order without the index, even after its doctor is gone
+            return {**token, "o": sort_key(dto.sort)(doctor)} if dto.sort else token
+
+        # A cursor resumes within one order only
+        scope = {**filters, "sort": dto.sort}
+        return _SearchPlan(
+            scope,
+            fetch,
+            resume_token,
+            card,
+            facet_counts=facet_counts,
+            count=count,
+            # Unsorted pages without the index are limited table reads
+            cacheable=use_planner or dto.sort is not None,
+        )
+
+    def _paginate(
+        self, dto: SearchDoctorsQueryDTO, plan: _SearchPlan, matches: _Matches | None = None
+    ) -> Tuple[List[Any], Dict[str, object]]:
+        """Return one page of hits plus its pagination fields and, when asked, ``facets``.
+
+        ``matches`` pages hits already read. Otherwise ``plan.fetch`` reads the
+        page, and ``plan.facet_counts`` answers the facets without reading the
+        matches (planner bitmaps); failing that, every match is read once and
+        both the page and the facet counters come from that single read.
+        """
+        scope = {**plan.scope, **self._cursor_scope}
+        if matches is None:
+            if not dto.facets or plan.facet_counts is not None:
+                hits, pagination = paginate(
+                    plan.fetch, plan.resume_token, scope, dto.page, dto.page_size, dto.cursor, count=plan.count
+                )
+                if dto.facets:
+                    pagination = {**pagination, "facets": plan.facet_counts(dto.facets)}
+                return hits, pagination
+            matches = _Matches(plan, plan.fetch(None, None))
+
+        hits, pagination = paginate(matches.fetch, plan.resume_token, scope, dto.page, dto.page_size, dto.cursor)
+        if dto.facets:
+            pagination = {**pagination, "facets": matches.facets(dto.facets, self._count_facets)}
+        return hits, pagination
+
+    def _count_facets(self, names: Tuple[str, ...], plan: _SearchPlan, hits: List[Any]) -> Dict[str, Dict[str, int]]:
+        if plan.facet_counts is not None:
+            return plan.facet_counts(names)
+        clinics = {
+            clinic["clinicaId"]: clinic
+            for clinic in self._clinics_repo.list_clinics({}, fields=("clinicaId", "ubigeoId", "seguroIds"))
         }
+        return count_facets((plan.doctor_of(hit) for hit in hits), names, clinics)
 
-    def _to_doctor_card(
+    def _plan_by_name(
         self,
-        doctor: Dict[str, object],
+        dto: SearchDoctorsQueryDTO,
+        clinic_filters: Dict[str, object],
         clinic_lookup: Dict[str, Dict[str, object]],
-        specialty_name: str | None,
-        insurer_names: Dict[str, str],
-    ) -> Dict[str, object]:
-        # Handle both clinicaId (old) and clinicaIds (new array format)
-        clinica_id = None
-        if "clinicaId" in doctor:
-            clinica_id = doctor["clinicaId"]
-        elif "clinicaIds" in doctor and doctor["clinicaIds"]:
-            doctor_clinic_ids = doctor["clinicaIds"] if isinstance(doctor["clinicaIds"], list) else [doctor["clinicaIds"]]
-            # Pick the first clinic that exists in the clinic_lookup
-            # This ensures we show the correct clinic when filters are applied
-            for cid in doctor_clinic_ids:
-                if cid in clinic_lookup:
-                    clinica_id = cid
-                    break
-            # Fallback to first one if none found in lookup
-            if clinica_id is None and doctor_clinic_ids:
-                clinica_id = doctor_clinic_ids[0]
-        
-        clinic = clinic_lookup.get(clinica_id)
-        
-        # Build seguros list
-        seguros = []
-        if clinic:
-            for seguro_id in clinic.get("seguroIds", []):
-                seguros.append({
-                    "seguroId": seguro_id,
-                    "nombre": insurer_names.get(seguro_id, seguro_id),
-                })
-        
-        # Handle both nombreCompleto and separated name fields
-        doctor_name = doctor.get("nombreCompleto")
-        if not doctor_name:
-            nombres = doctor.get("nombres", "")
-            apellido_paterno = doctor.get("apellidoPaterno", "")
-            apellido_materno = doctor.get("apellidoMaterno", "")
-            doctor_name = f"{nombres} {apellido_paterno} {apellido_materno}".strip()
-        
-        # Handle both ubicacion and direccion
-        clinic_address = None
-        if clinic:
-            clinic_address = clinic.get("ubicacion") or clinic.get("direccion", "")
-        
+        clinic_ids: set | None,
+        doctor_filters: Dict[str, object],
+    ) -> _SearchPlan:
+        """Rank doctors by how closely their name matches ``dto.query``, within the other filters."""
+
+        def fetch(limit, resume):
+            return self._doctors_repo.search_names(
+                dto.query, doctor_filters, limit, clinic_ids=clinic_ids, fields=DOCTOR_CARD_FIELDS, resume=resume
+            )
+
+        def resume_token(hit):
+            score, doctor = hit
+            return {"k": doctor["doctorId"], "s": score}
+
+        def card(hit):
+            score, doctor = hit
+            return doctor, card_id(doctor["doctorId"], pick_clinic_id(doctor, clinic_lookup)), {"score": round(score, 4)}
+
+        return _SearchPlan(
+            {"q": normalize(dto.query), **clinic_filters, **doctor_filters},
+            fetch,
+            resume_token,
+            card,
+            doctor_of=lambda hit: hit[1],
+        )
+
+    def _plan_nearby(self, dto: SearchDoctorsQueryDTO, doctor_filters: Dict[str, object]) -> _SearchPlan:
+        """Search ``dto.ubigeo_ids`` and the districts up to ``dto.radius`` hops away, nearest first."""
+        rings = self._ubigeo_repo.rings(dto.ubigeo_ids, dto.radius)
+        hop_by_ubigeo = {ubigeo_id: hop for hop, ring in enumerate(rings) for ubigeo_id in ring}
+
+        clinic_filters = {"seguroId": dto.seguro_ids} if dto.seguro_ids else {}
+        clinic_lookups: List[Dict[str, Dict[str, object]]] = [{} for _ in rings]
+        for clinic in self._clinics_repo.list_clinics(clinic_filters, fields=CLINIC_CARD_FIELDS + ("ubigeoId",)):
+            hop = hop_by_ubigeo.get(clinic.get("ubigeoId"))
+            if hop is not None:
+                clinic_lookups[hop][clinic["clinicaId"]] = clinic
+        clinic_rings = [list(lookup) for lookup in clinic_lookups]
+
+        def fetch(limit, resume):
+            return self._doctors_repo.search_doctors_near(
+                doctor_filters, clinic_rings, limit, fields=DOCTOR_CARD_FIELDS, resume=resume
+            )
+
+        def resume_token(hit):
+            hop, doctor = hit
+            return {**self._doctors_repo.resume_token(doctor), "h": hop}
+
+        def card(hit):
+            hop, doctor = hit
+            return doctor, card_id(doctor["doctorId"], pick_clinic_id(doctor, clinic_lookups[hop])), {"hops": hop}
+
+        return _SearchPlan(
+            {"ubigeoId": dto.ubigeo_ids, "radius": dto.radius, **clinic_filters, **doctor_filters},
+            fetch,
+            resume_token,
+            card,
+            doctor_of=lambda hit: hit[1],
+        )
+
+    def _cards(self, hits: List[Tuple[Dict[str, object], str]]) -> List[Dict[str, object]]:
+        """Return the card of each ``(doctor, cardId)`` pair.
+
+        Cards come pre-rendered from the doctor-cards view. Cards missing from it
+        (view disabled or not loaded yet) are rendered here from the joined tables.
+        """
+        card_ids = [key for _, key in hits]
+        cards = self._doctor_cards_repo.get_cards(card_ids) if doctor_cards_enabled() else {}
+        missing = [(doctor, key) for doctor, key in hits if key not in cards]
+        if missing:
+            cards.update(self._render_cards(missing))
+        return [cards[key] for key in card_ids]
+
+    def _render_cards(self, missing: List[Tuple[Dict[str, object], str]]) -> Dict[str, Dict[str, object]]:
+        clinic_ids = [key.split("#", 1)[1] for _, key in missing]
+        clinics = self._clinics_repo.get_clinics_many(clinic_ids, fields=CLINIC_CARD_FIELDS)
+        specialties = self._specialties_repo.get_specialties_many(
+            (doctor.get("especialidadId") for doctor, _ in missing), fields=("especialidadId", "nombre")
+        )
+        insurer_names = {ins["seguroId"]: ins["nombre"] for ins in self._insurers_repo.list_insurers(None)}
         return {
-            "doctorId": doctor["doctorId"],
-            "doctorName": doctor_name,
-            "photoUrl": doctor.get("photoUrl") or doctor.get("fotoUrl"),
-            "mainSpecialty": specialty_name,
-            "clinicId": clinic["clinicaId"] if clinic else None,
-            "clinicName": clinic["nombreClinica"] if clinic else None,
-            "clinicAddress": clinic_address,
-            "seguros": seguros,
+            key: render_card(
+                doctor,
+                clinics.get(clinica_id),
+                (specialties.get(doctor.get("especialidadId")) or {}).get("nombre"),
+                insurer_names,
+            )
+            for (doctor, key), clinica_id in zip(missing, clinic_ids)
         }
 
     @staticmethod
     def _empty_payload(dto: SearchDoctorsQueryDTO) -> Dict[str, object]:
-        return {"items": [], "page": dto.page, "pageSize": dto.page_size, "total": 0}
+        payload = {"items": [], "page": dto.page, "pageSize": dto.page_size, "total": 0, "nextCursor": None}
+        if dto.facets:
+            payload["facets"] = {name: {} for name in dto.facets}
+        return payload
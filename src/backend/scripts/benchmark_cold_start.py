@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Measure Lambda cold-start cost: handler import time and shared DynamoDB
+resource creation, each Lambda in a fresh interpreter.
+
+Handlers only build repositories at import time; the boto3 resource is created
+on the first request. No AWS access is needed, tables are never touched:
+
+    python3 scripts/benchmark_cold_start.py --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+LAMBDAS_DIR = BACKEND_DIR / "lambdas"
+LAMBDAS = ["clinics", "doctors", "especialidades", "seguros", "search"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import handler
+imported = time.perf_counter() - start
+from shared.backends.dynamodb import get_resource, resource_init_seconds
+get_resource()
+print(json.dumps({"import": imported, "resource": resource_init_seconds()}))
+"""
+
+
+def probe(lambda_name: str, region: str) -> dict:
+    env = {
+        "PYTHONPATH": f"{LAMBDAS_DIR / lambda_name}:{BACKEND_DIR}",
+        "AWS_DEFAULT_REGION": region,
+        "PATH": "/usr/bin:/bin",
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=LAMBDAS_DIR / lambda_name,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Lambda cold-start initialisation")
+    parser.add_argument("--lambdas", nargs="+", choices=LAMBDAS, default=LAMBDAS, help="Lambdas to measure")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per Lambda. Default: 5")
+    parser.add_argument("--region", default="us-east-1", help="AWS region for the resource. Default: us-east-1")
+    args = parser.parse_args()
+
+    print(f"{'lambda':>14}  {'import ms':>10}  {'resource ms':>12}")
+    for lambda_name in args.lambdas:
+        runs = [probe(lambda_name, args.region) for _ in range(args.repeat)]
+        imported = statistics.median(run["import"] for run in runs)
+        resource = statistics.median(run["resource"] for run in runs)
+        print(f"{lambda_name:>14}  {imported * 1000:>10.1f}  {resource * 1000:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
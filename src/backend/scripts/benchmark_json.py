@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Compare the JSON encoders behind ``shared.http.json_response`` on real payloads.
+
+Payloads are 100-card ``/search/doctors`` pages served by the in-memory
+backend from the production JSONL exports, plus clinic, ubigeo and doctor
+items parsed with ``Decimal`` numbers the way boto3 returns them:
+
+    python3 scripts/benchmark_json.py
+    python3 scripts/benchmark_json.py --repeat 2000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+TRANSFORMED_DATA_DIR = BACKEND_DIR.parent / "data" / "final_tables" / "transformed"
+
+SEARCHES = [
+    {"rimacEnsured": "false", "pageSize": "100"},
+    {"especialidadId": "44", "pageSize": "100", "facets": "clinicaId,ubigeoId"},
+    {"rimacEnsured": "false", "sort": "surname", "pageSize": "100", "page": "3"},
+]
+
+
+def read_items(filename: str, limit: int | None = None) -> list:
+    """Read a JSONL export with every number as ``Decimal``, like a DynamoDB read."""
+    with open(TRANSFORMED_DATA_DIR / filename, "r", encoding="utf-8") as handle:
+        items = [json.loads(line, parse_float=Decimal, parse_int=Decimal) for line in handle if line.strip()]
+    return items[:limit]
+
+
+def build_payloads() -> dict:
+    import handler  # noqa: E402  (needs the paths and backend set in main)
+    from dto import SearchDoctorsQueryDTO  # noqa: E402
+
+    payloads = {}
+    for params in SEARCHES:
+        dto = SearchDoctorsQueryDTO.from_event({"queryStringParameters": params})
+        payloads["search " + "&".join(f"{key}={value}" for key, value in params.items())] = handler.service.search_doctors(dto)
+    payloads["clinics (Decimal)"] = {"items": read_items("clinicas.jsonl")}
+    payloads["ubigeo (Decimal)"] = {"items": read_items("ubigeo.jsonl", 100)}
+    payloads["doctors (Decimal, set)"] = {
+        "items": [{**doctor, "clinicaIds": set(doctor.get("clinicaIds") or ())} for doctor in read_items("doctores.jsonl", 100)]
+    }
+    return payloads
+
+
+def time_encoder(encode, payload, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        encode(payload)
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the json_response encoders")
+    parser.add_argument("--repeat", type=int, default=500, help="Encodings per payload and encoder. Default: 500")
+    args = parser.parse_args()
+
+    os.environ.setdefault("REPOSITORY_BACKEND", "memory")
+    os.environ.setdefault("MEMORY_BACKEND_SOURCE", "jsonl")
+    sys.path.insert(0, str(BACKEND_DIR))
+    sys.path.insert(0, str(BACKEND_DIR / "lambdas" / "search"))
+    from shared.http import _orjson_encoder, dumps_stdlib  # noqa: E402
+
+    encoders = {"stdlib": dumps_stdlib}
+    fast = _orjson_encoder()
+    if fast is None:
+        print("orjson is not installed; timing the standard library only")
+    else:
+        encoders["orjson"] = fast
+
+    for name, payload in build_payloads().items():
+        outputs = {encoder: encode(payload) for encoder, encode in encoders.items()}
+        same = len({json.dumps(json.loads(text), sort_keys=True) for text in outputs.values()}) == 1
+        timings = {encoder: time_encoder(encode, payload, args.repeat) for encoder, encode in encoders.items()}
+        cells = "  ".join(f"{encoder}: {seconds * 1e6:8.1f} us" for encoder, seconds in timings.items())
+        speedup = f"  x{timings['stdlib'] / timings['orjson']:.1f}" if "orjson" in timings else ""
+        print(f"{name[:60]:60}  {len(outputs['stdlib']) / 1024:6.1f} KiB  {cells}{speedup}  same={same}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark the trigram doctor name index against a linear scan of normalized
+names, on the transformed JSONL data replicated to a target size:
+
+    python3 scripts/benchmark_name_search.py --doctors 34000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import shared helpers
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.repositories.name_index import NameIndex, doctor_full_name
+from shared.text import normalize
+
+TRANSFORMED_DATA_DIR = Path(__file__).parent.parent.parent / "data" / "final_tables" / "transformed"
+
+
+def read_jsonl(filename: str) -> list:
+    with open(TRANSFORMED_DATA_DIR / filename, "r", encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def replicate(doctors: list, size: int) -> list:
+    result = []
+    while len(result) < size:
+        for doctor in doctors:
+            if len(result) == size:
+                break
+            result.append({**doctor, "doctorId": f"{doctor['doctorId']}-{len(result)}"})
+    return result
+
+
+def random_query(rng: random.Random, doctors: list) -> str:
+    """One or two name words of a random doctor, sometimes with a typo."""
+    words = doctor_full_name(rng.choice(doctors)).split()
+    query = " ".join(rng.sample(words, min(len(words), rng.choice((1, 2)))))
+    if len(query) > 4 and rng.random() < 0.3:
+        cut = rng.randrange(1, len(query) - 1)
+        query = query[:cut] + query[cut + 1:]
+    return query
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the trigram doctor name index")
+    parser.add_argument("--doctors", type=int, default=34000, help="Doctors to index. Default: 34000")
+    parser.add_argument("--queries", type=int, default=300, help="Random name queries. Default: 300")
+    parser.add_argument("--top", type=int, default=10, help="Matches returned per query. Default: 10")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed. Default: 7")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    doctors = replicate(read_jsonl("doctores.jsonl"), args.doctors)
+    start = time.perf_counter()
+    index = NameIndex(doctors)
+    print(f"{len(doctors)} doctors indexed in {(time.perf_counter() - start) * 1000:.0f} ms, {len(index.postings)} trigrams")
+
+    queries = [random_query(rng, doctors) for _ in range(args.queries)]
+    names = [normalize(doctor_full_name(doctor)) for doctor in doctors]
+
+    def timed(run) -> float:
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            run(query)
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings) * 1000
+
+    def substring_scan(query):
+        needle = normalize(query)
+        return [doctor for doctor, name in zip(doctors, names) if needle in name][:args.top]
+
+    print(f"{'strategy':>15}  {'median ms':>10}")
+    print(f"{'substring scan':>15}  {timed(substring_scan):>10.3f}")
+    print(f"{'trigram index':>15}  {timed(lambda query: index.search(query, args.top)):>10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark the bitmap doctor planner against the posting-list index and a plain
+filter loop, on the transformed JSONL data replicated to a target size:
+
+    python3 scripts/benchmark_planner.py --doctors 34000
+    python3 scripts/benchmark_planner.py --doctors 1000000 --queries 200
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import shared helpers
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.repositories.doctor_index import DoctorIndex, doctor_clinic_ids
+from shared.repositories.doctor_planner import DoctorQueryPlanner
+
+TRANSFORMED_DATA_DIR = Path(__file__).parent.parent.parent / "data" / "final_tables" / "transformed"
+
+
+def read_jsonl(filename: str) -> list:
+    with open(TRANSFORMED_DATA_DIR / filename, "r", encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def replicate(doctors: list, size: int, rng: random.Random) -> list:
+    """Copy doctors until ``size``, randomising the rimacEnsured flag of the copies."""
+    result = []
+    while len(result) < size:
+        for doctor in doctors:
+            if len(result) == size:
+                break
+            result.append({**doctor, "doctorId": f"{doctor['doctorId']}-{len(result)}", "rimacEnsured": rng.random() < 0.3})
+    return result
+
+
+def random_filters(rng: random.Random, especialidades: list, clinics: list) -> dict:
+    filters = {}
+    if rng.random() < 0.7:
+        filters["especialidadId"] = rng.choice(especialidades)
+    if rng.random() < 0.5:
+        filters["ubigeoId"] = rng.choice(clinics)["ubigeoId"]
+    if rng.random() < 0.3:
+        filters["rimacEnsured"] = rng.random() < 0.5
+    return filters or {"rimacEnsured": True}
+
+
+def naive(doctors: list, clinics_by_ubigeo: dict, filters: dict, limit: int) -> list:
+    clinic_ids = clinics_by_ubigeo.get(filters["ubigeoId"], set()) if "ubigeoId" in filters else None
+    found = []
+    for doctor in doctors:
+        if "especialidadId" in filters and doctor.get("especialidadId") != filters["especialidadId"]:
+            continue
+        if "rimacEnsured" in filters and doctor.get("rimacEnsured") != filters["rimacEnsured"]:
+            continue
+        if clinic_ids is not None and not any(cid in clinic_ids for cid in doctor_clinic_ids(doctor)):
+            continue
+        found.append(doctor)
+    return found[:limit]
+
+
+def time_queries(run, queries: list) -> float:
+    timings = []
+    for filters in queries:
+        start = time.perf_counter()
+        run(filters)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bitmap doctor planner")
+    parser.add_argument("--doctors", type=int, default=34000, help="Doctors to index. Default: 34000")
+    parser.add_argument("--queries", type=int, default=500, help="Random filter combinations. Default: 500")
+    parser.add_argument("--page-size", type=int, default=10, help="Doctors returned per query. Default: 10")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed. Default: 7")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    clinics = read_jsonl("clinicas.jsonl")
+    doctors = replicate(read_jsonl("doctores.jsonl"), args.doctors, rng)
+    especialidades = sorted({doctor["especialidadId"] for doctor in doctors if doctor.get("especialidadId")})
+
+    start = time.perf_counter()
+    index = DoctorIndex(doctors)
+    index_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    planner = DoctorQueryPlanner(index, clinics)
+    planner_seconds = time.perf_counter() - start
+    print(f"{len(doctors)} doctors: index built in {index_seconds * 1000:.0f} ms, bitmaps in {planner_seconds * 1000:.0f} ms")
+
+    clinics_by_ubigeo = {}
+    for clinic in clinics:
+        clinics_by_ubigeo.setdefault(clinic["ubigeoId"], set()).add(clinic["clinicaId"])
+    queries = [random_filters(rng, especialidades, clinics) for _ in range(args.queries)]
+    limit = args.page_size
+
+    def posting_lists(filters):
+        filters = dict(filters)
+        ubigeo_id = filters.pop("ubigeoId", None)
+        clinic_ids = clinics_by_ubigeo.get(ubigeo_id, set()) if ubigeo_id else None
+        return index.search(filters, limit, clinic_ids=clinic_ids), len(index.search(filters, clinic_ids=clinic_ids))
+
+    def bitmaps(filters):
+        return planner.search(filters, limit), planner.count(filters)
+
+    print(f"{'strategy':>14}  {'median ms (page + total)':>26}")
+    print(f"{'filter loop':>14}  {time_queries(lambda f: naive(doctors, clinics_by_ubigeo, f, limit), queries) * 1000:>26.3f}")
+    print(f"{'posting lists':>14}  {time_queries(posting_lists, queries) * 1000:>26.3f}")
+    print(f"{'bitmaps':>14}  {time_queries(bitmaps, queries) * 1000:>26.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
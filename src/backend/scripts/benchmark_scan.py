@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark sequential vs parallel segmented scans of the doctors table.
+
+Meant to run against DynamoDB Local (or any endpoint speaking the DynamoDB
+API), seeded from the transformed production JSONL files:
+
+    docker run -p 8000:8000 amazon/dynamodb-local
+    python3 scripts/benchmark_scan.py --seed --segments 1 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import boto3
+
+# Add parent directory to path to import shared helpers
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.backends.dynamodb import ClientTable
+from shared.repositories.scan import iter_parallel_scan
+
+TRANSFORMED_DATA_DIR = Path(__file__).parent.parent.parent / "data" / "final_tables" / "transformed"
+
+
+def seed_table(dynamodb, table_name: str, copies: int) -> int:
+    """Create the doctors table if needed and load doctores.jsonl ``copies`` times."""
+    existing = [table.name for table in dynamodb.tables.all()]
+    if table_name not in existing:
+        table = dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=[{"AttributeName": "doctorId", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "doctorId", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        table.wait_until_exists()
+    table = dynamodb.Table(table_name)
+
+    with open(TRANSFORMED_DATA_DIR / "doctores.jsonl", "r", encoding="utf-8") as f:
+        doctors = [json.loads(line) for line in f if line.strip()]
+
+    written = 0
+    with table.batch_writer(overwrite_by_pkeys=["doctorId"]) as batch:
+        for copy in range(copies):
+            for doctor in doctors:
+                item = dict(doctor)
+                if copy:
+                    item["doctorId"] = f"{doctor['doctorId']}-{copy}"
+                batch.put_item(Item=item)
+                written += 1
+    return written
+
+
+def time_scan(table, segments: int, repeat: int) -> tuple[float, int]:
+    """Return (median seconds, item count) of scanning ``table`` with ``segments``."""
+    timings = []
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(1 for _ in iter_parallel_scan(table, segments))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel segmented scans")
+    parser.add_argument("--endpoint-url", default="http://localhost:8000", help="DynamoDB endpoint. Default: DynamoDB Local")
+    parser.add_argument("--region", default="us-east-1", help="AWS region. Default: us-east-1")
+    parser.add_argument("--table", default="doctors-bench", help="Table to scan. Default: doctors-bench")
+    parser.add_argument("--segments", nargs="+", type=int, default=[1, 2, 4, 8], help="Segment counts to compare")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per segment count. Default: 5")
+    parser.add_argument("--seed", action="store_true", help="Create and load the table from doctores.jsonl first")
+    parser.add_argument("--copies", type=int, default=1, help="Times to replicate the dataset when seeding")
+    args = parser.parse_args()
+
+    dynamodb = boto3.resource(
+        "dynamodb",
+        endpoint_url=args.endpoint_url,
+        region_name=args.region,
+        aws_access_key_id="local",
+        aws_secret_access_key="local",
+    )
+
+    if args.seed:
+        written = seed_table(dynamodb, args.table, args.copies)
+        print(f"Seeded {args.table} with {written} items")
+
+    # Scans go through the thread-safe client, like the repositories' worker tables
+    table = ClientTable(args.table, dynamodb.meta.client)
+    print(f"{'segments':>8}  {'median ms':>10}  {'items':>8}")
+    for segments in args.segments:
+        seconds, count = time_scan(table, segments, args.repeat)
+        print(f"{segments:>8}  {seconds * 1000:>10.1f}  {count:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Load-test the Search Lambda handler offline on a local repository backend.
+
+By default the in-memory backend serves the production JSONL exports, so
+timings reflect production data volume without touching AWS:
+
+    python3 scripts/benchmark_search.py --requests 2000
+    python3 scripts/benchmark_search.py --source sample
+    python3 scripts/build_catalog.py && python3 scripts/benchmark_search.py --backend sqlite
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+TRANSFORMED_DATA_DIR = BACKEND_DIR.parent / "data" / "final_tables" / "transformed"
+
+
+def read_ids(filename: str, key: str) -> list:
+    with open(TRANSFORMED_DATA_DIR / filename, "r", encoding="utf-8") as handle:
+        return [json.loads(line)[key] for line in handle if line.strip()]
+
+
+def build_workload(count: int, seed: int) -> list:
+    """Random mix of the query shapes the frontend sends."""
+    rng = random.Random(seed)
+    especialidades = read_ids("especialidades.jsonl", "especialidadId")
+    ubigeos = read_ids("ubigeo.jsonl", "ubigeoId")
+    shapes = [
+        lambda: {"especialidadId": rng.choice(especialidades)},
+        lambda: {"ubigeoId": rng.choice(ubigeos)},
+        lambda: {"ubigeoId": rng.choice(ubigeos), "especialidadId": rng.choice(especialidades)},
+        lambda: {"especialidadId": rng.choice(especialidades), "rimacEnsured": "true"},
+        lambda: {"rimacEnsured": rng.choice(["true", "false"]), "page": str(rng.randint(1, 5))},
+    ]
+    return [{"queryStringParameters": rng.choice(shapes)()} for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Search handler on a local backend")
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory", help="Repository backend. Default: memory")
+    parser.add_argument("--source", choices=["jsonl", "sample"], default="jsonl", help="Dataset of the memory backend. Default: jsonl")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests to send. Default: 1000")
+    parser.add_argument("--seed", type=int, default=7, help="Workload random seed. Default: 7")
+    args = parser.parse_args()
+
+    os.environ["REPOSITORY_BACKEND"] = args.backend
+    os.environ["MEMORY_BACKEND_SOURCE"] = args.source
+    # Fail loudly instead of silently benchmarking DynamoDB when the catalog is missing
+    os.environ["SQLITE_FALLBACK_ENABLED"] = "false"
+    sys.path.insert(0, str(BACKEND_DIR))
+    sys.path.insert(0, str(BACKEND_DIR / "lambdas" / "search"))
+
+    start = time.perf_counter()
+    import handler  # noqa: E402  (needs the paths and backend set above)
+
+    workload = build_workload(args.requests, args.seed)
+    handler.handler(workload[0], None)
+    print(f"cold start (import + first request): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    timings = []
+    errors = 0
+    started = time.perf_counter()
+    for event in workload:
+        request_start = time.perf_counter()
+        response = handler.handler(event, None)
+        timings.append(time.perf_counter() - request_start)
+        errors += response["statusCode"] >= 500
+    elapsed = time.perf_counter() - started
+
+    timings.sort()
+    print(f"requests: {len(timings)}  errors: {errors}  throughput: {len(timings) / elapsed:.0f} req/s")
+    print(f"p50: {statistics.median(timings) * 1000:.3f} ms  p95: {timings[int(len(timings) * 0.95)] * 1000:.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
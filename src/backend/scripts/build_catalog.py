@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Compile the transformed JSONL exports into the read-only SQLite catalog served
+by the ``sqlite`` repository backend (``REPOSITORY_BACKEND=sqlite``).
+
+    python3 scripts/build_catalog.py
+    python3 scripts/build_catalog.py --output dist/catalog.sqlite
+
+package_lambdas.sh runs this and bundles the file at the root of every zip.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import shared helpers
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.backends.schemas import DEFAULT_DATA_DIR, jsonl_version, load_jsonl_data, with_derived_tables
+from shared.backends.sqlite import DEFAULT_CATALOG_PATH, build_catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the SQLite catalog from the transformed JSONL files")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="Folder holding the *.jsonl exports")
+    parser.add_argument("--output", type=Path, default=DEFAULT_CATALOG_PATH, help=f"Catalog file. Default: {DEFAULT_CATALOG_PATH}")
+    args = parser.parse_args()
+
+    tables = load_jsonl_data(args.data_dir)
+    if not tables:
+        print(f"No JSONL exports found in {args.data_dir}", file=sys.stderr)
+        return 1
+
+    counts = build_catalog(with_derived_tables(tables), jsonl_version(args.data_dir), args.output)
+    for table, count in sorted(counts.items()):
+        print(f"  {table}: {count} rows")
+    print(f"Catalog written to {args.output} ({args.output.stat().st_size / 1024:.0f} KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
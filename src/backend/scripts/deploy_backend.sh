@@ -36,6 +36,10 @@ if ! command -v jq >/dev/null 2>&1; then
 fi
 
 PARAM_OVERRIDES=$(jq -r 'to_entries | map("\(.key)=\(.value)") | join(" ")' "$PARAMS_FILE")
+# Kept out of the committed parameter files; an existing stack keeps its previous secret when unset
+if [[ -n "${CURSOR_SECRET:-}" ]]; then
+  PARAM_OVERRIDES="$PARAM_OVERRIDES CursorSecret=$CURSOR_SECRET"
+fi
 CODE_S3_BUCKET=$(jq -r '.CodeS3Bucket' "$PARAMS_FILE")
 CODE_S3_KEY_PREFIX=$(jq -r '.CodeS3KeyPrefix // "backend"' "$PARAMS_FILE")
 
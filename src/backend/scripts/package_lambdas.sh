@@ -6,10 +6,16 @@ LAMBDAS_DIR="$ROOT_DIR/lambdas"
 SHARED_DIR="$ROOT_DIR/shared"
 DIST_DIR="$ROOT_DIR/dist"
 REQUIREMENTS_FILE="$ROOT_DIR/requirements.txt"
+# Wheels for the Lambda runtime (python3.11 on x86_64, Amazon Linux 2), whatever machine packages them
+PIP_TARGET_FLAGS=(--platform manylinux2014_x86_64 --implementation cp --python-version 3.11 --only-binary=:all:)
 
 rm -rf "$DIST_DIR"
 mkdir -p "$DIST_DIR"
 
+# Read-only catalog served by REPOSITORY_BACKEND=sqlite, bundled at the root of every zip
+CATALOG_FILE="$DIST_DIR/catalog.sqlite"
+python3 "$ROOT_DIR/scripts/build_catalog.py" --output "$CATALOG_FILE"
+
 for lambda_dir in "$LAMBDAS_DIR"/*; do
   [ -d "$lambda_dir" ] || continue
   name="$(basename "$lambda_dir")"
@@ -18,9 +24,15 @@ for lambda_dir in "$LAMBDAS_DIR"/*; do
 
   rsync -a --exclude '__pycache__' "$lambda_dir/" "$build_dir/" >/dev/null
   rsync -a --exclude '__pycache__' "$SHARED_DIR/" "$build_dir/shared/" >/dev/null
+  cp "$CATALOG_FILE" "$build_dir/catalog.sqlite"
 
   if [ -s "$REQUIREMENTS_FILE" ]; then
-    pip install -r "$REQUIREMENTS_FILE" --target "$build_dir" >/dev/null
+    pip install -r "$REQUIREMENTS_FILE" --target "$build_dir" "${PIP_TARGET_FLAGS[@]}" >/dev/null
+  fi
+  # Dependencies only one function needs (numpy for search) live next to its handler
+  if [ -s "$lambda_dir/requirements.txt" ]; then
+    pip install -r "$lambda_dir/requirements.txt" --target "$build_dir" "${PIP_TARGET_FLAGS[@]}" >/dev/null
+    rm -f "$build_dir/requirements.txt"
   fi
 
   (cd "$build_dir" && zip -qr "../${name}.zip" .)
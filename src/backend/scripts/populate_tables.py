@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import argparse
 import sys
+import time
 from pathlib import Path
 
 import boto3
@@ -12,6 +13,9 @@ import boto3
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from shared import sample_data
+from shared.repositories.doctor_cards import CARD_KEY, doctor_card_items
+from shared.repositories.doctors_repo import clinic_doctor_items
+from shared.repositories.snapshot import bump_dataset_versions
 
 
 def populate_table(dynamodb, table_name: str, items: list, key_name: str):
@@ -53,7 +57,7 @@ def main():
     parser.add_argument(
         "--tables",
         nargs="+",
-        choices=["doctors", "clinics", "especialidades", "subespecialidades", "seguros", "ubigeo", "all"],
+        choices=["doctors", "clinic-doctors", "doctor-cards", "clinics", "especialidades", "subespecialidades", "seguros", "ubigeo", "all"],
         default=["all"],
         help="Tables to populate. Default: all"
     )
@@ -71,7 +75,7 @@ def main():
     tables_to_populate = args.tables
     
     if "all" in tables_to_populate:
-        tables_to_populate = ["doctors", "clinics", "especialidades", "subespecialidades", "seguros", "ubigeo"]
+        tables_to_populate = ["doctors", "clinic-doctors", "doctor-cards", "clinics", "especialidades", "subespecialidades", "seguros", "ubigeo"]
     
     print(f"\n🚀 Starting data population for environment: {env}")
     print(f"📍 Region: {args.region}")
@@ -97,6 +101,28 @@ def main():
             "doctorId"
         )
     
+    if "clinic-doctors" in tables_to_populate:
+        results["clinic-doctors"] = populate_table(
+            dynamodb,
+            f"clinic-doctors-{env}",
+            [item for doctor in sample_data.DOCTORS for item in clinic_doctor_items(doctor)],
+            "pk"
+        )
+    
+    if "doctor-cards" in tables_to_populate:
+        results["doctor-cards"] = populate_table(
+            dynamodb,
+            f"doctor-cards-{env}",
+            doctor_card_items(
+                # Sample doctors carry their specialty as especialidadPrincipalId
+                [{**doctor, "especialidadId": doctor.get("especialidadPrincipalId")} for doctor in sample_data.DOCTORS],
+                sample_data.CLINICS,
+                sample_data.SPECIALTIES,
+                sample_data.INSURERS,
+            ),
+            CARD_KEY
+        )
+    
     if "especialidades" in tables_to_populate:
         results["especialidades"] = populate_table(
             dynamodb,
@@ -129,6 +155,12 @@ def main():
             "ubigeoId"
         )
     
+    # Bump the dataset version so warm containers reload their snapshots
+    version = str(int(time.time()))
+    loaded = [table_choice for table_choice, succeeded in results.items() if succeeded]
+    for table_name in bump_dataset_versions(dynamodb, env, loaded, version):
+        print(f"  ✓ Dataset version {version} recorded for {table_name}")
+    
     # Print summary
     print("\n" + "=" * 60)
     print("📊 SUMMARY")
@@ -10,12 +10,21 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+import time
 from pathlib import Path
 from typing import List, Dict, Any
 
 import boto3
 from botocore.exceptions import ClientError
 
+# Add parent directory to path to import shared helpers
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.repositories.doctor_cards import CARD_KEY, doctor_card_items
+from shared.repositories.doctors_repo import clinic_doctor_items
+from shared.repositories.scan import iter_scan
+from shared.repositories.snapshot import bump_dataset_versions
+
 
 # Path to transformed data directory
 TRANSFORMED_DATA_DIR = Path(__file__).parent.parent.parent / "data" / "final_tables" / "transformed"
@@ -23,6 +32,8 @@ TRANSFORMED_DATA_DIR = Path(__file__).parent.parent.parent / "data" / "final_tab
 # Table configurations: (file_name, table_name_suffix, partition_key)
 TABLE_CONFIGS = [
     ("doctores.jsonl", "doctors", "doctorId"),
+    ("doctores.jsonl", "clinic-doctors", "pk"),
+    ("doctores.jsonl", "doctor-cards", CARD_KEY),
     ("clinicas.jsonl", "clinics", "clinicaId"),
     ("especialidades.jsonl", "especialidades", "especialidadId"),
     ("grupos.jsonl", "grupos", "grupoId"),
@@ -41,16 +52,17 @@ def load_jsonl_file(file_path: Path) -> List[Dict[str, Any]]:
     return items
 
 
-def clear_table(dynamodb, table_name: str, partition_key: str) -> int:
+def clear_table(dynamodb, table_name: str, partition_key: str, sort_key: str | None = None) -> int:
     """Clear all items from a DynamoDB table."""
     table = dynamodb.Table(table_name)
+    key_names = [partition_key] + ([sort_key] if sort_key else [])
     
     print(f"  🗑️  Clearing existing data from {table_name}...")
     
     # Scan and delete all items
     deleted_count = 0
     scan_kwargs = {
-        'ProjectionExpression': partition_key
+        'ProjectionExpression': ', '.join(key_names)
     }
     
     try:
@@ -64,7 +76,7 @@ def clear_table(dynamodb, table_name: str, partition_key: str) -> int:
             # Batch delete items
             with table.batch_writer() as batch:
                 for item in items:
-                    batch.delete_item(Key={partition_key: item[partition_key]})
+                    batch.delete_item(Key={name: item[name] for name in key_names})
                     deleted_count += 1
             
             # Check if there are more items to scan
@@ -166,6 +178,76 @@ def populate_table(
         return False
 
 
+def populate_clinic_doctors(dynamodb, table_name: str, doctors_file: Path, clear_first: bool = False) -> bool:
+    """Write the reverse clinic -> doctor adjacency items derived from doctores.jsonl."""
+    try:
+        if not doctors_file.exists():
+            print(f"  ⚠️  File not found: {doctors_file}")
+            return False
+        
+        print(f"\n📋 Processing {table_name}...")
+        
+        if clear_first:
+            clear_table(dynamodb, table_name, "pk", "sk")
+        
+        doctors = load_jsonl_file(doctors_file)
+        items = [item for doctor in doctors for item in clinic_doctor_items(doctor)]
+        print(f"  📄 Built {len(items)} clinic#doctor items from {len(doctors)} doctors")
+        
+        print(f"  ⬆️  Writing items to DynamoDB...")
+        table = dynamodb.Table(table_name)
+        with table.batch_writer(overwrite_by_pkeys=["pk", "sk"]) as batch:
+            for item in items:
+                batch.put_item(Item=item)
+        
+        print(f"  ✅ Successfully wrote {len(items)} items")
+        return True
+    
+    except ClientError as e:
+        error_code = e.response['Error']['Code']
+        if error_code == 'ResourceNotFoundException':
+            print(f"  ❌ Table {table_name} does not exist. Deploy infrastructure first.")
+        else:
+            print(f"  ❌ AWS Error: {e}")
+        return False
+
+
+def populate_doctor_cards(dynamodb, table_name: str, env: str, clear_first: bool = False) -> bool:
+    """Write one pre-rendered card per doctor and clinic, joined from the JSONL exports.
+
+    Insurer names come from the seguros-{env} table, which has no JSONL export.
+    """
+    try:
+        print(f"\n📋 Processing {table_name}...")
+        
+        if clear_first:
+            clear_table(dynamodb, table_name, CARD_KEY)
+        
+        doctors = load_jsonl_file(TRANSFORMED_DATA_DIR / "doctores.jsonl")
+        clinics = load_jsonl_file(TRANSFORMED_DATA_DIR / "clinicas.jsonl")
+        specialties = load_jsonl_file(TRANSFORMED_DATA_DIR / "especialidades.jsonl")
+        insurers = list(iter_scan(dynamodb.Table(f"seguros-{env}")))
+        items = doctor_card_items(doctors, clinics, specialties, insurers)
+        print(f"  📄 Rendered {len(items)} cards for {len(doctors)} doctors")
+        
+        print(f"  ⬆️  Writing items to DynamoDB...")
+        table = dynamodb.Table(table_name)
+        with table.batch_writer(overwrite_by_pkeys=[CARD_KEY]) as batch:
+            for item in items:
+                batch.put_item(Item=item)
+        
+        print(f"  ✅ Successfully wrote {len(items)} items")
+        return True
+    
+    except ClientError as e:
+        error_code = e.response['Error']['Code']
+        if error_code == 'ResourceNotFoundException':
+            print(f"  ❌ Table {table_name} does not exist. Deploy infrastructure first.")
+        else:
+            print(f"  ❌ AWS Error: {e}")
+        return False
+
+
 def verify_table_exists(dynamodb_client, table_name: str) -> bool:
     """Verify that a table exists."""
     try:
@@ -203,7 +285,7 @@ def main():
     parser.add_argument(
         "--tables",
         nargs="+",
-        choices=["doctors", "clinics", "especialidades", "grupos", "ubigeo", "all"],
+        choices=["doctors", "clinic-doctors", "doctor-cards", "clinics", "especialidades", "grupos", "ubigeo", "all"],
         default=["all"],
         help="Tables to populate. Default: all"
     )
@@ -237,6 +319,8 @@ def main():
     # Map table choices to configs
     table_map = {
         "doctors": ("doctores.jsonl", "doctors", "doctorId"),
+        "clinic-doctors": ("doctores.jsonl", "clinic-doctors", "pk"),
+        "doctor-cards": ("doctores.jsonl", "doctor-cards", CARD_KEY),
         "clinics": ("clinicas.jsonl", "clinics", "clinicaId"),
         "especialidades": ("especialidades.jsonl", "especialidades", "especialidadId"),
         "grupos": ("grupos.jsonl", "grupos", "grupoId"),
@@ -308,6 +392,13 @@ def main():
         table_name = f"{table_suffix}-{env}"
         file_path = TRANSFORMED_DATA_DIR / file_name
         
+        if table_choice == "clinic-doctors":
+            results[table_name] = populate_clinic_doctors(dynamodb, table_name, file_path, clear_first=args.clear)
+            continue
+        if table_choice == "doctor-cards":
+            results[table_name] = populate_doctor_cards(dynamodb, table_name, env, clear_first=args.clear)
+            continue
+        
         results[table_name] = populate_table(
             dynamodb,
             table_name,
@@ -316,6 +407,12 @@ def main():
             clear_first=args.clear
         )
     
+    # Bump the dataset version so warm containers reload their snapshots
+    version = str(int(time.time()))
+    loaded = [table_choice for table_choice in tables_to_populate if results.get(f"{table_map[table_choice][1]}-{env}")]
+    for table_name in bump_dataset_versions(dynamodb, env, loaded, version):
+        print(f"  ✓ Dataset version {version} recorded for {table_name}")
+    
     # Print summary
     print("\n" + "=" * 80)
     print("📊 SUMMARY")
@@ -0,0 +1,5 @@
+"""Run the local suite against the in-memory backend loaded from shared/sample_data.py."""
+import os
+
+os.environ.setdefault("REPOSITORY_BACKEND", "memory")
+os.environ.setdefault("MEMORY_BACKEND_SOURCE", "sample")
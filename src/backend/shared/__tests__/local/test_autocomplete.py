@@ -0,0 +1,51 @@
+"""Tests for the type-ahead prefix index."""
+from shared.repositories.autocomplete_index import PrefixIndex, build_suggestions
+from shared.repositories.autocomplete_repo import AutocompleteRepository
+
+
+DOCTORS = [
+    {"doctorId": "1", "especialidadId": "44", "clinicaIds": ["CLIN-1"], "apellidoPaterno": "García", "apellidoMaterno": "Felix"},
+    {"doctorId": "2", "especialidadId": "44", "clinicaIds": ["CLIN-1", "CLIN-2"], "apellidoPaterno": "Garcia", "apellidoMaterno": "Paz"},
+    {"doctorId": "3", "especialidadId": "57", "clinicaId": "CLIN-2", "apellidoPaterno": "Cardenas"},
+]
+CLINICS = [
+    {"clinicaId": "CLIN-1", "nombreClinica": "Clínica San Felipe"},
+    {"clinicaId": "CLIN-2", "nombreClinica": "Clínica Delgado"},
+]
+SPECIALTIES = [
+    {"especialidadId": "44", "nombre": "Cardiología"},
+    {"especialidadId": "57", "nombre": "Cirugía Cardiovascular"},
+]
+
+
+def index():
+    return PrefixIndex(build_suggestions(DOCTORS, CLINICS, SPECIALTIES))
+
+
+def test_prefixes_match_any_word_and_rank_by_popularity():
+    labels = [(s.type, s.label, s.popularity) for s in index().complete("CAR", 5)]
+
+    assert labels == [
+        ("specialty", "Cardiología", 2),
+        ("surname", "Cardenas", 1),
+        ("specialty", "Cirugía Cardiovascular", 1),
+    ]
+    assert [s.label for s in index().complete("fel", 5)] == ["Clínica San Felipe", "Felix"]
+
+
+def test_surnames_merge_spellings_and_types_filter():
+    suggestions = index().complete("garc", 5, types=["surname"])
+
+    assert [(s.id, s.popularity) for s in suggestions] == [("garcia", 2)]
+    # Equally popular clinics come out alphabetically
+    assert [s.label for s in index().complete("clinica", 1, types=["clinic"])] == ["Clínica Delgado"]
+    assert index().complete("zz", 5) == []
+    assert index().complete("  ", 5) == []
+
+
+def test_repository_keeps_its_index_without_snapshots(monkeypatch):
+    monkeypatch.setenv("SNAPSHOT_CACHE_ENABLED", "false")
+    repo = AutocompleteRepository()
+
+    assert repo.index() is repo.index()
+    assert repo.complete("card", 5)
@@ -0,0 +1,62 @@
+"""Tests for the BatchGetItem helper."""
+import pytest
+
+from shared.repositories.batch import batch_get_items
+
+
+class FakeDynamoDB:
+    """Resource double that leaves the first key of a request unprocessed once per key."""
+
+    def __init__(self, items, throttle_first=False):
+        self.items = items
+        self.throttle_first = throttle_first
+        self.requests = []
+        self.throttled = set()
+
+    def batch_get_item(self, RequestItems):
+        (table_name, request), = RequestItems.items()
+        keys = [key["clinicaId"] for key in request["Keys"]]
+        self.requests.append(keys)
+        unprocessed = []
+        if self.throttle_first and keys[0] not in self.throttled:
+            self.throttled.add(keys[0])
+            unprocessed = [keys[0]]
+        responses = [self.items[key] for key in keys if key in self.items and key not in unprocessed]
+        response = {"Responses": {table_name: responses}}
+        if unprocessed:
+            response["UnprocessedKeys"] = {table_name: {"Keys": [{"clinicaId": key} for key in unprocessed]}}
+        return response
+
+
+def _clinics(count):
+    return {f"CLIN-{index}": {"clinicaId": f"CLIN-{index}"} for index in range(count)}
+
+
+def test_batch_get_items_chunks_and_deduplicates():
+    dynamodb = FakeDynamoDB(_clinics(250))
+    keys = [f"CLIN-{index}" for index in range(250)] + ["CLIN-1", None, "UNKNOWN"]
+
+    found = batch_get_items(dynamodb, "clinics-test", "clinicaId", keys)
+
+    assert len(found) == 250
+    assert [len(request) for request in dynamodb.requests] == [100, 100, 51]
+
+
+def test_batch_get_items_retries_unprocessed_keys():
+    dynamodb = FakeDynamoDB(_clinics(3), throttle_first=True)
+    sleeps = []
+
+    found = batch_get_items(dynamodb, "clinics-test", "clinicaId", ["CLIN-0", "CLIN-2"], sleep=sleeps.append)
+
+    assert sorted(found) == ["CLIN-0", "CLIN-2"]
+    assert dynamodb.requests == [["CLIN-0", "CLIN-2"], ["CLIN-0"]]
+    assert sleeps == [0.05]
+
+
+def test_batch_get_items_gives_up_after_max_retries():
+    class AlwaysThrottled(FakeDynamoDB):
+        def batch_get_item(self, RequestItems):
+            return {"Responses": {}, "UnprocessedKeys": RequestItems}
+
+    with pytest.raises(RuntimeError):
+        batch_get_items(AlwaysThrottled({}), "clinics-test", "clinicaId", ["CLIN-0"], sleep=lambda _: None)
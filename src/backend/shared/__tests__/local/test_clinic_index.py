@@ -0,0 +1,30 @@
+"""Tests for the clinic x specialty index."""
+from shared.repositories.clinic_index import ClinicIndex
+
+
+CLINICS = [
+    {"clinicaId": "CLIN-1", "ubigeoId": "150132", "especialidadIds": ["44", "57"], "doctorCount": 203},
+    {"clinicaId": "CLIN-2", "ubigeoId": "70102", "especialidadIds": ["44"], "seguroIds": ["RIMAC"]},
+    {"clinicaId": "CLIN-3", "ubigeoId": "150132", "especialidadIds": ["9"], "seguroIds": ["RIMAC", "PACIFICO"]},
+    {"clinicaId": "CLIN-4", "ubigeoId": "150132"},
+]
+
+
+def ids(clinics):
+    return [clinic["clinicaId"] for clinic in clinics]
+
+
+def test_specialty_postings_intersect_with_ubigeo_and_insurer():
+    index = ClinicIndex(CLINICS)
+
+    assert ids(index.search({"especialidadId": "44"})) == ["CLIN-1", "CLIN-2"]
+    assert ids(index.search({"especialidadId": "44", "ubigeoId": "150132"})) == ["CLIN-1"]
+    assert ids(index.search({"seguroId": "RIMAC", "ubigeoId": "150132"})) == ["CLIN-3"]
+    assert index.search({"especialidadId": "999"}) == []
+
+
+def test_in_lists_and_unfiltered_listing_keep_table_order():
+    index = ClinicIndex(CLINICS)
+
+    assert ids(index.search({"especialidadId": ("9", "57")})) == ["CLIN-1", "CLIN-3"]
+    assert ids(index.search({"ubigeoId": None})) == ["CLIN-1", "CLIN-2", "CLIN-3", "CLIN-4"]
@@ -0,0 +1,64 @@
+"""Tests for the pre-rendered doctor-cards view."""
+from shared.backends.schemas import with_derived_tables
+from shared.repositories.doctor_cards import card_id, doctor_card_items, pick_clinic_id
+from shared.repositories.doctor_cards_repo import DoctorCardsRepository
+
+
+DOCTORS = [
+    {"doctorId": "271", "nombres": "Ana", "apellidoPaterno": "Soto", "especialidadId": "44", "clinicaIds": ["CLIN-1", "CLIN-2"]},
+    {"doctorId": "617", "nombreCompleto": "Dr. Luis Ramos", "especialidadId": "57", "clinicaIds": []},
+]
+CLINICS = [
+    {"clinicaId": "CLIN-1", "nombreClinica": "Clinica Norte", "direccion": "Av. Norte 1", "seguroIds": ["RIMAC", "OTRO"]},
+    {"clinicaId": "CLIN-2", "nombreClinica": "Clinica Sur", "ubicacion": "Av. Sur 2"},
+]
+SPECIALTIES = [{"especialidadId": "44", "nombre": "Cardiologia"}]
+INSURERS = [{"seguroId": "RIMAC", "nombre": "Rimac Seguros"}]
+
+
+def test_doctor_card_items_render_one_card_per_clinic():
+    items = {item["cardId"]: item["card"] for item in doctor_card_items(DOCTORS, CLINICS, SPECIALTIES, INSURERS)}
+
+    assert sorted(items) == ["271#CLIN-1", "271#CLIN-2", "617#"]
+    assert items["271#CLIN-1"] == {
+        "doctorId": "271",
+        "doctorName": "Ana Soto",
+        "photoUrl": None,
+        "mainSpecialty": "Cardiologia",
+        "clinicId": "CLIN-1",
+        "clinicName": "Clinica Norte",
+        "clinicAddress": "Av. Norte 1",
+        "seguros": [{"seguroId": "RIMAC", "nombre": "Rimac Seguros"}, {"seguroId": "OTRO", "nombre": "OTRO"}],
+    }
+    assert items["271#CLIN-2"]["clinicAddress"] == "Av. Sur 2"
+    assert items["617#"]["clinicId"] is None
+    assert items["617#"]["mainSpecialty"] is None
+
+
+def test_pick_clinic_id_prefers_clinics_that_matched_the_search():
+    doctor = DOCTORS[0]
+
+    assert pick_clinic_id(doctor, {"CLIN-2": {}}) == "CLIN-2"
+    assert pick_clinic_id(doctor, {}) == "CLIN-1"
+    assert pick_clinic_id(DOCTORS[1], {}) is None
+    assert card_id("271", None) == "271#"
+
+
+def test_repository_reads_cards_derived_from_sample_data():
+    repo = DoctorCardsRepository()
+
+    cards = repo.get_cards(["DOC-001#CLIN-001", "DOC-001#CLIN-999", None])
+
+    assert list(cards) == ["DOC-001#CLIN-001"]
+    assert cards["DOC-001#CLIN-001"]["mainSpecialty"] == "Cardiología"
+    assert cards["DOC-001#CLIN-001"]["seguros"][0] == {"seguroId": "RIMAC", "nombre": "RIMAC Seguros"}
+
+
+def test_derived_cards_take_insurer_names_from_the_seguros_rows():
+    tables = {"doctors": DOCTORS, "clinics": CLINICS, "especialidades": SPECIALTIES}
+
+    # Without insurer rows every card would show seguroIds as names, so none are derived
+    assert "doctor-cards" not in with_derived_tables(tables)
+
+    cards = {item["cardId"]: item["card"] for item in with_derived_tables({**tables, "seguros": INSURERS})["doctor-cards"]}
+    assert [seguro["nombre"] for seguro in cards["271#CLIN-1"]["seguros"]] == ["Rimac Seguros", "OTRO"]
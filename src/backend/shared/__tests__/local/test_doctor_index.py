@@ -0,0 +1,39 @@
+"""Tests for the in-memory doctor inverted index."""
+from shared.repositories.doctor_index import DoctorIndex, intersect_postings
+
+
+DOCTORS = [
+    {"doctorId": "271", "especialidadId": "44", "clinicaIds": ["CLIN-14", "CLIN-48"], "rimacEnsured": False},
+    {"doctorId": "617", "especialidadId": "57", "clinicaIds": ["CLIN-33"], "rimacEnsured": True},
+    {"doctorId": "1113", "especialidadId": "44", "clinicaIds": ["CLIN-48"], "rimacEnsured": True},
+    {"doctorId": "DOC-001", "especialidadId": "44", "clinicaId": "CLIN-14"},
+]
+
+
+def test_intersect_postings_uses_all_lists():
+    assert intersect_postings([[1, 3, 5, 7, 9], [3, 4, 5], [0, 5, 9]]) == [5]
+    assert intersect_postings([[1, 2], []]) == []
+
+
+def test_search_intersects_specialty_and_clinic():
+    index = DoctorIndex(DOCTORS)
+
+    results = index.search({"especialidadId": "44", "clinicaId": "CLIN-48"})
+
+    assert [doctor["doctorId"] for doctor in results] == ["271", "1113"]
+
+
+def test_search_supports_old_clinic_format_and_rimac_flag():
+    index = DoctorIndex(DOCTORS)
+
+    assert [d["doctorId"] for d in index.search({"clinicaId": "CLIN-14"})] == ["271", "DOC-001"]
+    assert [d["doctorId"] for d in index.search({"rimacEnsured": True})] == ["617", "1113"]
+    assert [d["doctorId"] for d in index.search({"rimacEnsured": False, "especialidadId": "57"})] == []
+
+
+def test_search_without_filters_returns_table_order_with_limit():
+    index = DoctorIndex(DOCTORS)
+
+    assert [d["doctorId"] for d in index.search({}, limit=2)] == ["271", "617"]
+    assert index.get("617")["especialidadId"] == "57"
+    assert index.get("missing") is None
@@ -0,0 +1,72 @@
+"""Tests for the bitmap doctor query planner."""
+from shared.repositories.doctor_index import DoctorIndex
+from shared.repositories.doctor_planner import DoctorQueryPlanner, iter_bits, to_bitmap
+from shared.repositories.facets import FACETS, count_facets
+
+
+DOCTORS = [
+    {"doctorId": "271", "especialidadId": "44", "clinicaIds": ["CLIN-14", "CLIN-48"], "rimacEnsured": False},
+    {"doctorId": "617", "especialidadId": "57", "clinicaIds": ["CLIN-33"], "rimacEnsured": True},
+    {"doctorId": "1113", "especialidadId": "44", "clinicaIds": ["CLIN-48"], "rimacEnsured": True},
+    {"doctorId": "DOC-001", "especialidadId": "44", "clinicaId": "CLIN-14"},
+]
+CLINICS = [
+    {"clinicaId": "CLIN-14", "ubigeoId": "150132", "seguroIds": ["RIMAC"]},
+    {"clinicaId": "CLIN-33", "ubigeoId": "150132", "seguroIds": ["PACIFICO"]},
+    {"clinicaId": "CLIN-48", "ubigeoId": "70102", "seguroIds": ["RIMAC", "PACIFICO"]},
+]
+
+
+def planner():
+    return DoctorQueryPlanner(DoctorIndex(DOCTORS), CLINICS)
+
+
+def test_bitmaps_round_trip_positions():
+    bitmap = to_bitmap([0, 3, 64, 200], 201)
+
+    assert list(iter_bits(bitmap)) == [0, 3, 64, 200]
+    assert list(iter_bits(bitmap, after=3, limit=1)) == [64]
+    assert list(iter_bits(bitmap, after=3, limit=100)) == [64, 200]
+    assert list(iter_bits(0)) == []
+
+
+def test_insurer_and_ubigeo_resolve_through_clinics():
+    search = planner().search
+
+    assert [d["doctorId"] for d in search({"seguroId": "PACIFICO"})] == ["271", "617", "1113"]
+    assert [d["doctorId"] for d in search({"ubigeoId": "150132", "especialidadId": "44"})] == ["271", "DOC-001"]
+    assert [d["doctorId"] for d in search({"seguroId": "RIMAC", "rimacEnsured": True})] == ["1113"]
+    assert search({"ubigeoId": "000000"}) == []
+
+
+def test_plan_orders_terms_by_selectivity():
+    terms = planner().plan({"especialidadId": "44", "rimacEnsured": True, "clinicaId": "CLIN-33"})
+
+    assert [name for name, _ in terms] == ["clinicaId", "rimacEnsured", "especialidadId"]
+    assert planner().count({"clinicaId": "CLIN-33", "especialidadId": "44"}) == 0
+
+
+def test_search_resumes_after_position_with_limit():
+    search = planner().search
+
+    assert [d["doctorId"] for d in search({}, limit=2)] == ["271", "617"]
+    assert [d["doctorId"] for d in search({"especialidadId": "44"}, limit=5, after=0)] == ["1113", "DOC-001"]
+
+
+def test_facet_counts_match_a_single_pass_over_the_matches():
+    clinics = {clinic["clinicaId"]: clinic for clinic in CLINICS}
+    for filters in ({}, {"especialidadId": "44"}, {"seguroId": "RIMAC"}):
+        bitmaps = planner().facet_counts(planner().match(filters), FACETS)
+        assert bitmaps == count_facets(planner().search(filters), FACETS, clinics)
+
+    counts = planner().facet_counts(planner().match({"especialidadId": "44"}), ["ubigeoId", "seguroId"])
+    assert counts == {"ubigeoId": {"150132": 2, "70102": 2}, "seguroId": {"RIMAC": 3, "PACIFICO": 2}}
+
+
+def test_in_lists_are_one_or_term_per_filter():
+    search = planner().search
+
+    assert [d["doctorId"] for d in search({"especialidadId": ("44", "57"), "rimacEnsured": True})] == ["617", "1113"]
+    assert [d["doctorId"] for d in search({"ubigeoId": ["70102", "000000"]})] == ["271", "1113"]
+    assert [d["doctorId"] for d in search({"clinicaId": ("CLIN-33", "CLIN-14"), "seguroId": ("PACIFICO",)})] == ["271", "617"]
+    assert planner().count({"especialidadId": ("44", "57"), "ubigeoId": ("150132", "70102")}) == 4
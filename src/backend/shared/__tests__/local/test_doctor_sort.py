@@ -0,0 +1,53 @@
+"""Tests for presorted doctor orders and heap-based page selection."""
+import json
+
+from shared.repositories.doctor_planner import to_bitmap
+from shared.repositories.doctor_sort import SORT_KEYS, DoctorOrder, sort_key, top_doctors
+
+
+DOCTORS = [
+    {"doctorId": "1", "apellidoPaterno": "Zúñiga", "nombres": "Ana", "clinicaIds": ["CLIN-1"], "rimacEnsured": False},
+    {"doctorId": "2", "apellidoPaterno": "alvarez", "nombres": "Luis", "clinicaIds": ["CLIN-1", "CLIN-2"], "rimacEnsured": True},
+    {"doctorId": "3", "apellidoPaterno": "Núñez", "nombres": "Rosa", "clinicaIds": ["CLIN-2", "CLIN-2"]},
+    {"doctorId": "4", "nombreCompleto": "Beltran Quispe Jorge", "clinicaId": "CLIN-3", "rimacEnsured": True},
+    {"doctorId": "5", "apellidoPaterno": "Alvarez", "nombres": "Luis", "clinicaIds": ["CLIN-1", "CLIN-2", "CLIN-3"]},
+]
+
+
+def ids(positions):
+    return [DOCTORS[position]["doctorId"] for position in positions]
+
+
+def test_sort_keys_are_accent_insensitive_with_stable_ties():
+    assert [doctor["doctorId"] for doctor in sorted(DOCTORS, key=sort_key("surname"))] == ["2", "5", "4", "3", "1"]
+    assert [doctor["doctorId"] for doctor in sorted(DOCTORS, key=sort_key("clinics"))] == ["5", "2", "4", "3", "1"]
+    assert [doctor["doctorId"] for doctor in sorted(DOCTORS, key=sort_key("rimacEnsured"))] == ["2", "4", "5", "3", "1"]
+
+
+def test_select_matches_sorting_the_matches_on_both_strategies():
+    order = DoctorOrder(DOCTORS)
+    everyone = to_bitmap(range(len(DOCTORS)), len(DOCTORS))
+    some = to_bitmap([0, 2, 4], len(DOCTORS))
+
+    for sort in SORT_KEYS:
+        expected = [doctor["doctorId"] for doctor in sorted(DOCTORS, key=sort_key(sort))]
+        assert ids(order.select(sort, everyone)) == expected
+        # Dense matches walk the presorted order, sparse ones go through the heap
+        assert ids(order.select(sort, everyone, limit=2)) == expected[:2]
+        chosen = [doctor_id for doctor_id in expected if doctor_id in ("1", "3", "5")]
+        assert ids(order.select(sort, some, limit=2)) == chosen[:2]
+        after = DOCTORS.index(next(doctor for doctor in DOCTORS if doctor["doctorId"] == chosen[0]))
+        assert ids(order.select(sort, some, limit=5, after=after)) == chosen[1:]
+        assert ids(order.select(sort, everyone, limit=1, after=after)) == [expected[expected.index(chosen[0]) + 1]]
+
+
+def test_top_doctors_without_an_index_resumes_after_the_cursor_doctor():
+    key = sort_key("surname")
+    fifth = next(doctor for doctor in DOCTORS if doctor["doctorId"] == "5")
+    remaining = [doctor for doctor in DOCTORS if doctor is not fifth]
+
+    assert [doctor["doctorId"] for doctor in top_doctors(DOCTORS, "surname", 2)] == ["2", "5"]
+    assert [doctor["doctorId"] for doctor in top_doctors(DOCTORS, "surname", 2, after=key(fifth))] == ["4", "3"]
+    # A cursor doctor deleted since, with its key as read back from JSON, still resumes in order
+    after = json.loads(json.dumps(key(fifth)))
+    assert [doctor["doctorId"] for doctor in top_doctors(remaining, "surname", 2, after=after)] == ["4", "3"]
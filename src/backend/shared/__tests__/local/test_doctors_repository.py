@@ -0,0 +1,138 @@
+"""Tests for the Query-based access paths of DoctorsRepository."""
+import pytest
+
+from shared.repositories.doctors_repo import DoctorsRepository, clinic_doctor_items
+
+
+DOCTORS = [
+    {"doctorId": "271", "especialidadId": "44", "clinicaIds": ["CLIN-14", "CLIN-48"], "rimacEnsured": False},
+    {"doctorId": "617", "especialidadId": "57", "clinicaIds": ["CLIN-33"], "rimacEnsured": True},
+    {"doctorId": "1113", "especialidadId": "44", "clinicaIds": ["CLIN-48"], "rimacEnsured": True},
+]
+
+
+class QueryTable:
+    """Table double answering queries by partition value, sorted by doctorId, and recording them."""
+
+    def __init__(self, items, key_name):
+        self.items = items
+        self.key_name = key_name
+        self.queries = []
+
+    def query(self, **kwargs):
+        value = kwargs["KeyConditionExpression"].get_expression()["values"][1]
+        self.queries.append((kwargs.get("IndexName"), value))
+        self.last_kwargs = kwargs
+        items = sorted((item for item in self.items if item.get(self.key_name) == value), key=lambda item: item["doctorId"])
+        return {"Items": [dict(item) for item in items]}
+
+    def scan(self, **kwargs):  # pragma: no cover - a query path must never scan
+        raise AssertionError("unexpected scan")
+
+
+class ScanTable:
+    """Single-page table double that only counts scans."""
+
+    def __init__(self, items):
+        self.items = items
+        self.scans = 0
+
+    def scan(self, **kwargs):
+        self.scans += 1
+        return {"Items": [dict(item) for item in self.items]}
+
+
+@pytest.fixture
+def repo(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setenv("DOCTOR_INDEX_ENABLED", "false")
+    repository = DoctorsRepository()
+    repository.table = QueryTable(DOCTORS, "especialidadId")
+    repository.clinic_doctors_table = QueryTable(
+        [item for doctor in DOCTORS for item in clinic_doctor_items(doctor)], "pk"
+    )
+    return repository
+
+
+def test_clinic_doctor_items_builds_one_item_per_clinic():
+    items = clinic_doctor_items(DOCTORS[0])
+
+    assert [(item["pk"], item["sk"]) for item in items] == [("CLINIC#CLIN-14", "DOCTOR#271"), ("CLINIC#CLIN-48", "DOCTOR#271")]
+    assert items[0]["clinicaIds"] == ["CLIN-14", "CLIN-48"]
+
+
+def test_specialty_filter_queries_the_gsi(repo):
+    results = repo.list_doctors({"especialidadId": "44", "rimacEnsured": True})
+
+    assert [doctor["doctorId"] for doctor in results] == ["1113"]
+    assert repo.table.queries == [("especialidadId-index", "44")]
+
+
+def test_clinic_filter_queries_adjacency_items(repo):
+    results = repo.list_doctors({"clinicaId": "CLIN-48"})
+
+    assert [doctor["doctorId"] for doctor in results] == ["1113", "271"]
+    assert "pk" not in results[0]
+
+
+def test_doctors_in_several_clinics_are_returned_once(repo):
+    results = repo.list_doctors_in_clinics(["CLIN-14", "CLIN-48", "CLIN-33"], {})
+
+    assert [doctor["doctorId"] for doctor in results] == ["1113", "271", "617"]
+
+
+def test_fields_become_a_projection_that_keeps_filter_inputs(repo):
+    repo.list_doctors({"especialidadId": "44"}, fields=("doctorId", "status"))
+
+    names = repo.table.last_kwargs["ExpressionAttributeNames"]
+    assert repo.table.last_kwargs["ProjectionExpression"].startswith("#p0, #p1")
+    assert {"doctorId", "status", "especialidadId", "clinicaIds", "rimacEnsured"} <= set(names.values())
+
+
+def test_in_lists_query_each_partition_once(repo):
+    by_specialty = repo.list_doctors({"especialidadId": ("44", "57"), "rimacEnsured": True})
+    by_clinic = repo.list_doctors({"clinicaId": ("CLIN-33", "CLIN-48", "CLIN-14")})
+
+    assert sorted(doctor["doctorId"] for doctor in by_specialty) == ["1113", "617"]
+    assert repo.table.queries == [("especialidadId-index", "44"), ("especialidadId-index", "57")]
+    # Clinic partitions merge in doctorId order, once per doctor
+    assert [doctor["doctorId"] for doctor in by_clinic] == ["1113", "271", "617"]
+
+
+def test_pinned_copy_answers_many_searches_from_one_scan(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setenv("DOCTOR_INDEX_ENABLED", "false")
+    monkeypatch.setenv("SNAPSHOT_CACHE_ENABLED", "false")
+    monkeypatch.setenv("DOCTORS_SCAN_SEGMENTS", "1")
+    repository = DoctorsRepository()
+    repository.table = ScanTable(DOCTORS)
+    repository.clinics_table = ScanTable([{"clinicaId": "CLIN-48", "ubigeoId": "150122", "seguroIds": ["RIMAC"]}])
+
+    pinned = repository.pinned()
+
+    assert [doctor["doctorId"] for doctor in pinned.search_doctors({"especialidadId": "44"})] == ["271", "1113"]
+    assert [doctor["doctorId"] for doctor in pinned.search_doctors({"seguroId": "RIMAC"}, sort="clinics")] == ["271", "1113"]
+    assert pinned.count_doctors({"rimacEnsured": True}) == 2
+    assert (repository.table.scans, repository.clinics_table.scans) == (1, 1)
+    assert repository.index() is None and repository.pinned() is not pinned
+
+
+def test_name_searches_without_the_index_share_one_scan(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setenv("DOCTOR_INDEX_ENABLED", "false")
+    monkeypatch.setenv("DOCTORS_SCAN_SEGMENTS", "1")
+    named = [
+        {**DOCTORS[0], "nombreCompleto": "Ana García Paz"},
+        {**DOCTORS[1], "nombreCompleto": "Luis Garcés Ruiz"},
+        {**DOCTORS[2], "nombreCompleto": "Rosa Quispe Mamani"},
+    ]
+    repository = DoctorsRepository()
+    repository.table = ScanTable(named)
+    repository.table.name = "doctors-dev"
+
+    first = repository.search_names("garcia", {}, 5)
+    second = repository.search_names("quispe", {"rimacEnsured": True}, 5)
+
+    assert [doctor["doctorId"] for _, doctor in first][:1] == ["271"]
+    assert [doctor["doctorId"] for _, doctor in second] == ["1113"]
+    assert repository.table.scans == 1
@@ -0,0 +1,62 @@
+"""Tests for the shared, lazily created DynamoDB resource."""
+import boto3
+import pytest
+
+from shared.backends import dynamodb
+
+
+class FakeResource:
+    def __init__(self):
+        self.tables = []
+
+    def Table(self, name):
+        self.tables.append(name)
+        return f"table:{name}"
+
+
+@pytest.fixture
+def fake_boto3(monkeypatch):
+    calls = []
+
+    def resource(service, **kwargs):
+        calls.append((service, kwargs))
+        return FakeResource()
+
+    monkeypatch.setattr(boto3, "resource", resource)
+    monkeypatch.setattr(dynamodb, "_resource", None)
+    monkeypatch.setattr(dynamodb, "_init_seconds", None)
+    return calls
+
+
+def test_get_table_does_not_create_the_resource(fake_boto3):
+    table = dynamodb.get_table("doctors-dev")
+
+    assert table.name == "doctors-dev"
+    assert fake_boto3 == []
+    assert dynamodb.resource_init_seconds() is None
+
+
+def test_resource_is_created_once_and_shared(fake_boto3, monkeypatch):
+    monkeypatch.setenv("DYNAMODB_ENDPOINT_URL", "http://localhost:8000")
+    monkeypatch.setenv("DYNAMODB_MAX_POOL_CONNECTIONS", "64")
+
+    doctors = dynamodb.get_table("doctors-dev")
+    clinics = dynamodb.get_table("clinics-dev")
+    assert doctors._resolve() == "table:doctors-dev"
+    assert clinics._resolve() == "table:clinics-dev"
+
+    assert len(fake_boto3) == 1
+    service, kwargs = fake_boto3[0]
+    assert service == "dynamodb"
+    assert kwargs["endpoint_url"] == "http://localhost:8000"
+    assert kwargs["config"].max_pool_connections == 64
+    assert kwargs["config"].tcp_keepalive is True
+    assert dynamodb.get_resource().tables == ["doctors-dev", "clinics-dev"]
+    assert dynamodb.resource_init_seconds() is not None
+
+
+def test_attribute_access_resolves_the_table(fake_boto3):
+    table = dynamodb.get_table("ubigeo-dev")
+
+    assert table.upper() == "TABLE:UBIGEO-DEV"
+    assert len(fake_boto3) == 1
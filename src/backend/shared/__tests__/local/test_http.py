@@ -0,0 +1,56 @@
+"""Tests for the JSON encoders behind json_response."""
+import json
+from decimal import Decimal
+
+import pytest
+
+from shared import http
+
+
+ITEM = {
+    "ubigeoId": "150101",
+    "departamento": Decimal("15"),
+    "lat": Decimal("-12.0464"),
+    "seguroIds": {"RIMAC", "PACIFICO"},
+    "logo": b"\x89PNG",
+    "nombre": "Lima Cercado Ñaña",
+}
+EXPECTED = {
+    "ubigeoId": "150101",
+    "departamento": 15,
+    "lat": -12.0464,
+    "seguroIds": ["PACIFICO", "RIMAC"],
+    "logo": "iVBORw==",
+    "nombre": "Lima Cercado Ñaña",
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_encoder():
+    http.set_json_encoder(None)
+    yield
+    http.set_json_encoder(None)
+
+
+def test_stdlib_encoder_handles_dynamodb_types():
+    text = http.dumps_stdlib({"items": [ITEM]})
+
+    assert json.loads(text) == {"items": [EXPECTED]}
+    assert "Ñaña" in text
+
+
+def test_orjson_encoder_matches_stdlib():
+    pytest.importorskip("orjson")
+    encode = http._orjson_encoder()
+
+    assert encode({"items": [ITEM], 1: Decimal(2 ** 70)}) == http.dumps_stdlib({"items": [ITEM], 1: Decimal(2 ** 70)})
+
+
+def test_json_response_uses_the_configured_encoder(monkeypatch):
+    monkeypatch.setenv("JSON_ENCODER", "stdlib")
+    assert http.json_encoder() is http.dumps_stdlib
+    assert json.loads(http.json_response(200, ITEM)["body"]) == EXPECTED
+
+    http.set_json_encoder(lambda body: "custom")
+    assert http.json_response(200, ITEM)["body"] == "custom"
+    assert http.json_response(200, "already-serialised")["body"] == "already-serialised"
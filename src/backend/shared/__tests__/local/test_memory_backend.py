@@ -0,0 +1,74 @@
+"""Tests for the in-memory repository backend."""
+import pytest
+from boto3.dynamodb.conditions import Attr, Key
+
+from shared.backends.memory import MemoryBackend, MemoryTable, TableSchema
+
+
+DOCTORS = [
+    {"doctorId": "271", "especialidadId": "44", "clinicaIds": ["CLIN-14", "CLIN-48"], "rimacEnsured": False},
+    {"doctorId": "617", "especialidadId": "57", "clinicaIds": ["CLIN-33"], "rimacEnsured": True},
+    {"doctorId": "1113", "especialidadId": "44", "clinicaIds": ["CLIN-48"], "rimacEnsured": True},
+]
+
+
+@pytest.fixture
+def backend():
+    return MemoryBackend({"doctors": DOCTORS}, version="v1")
+
+
+def test_get_item_and_projection(backend):
+    table = backend.Table("doctors-dev")
+
+    assert table.get_item(Key={"doctorId": "617"})["Item"]["especialidadId"] == "57"
+    assert table.get_item(Key={"doctorId": "missing"}) == {}
+    projected = table.get_item(
+        Key={"doctorId": "617"},
+        ProjectionExpression="#p0, #p1",
+        ExpressionAttributeNames={"#p0": "doctorId", "#p1": "rimacEnsured"},
+    )["Item"]
+    assert projected == {"doctorId": "617", "rimacEnsured": True}
+
+
+def test_scan_filters_segments_and_versions_live_apart(backend):
+    table = backend.Table("doctors-dev")
+
+    rimac = table.scan(FilterExpression=Attr("rimacEnsured").eq(True) & Attr("clinicaIds").contains("CLIN-48"))
+    assert [item["doctorId"] for item in rimac["Items"]] == ["1113"]
+
+    segments = [table.scan(Segment=segment, TotalSegments=2)["Items"] for segment in range(2)]
+    keys = sorted(item["doctorId"] for items in segments for item in items)
+    assert keys == sorted(["271", "617", "1113"])
+    assert [item for items in segments for item in items] == table.scan()["Items"]
+    versions = backend.Table("dataset-versions-dev")
+    assert versions.get_item(Key={"tableName": "doctors-dev"})["Item"]["version"] == "v1"
+
+
+def test_query_uses_gsi_and_adjacency_partitions(backend):
+    by_specialty = backend.Table("doctors-dev").query(
+        IndexName="especialidadId-index", KeyConditionExpression=Key("especialidadId").eq("44")
+    )
+    assert [item["doctorId"] for item in by_specialty["Items"]] == ["1113", "271"]
+
+    by_clinic = backend.Table("clinic-doctors-dev").query(KeyConditionExpression=Key("pk").eq("CLINIC#CLIN-48"))
+    assert sorted(item["doctorId"] for item in by_clinic["Items"]) == ["1113", "271"]
+
+    with pytest.raises(ValueError):
+        backend.Table("doctors-dev").query(KeyConditionExpression=Attr("rimacEnsured").eq(True))
+
+
+def test_batch_get_item_returns_found_keys(backend):
+    response = backend.batch_get_item(
+        RequestItems={"doctors-dev": {"Keys": [{"doctorId": "271"}, {"doctorId": "nope"}]}}
+    )
+
+    assert [item["doctorId"] for item in response["Responses"]["doctors-dev"]] == ["271"]
+    assert response["UnprocessedKeys"] == {}
+
+
+def test_returned_items_are_copies():
+    table = MemoryTable("t", TableSchema("id"), [{"id": "a", "value": 1}])
+
+    table.scan()["Items"][0]["value"] = 2
+
+    assert table.get_item(Key={"id": "a"})["Item"]["value"] == 1
@@ -0,0 +1,37 @@
+"""Tests for accent-insensitive doctor name search."""
+from shared.repositories.name_index import NameIndex, doctor_full_name
+from shared.text import normalize, trigrams
+
+
+DOCTORS = [
+    {"doctorId": "271", "nombres": "Victor Cesar", "apellidoPaterno": "Tarazona", "apellidoMaterno": "Espinoza"},
+    {"doctorId": "300", "nombres": "Juan José", "apellidoPaterno": "Núñez", "apellidoMaterno": "Ju"},
+    {"doctorId": "301", "nombreCompleto": "JUAN NUNEZ"},
+    {"doctorId": "302", "nombres": "María", "apellidoPaterno": "García", "apellidoMaterno": "López"},
+]
+
+
+def test_normalize_strips_accents_case_and_punctuation():
+    assert normalize("  Núñez-GARCÍA, José ") == "nunez garcia jose"
+    assert normalize("Straße") == "strasse"
+    assert trigrams("ju") == {"  j", " ju", "ju "}
+
+
+def test_search_is_accent_insensitive_and_ranked_by_similarity():
+    index = NameIndex(DOCTORS)
+
+    hits = index.search("juan nuñez")
+    assert [doctor["doctorId"] for _, doctor in hits] == ["301", "300"]
+    assert hits[0][0] == 1.0
+    assert index.search("garcia")[0][1]["doctorId"] == "302"
+    assert index.search("zzzz") == []
+    assert doctor_full_name(DOCTORS[0]) == "Victor Cesar Tarazona Espinoza"
+
+
+def test_search_filters_and_resumes_after_score_and_id():
+    index = NameIndex(DOCTORS)
+
+    assert [d["doctorId"] for _, d in index.search("juan nunez", accept=lambda d: d["doctorId"] != "301")] == ["300"]
+    first = index.search("juan nunez", limit=1)
+    rest = index.search("juan nunez", after=(first[0][0], first[0][1]["doctorId"]))
+    assert [d["doctorId"] for _, d in first + rest] == ["301", "300"]
@@ -0,0 +1,151 @@
+"""Tests for signed cursors and cursor-based pagination."""
+import pytest
+
+from shared.exceptions import ValidationError
+from shared.pagination import cursor_secret, decode_cursor, encode_cursor, paginate
+from shared.repositories.doctor_index import DoctorIndex
+from shared.repositories.doctors_repo import DoctorsRepository
+
+
+DOCTORS = [{"doctorId": str(number), "especialidadId": "44" if number % 2 else "57"} for number in range(10)]
+
+
+def test_cursor_round_trip_and_scope():
+    token = encode_cursor({"k": "617", "p": 3}, {"especialidadId": "44", "clinicaId": None})
+
+    assert decode_cursor(token, {"especialidadId": "44"}) == {"k": "617", "p": 3}
+    with pytest.raises(ValidationError):
+        decode_cursor(token, {"especialidadId": "57"})
+
+
+def test_tampered_or_foreign_cursors_are_rejected(monkeypatch):
+    token = encode_cursor({"k": "617"}, {})
+    payload, signature = token.split(".")
+
+    for forged in (payload[:-2] + "AA." + signature, "garbage", token + "x"):
+        with pytest.raises(ValidationError):
+            decode_cursor(forged, {})
+
+    monkeypatch.setenv("CURSOR_SECRET", "another-secret")
+    with pytest.raises(ValidationError):
+        decode_cursor(token, {})
+
+
+def test_lambdas_require_a_cursor_secret(monkeypatch):
+    monkeypatch.delenv("CURSOR_SECRET", raising=False)
+    monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "search-doctors")
+
+    with pytest.raises(RuntimeError):
+        cursor_secret()
+
+    monkeypatch.setenv("CURSOR_SECRET", "deployed-secret")
+    assert cursor_secret() == b"deployed-secret"
+
+
+def test_resume_positions_must_be_indexes():
+    index = DoctorIndex(DOCTORS)
+
+    assert DoctorsRepository._after_position(index, {"k": "3", "p": 0}) == 3
+    assert DoctorsRepository._after_position(index, {"k": "gone", "p": 4}) == 4
+    assert DoctorsRepository._after_position(index, {"k": "gone"}) is None
+    for position in (-1, "4", 4.0, True, [4]):
+        with pytest.raises(ValidationError):
+            DoctorsRepository._after_position(index, {"k": "gone", "p": position})
+
+
+class KeyOrderTable:
+    """Table double scanning in key order like DynamoDB, with contiguous segments; items can be deleted."""
+
+    def __init__(self, items):
+        self.items = sorted(items, key=lambda item: item["doctorId"])
+        self.calls = []
+
+    def scan(self, **kwargs):
+        self.calls.append(kwargs)
+        items = self.items
+        if "Segment" in kwargs:
+            size = len(items)
+            items = [item for ordinal, item in enumerate(items)
+                     if ordinal * kwargs["TotalSegments"] // size == kwargs["Segment"]]
+        if "ExclusiveStartKey" in kwargs:
+            items = [item for item in items if item["doctorId"] > kwargs["ExclusiveStartKey"]["doctorId"]]
+        return {"Items": [dict(item) for item in items]}
+
+
+def test_scan_cursor_resumes_after_a_deleted_cursor_item(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setenv("DOCTOR_INDEX_ENABLED", "false")
+    monkeypatch.setenv("DOCTORS_SCAN_SEGMENTS", "4")
+    repository = DoctorsRepository()
+    repository.table = KeyOrderTable(DOCTORS)
+    filters = {"especialidadId": None}
+
+    def fetch(limit, resume):
+        return repository.list_doctors(filters, limit, resume=resume)
+
+    items, fields = paginate(fetch, repository.resume_token, filters, page=1, page_size=3)
+    assert [doctor["doctorId"] for doctor in items] == ["0", "1", "2"]
+
+    repository.table.items = [doctor for doctor in repository.table.items if doctor["doctorId"] != "2"]
+    repository.table.calls.clear()
+    items, fields = paginate(fetch, repository.resume_token, filters, page=1, page_size=3, cursor=fields["nextCursor"])
+
+    assert [doctor["doctorId"] for doctor in items] == ["3", "4", "5"]
+    assert fields["nextCursor"] is not None
+    # One sequential scan from the cursor key, not the parallel scan re-read from the start
+    assert [call.get("ExclusiveStartKey") for call in repository.table.calls] == [{"doctorId": "2"}]
+
+
+def test_cursor_pages_cover_every_match_once():
+    index = DoctorIndex(DOCTORS)
+    filters = {"especialidadId": "44"}
+    reads = []
+
+    def fetch(limit, resume):
+        after = index.positions[resume["k"]] if resume else None
+        found = index.search(filters, limit, after=after)
+        reads.append(len(found))
+        return found
+
+    def resume_token(doctor):
+        return {"k": doctor["doctorId"]}
+
+    seen, cursor = [], None
+    while True:
+        items, fields = paginate(fetch, resume_token, filters, page=1, page_size=2, cursor=cursor)
+        seen += [doctor["doctorId"] for doctor in items]
+        cursor = fields["nextCursor"]
+        if cursor is None:
+            break
+
+    assert seen == ["1", "3", "5", "7", "9"]
+    # The first (page-number) request counts every match; cursor pages read at most pageSize + 1
+    assert reads == [5, 3, 1]
+
+
+def test_page_requests_keep_total():
+    items, fields = paginate(
+        lambda limit, resume: DOCTORS[:limit] if limit else DOCTORS,
+        lambda doctor: {"k": doctor["doctorId"]},
+        {},
+        page=5,
+        page_size=2,
+    )
+
+    assert [doctor["doctorId"] for doctor in items] == ["8", "9"]
+    assert fields == {"page": 5, "pageSize": 2, "total": 10, "nextCursor": None}
+
+
+def test_counted_page_requests_fetch_up_to_the_page():
+    limits = []
+
+    def fetch(limit, resume):
+        limits.append(limit)
+        return DOCTORS[:limit]
+
+    items, fields = paginate(fetch, lambda doctor: {"k": doctor["doctorId"]}, {}, page=2, page_size=3, count=lambda: 10)
+
+    assert [doctor["doctorId"] for doctor in items] == ["3", "4", "5"]
+    assert fields["total"] == 10 and fields["nextCursor"] is not None
+    assert limits == [6]
+    assert paginate(fetch, lambda doctor: {}, {}, page=9, page_size=3, count=lambda: 10)[0] == []
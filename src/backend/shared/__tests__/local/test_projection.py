@@ -0,0 +1,19 @@
+"""Tests for ProjectionExpression building."""
+from shared.repositories.projection import projection_kwargs
+
+
+def test_projection_aliases_every_attribute():
+    kwargs = projection_kwargs(["doctorId", "status", "nombres"])
+
+    assert kwargs["ProjectionExpression"] == "#p0, #p1, #p2"
+    assert kwargs["ExpressionAttributeNames"] == {"#p0": "doctorId", "#p1": "status", "#p2": "nombres"}
+
+
+def test_projection_adds_required_fields_once():
+    kwargs = projection_kwargs(["doctorId", "fotoUrl"], ("doctorId", "especialidadId"))
+
+    assert list(kwargs["ExpressionAttributeNames"].values()) == ["doctorId", "fotoUrl", "especialidadId"]
+
+
+def test_projection_without_fields_reads_everything():
+    assert projection_kwargs(None, ("doctorId",)) == {}
@@ -0,0 +1,63 @@
+"""Tests for the sparse coverage relations."""
+import numpy as np
+import pytest
+
+from shared.repositories.facets import count_facets
+from shared.repositories.relations import CoverageRelations, Relation
+
+
+CLINICS = [
+    {"clinicaId": "CLIN-1", "ubigeoId": "150132", "seguroIds": ["RIMAC", "PACIFICO"]},
+    {"clinicaId": "CLIN-2", "ubigeoId": "70102", "seguroIds": ["RIMAC"]},
+    {"clinicaId": "CLIN-3", "ubigeoId": "150132"},
+]
+DOCTORS = [
+    {"doctorId": "D1", "especialidadId": "44", "clinicaIds": ["CLIN-1", "CLIN-2"], "rimacEnsured": True},
+    {"doctorId": "D2", "especialidadId": "44", "clinicaId": "CLIN-3", "rimacEnsured": False},
+    {"doctorId": "D3", "especialidadId": "9", "clinicaIds": ["CLIN-2", "CLIN-2"], "rimacEnsured": True},
+    {"doctorId": "D4", "clinicaId": "CLIN-1"},
+    {"doctorId": "D5", "especialidadId": "9", "clinicaId": "CLIN-404", "rimacEnsured": False},
+]
+
+
+def test_compose_is_the_boolean_matrix_product():
+    left = Relation.from_pairs(["a", "b", "c"], ["x", "y"], np.array([0, 0, 2, 2]), np.array([0, 1, 1, 1]))
+    right = Relation.from_pairs(["x", "y"], ["p", "q", "r"], np.array([0, 0, 1]), np.array([0, 2, 2]))
+
+    product = left.compose(right)
+
+    assert sorted(zip(product.row_codes().tolist(), product.indices.tolist())) == [(0, 0), (0, 2), (2, 2)]
+    dense = lambda relation: np.array([[col in relation.indices[relation.indptr[row]:relation.indptr[row + 1]]
+                                        for col in range(relation.shape[1])] for row in range(relation.shape[0])])
+    assert (dense(product) == (dense(left).astype(int) @ dense(right).astype(int) > 0)).all()
+
+
+def test_group_counts_count_each_doctor_once_per_group():
+    relations = CoverageRelations(DOCTORS, CLINICS)
+
+    assert relations.group_counts({"seguroId": "RIMAC"}, ("especialidadId", "ubigeoId")) == [
+        {"especialidadId": "44", "ubigeoId": "150132", "doctors": 1},
+        {"especialidadId": "44", "ubigeoId": "70102", "doctors": 1},
+        {"especialidadId": "9", "ubigeoId": "70102", "doctors": 1},
+    ]
+    assert relations.count({"seguroId": "RIMAC"}) == 3
+    assert relations.group_counts({}, ("especialidadId",)) == [
+        {"especialidadId": "44", "doctors": 2},
+        {"especialidadId": "9", "doctors": 2},
+    ]
+    assert relations.group_counts({"ubigeoId": "150132", "rimacEnsured": False}, ("clinicaId",)) == [
+        {"clinicaId": "CLIN-3", "doctors": 1},
+    ]
+    with pytest.raises(ValueError):
+        relations.group_counts({}, ("seguroId", "ubigeoId"))
+
+
+def test_facet_counts_match_the_per_doctor_loop():
+    relations = CoverageRelations(DOCTORS, CLINICS)
+    clinics = {clinic["clinicaId"]: clinic for clinic in CLINICS}
+    names = ("especialidadId", "seguroId", "ubigeoId")
+
+    for filters in ({}, {"especialidadId": ("9", "44")}, {"seguroId": "PACIFICO"}, {"rimacEnsured": True}):
+        mask = relations.mask(filters)
+        matching = [doctor for doctor, selected in zip(DOCTORS, mask) if selected]
+        assert relations.facet_counts(filters, names) == count_facets(matching, names, clinics)
@@ -26,6 +26,14 @@ def test_list_clinics_filters_by_multiple_fields():
     assert [clinic["clinicaId"] for clinic in results] == ["CLIN-002"]
 
 
+def test_list_clinics_matches_any_value_of_an_in_list():
+    repo = ClinicsRepository()
+
+    results = repo.list_clinics({"ubigeoId": ("150101", "999999"), "especialidadId": ["DERM", "ONCO"]})
+
+    assert [clinic["clinicaId"] for clinic in results] == ["CLIN-002"]
+
+
 def test_get_clinic_returns_none_for_unknown_id():
     repo = ClinicsRepository()
 
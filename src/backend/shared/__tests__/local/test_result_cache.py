@@ -0,0 +1,48 @@
+"""Tests for the LRU + TTL query result cache."""
+from shared.result_cache import ResultCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_the_least_recently_used_entry():
+    cache = ResultCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", 1, ["A"])
+    cache.put("b", 1, ["B"])
+
+    assert cache.get("a", 1) == ["A"]
+    cache.put("c", 1, ["C"])
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) == ["A"]
+    assert cache.get("c", 1) == ["C"]
+    assert cache.stats() == {"hits": 3, "misses": 1, "hitRate": 0.75, "evictions": 1, "size": 2, "maxEntries": 2}
+
+
+def test_entries_expire_and_follow_the_dataset_version():
+    clock = FakeClock()
+    cache = ResultCache(max_entries=8, ttl_seconds=30, clock=clock)
+    cache.put("q", ("v1",), ["A"])
+
+    assert cache.get("q", ("v2",)) is None
+    assert cache.get("q", ("v1",)) is None  # dropped by the version mismatch
+
+    cache.put("q", ("v1",), ["A"])
+    clock.now = 29.0
+    assert cache.get("q", ("v1",)) == ["A"]
+    clock.now = 30.0
+    assert cache.get("q", ("v1",)) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_zero_sized_cache_stores_nothing():
+    cache = ResultCache(max_entries=0, ttl_seconds=60)
+    cache.put("q", 1, ["A"])
+
+    assert cache.get("q", 1) is None
+    assert cache.stats()["misses"] == 1
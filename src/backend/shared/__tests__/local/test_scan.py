@@ -0,0 +1,141 @@
+"""Tests for the paginated scan helpers."""
+import time
+
+import pytest
+
+from shared.repositories.scan import (
+    iter_parallel_scan,
+    iter_scan,
+    iter_scan_pages,
+    scan_matching,
+    scan_segments,
+)
+
+
+class PagedTable:
+    """Minimal table double returning items in fixed-size pages."""
+
+    def __init__(self, items, page_size):
+        self.items = items
+        self.page_size = page_size
+        self.calls = []
+
+    def scan(self, **kwargs):
+        self.calls.append(kwargs)
+        items = self.items
+        if "Segment" in kwargs:
+            items = items[kwargs["Segment"]::kwargs["TotalSegments"]]
+        start = kwargs.get("ExclusiveStartKey", {}).get("position", 0)
+        end = start + self.page_size
+        response = {"Items": items[start:end]}
+        if end < len(items):
+            response["LastEvaluatedKey"] = {"position": end}
+        return response
+
+
+def _doctors(count):
+    return [{"doctorId": str(index), "especialidadId": str(index % 3)} for index in range(count)]
+
+
+def test_iter_scan_follows_last_evaluated_key():
+    table = PagedTable(_doctors(25), page_size=10)
+
+    results = list(iter_scan(table))
+
+    assert [item["doctorId"] for item in results] == [str(index) for index in range(25)]
+    assert len(table.calls) == 3
+
+
+def test_iter_scan_pages_without_prefetch_passes_scan_kwargs():
+    table = PagedTable(_doctors(5), page_size=2)
+
+    pages = list(iter_scan_pages(table, prefetch=False, ProjectionExpression="doctorId"))
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert all(call["ProjectionExpression"] == "doctorId" for call in table.calls)
+
+
+def test_scan_matching_filters_across_pages():
+    table = PagedTable(_doctors(30), page_size=7)
+
+    results = scan_matching(table, lambda item: item["especialidadId"] == "1")
+
+    assert [item["doctorId"] for item in results] == [str(index) for index in range(1, 30, 3)]
+
+
+def test_scan_matching_stops_once_limit_is_reached():
+    table = PagedTable(_doctors(100), page_size=10)
+
+    results = scan_matching(table, lambda item: True, limit=5, prefetch=False)
+
+    assert len(results) == 5
+    assert len(table.calls) == 1
+
+
+def test_iter_parallel_scan_merges_segments_in_segment_order():
+    table = PagedTable(_doctors(20), page_size=3)
+
+    first = [item["doctorId"] for item in iter_parallel_scan(table, 4)]
+    second = [item["doctorId"] for item in iter_parallel_scan(table, 4)]
+
+    assert first == second
+    assert sorted(first, key=int) == [str(index) for index in range(20)]
+    assert first[:5] == ["0", "4", "8", "12", "16"]
+    assert {call["TotalSegments"] for call in table.calls} == {4}
+
+
+def test_iter_parallel_scan_streams_and_stops_when_closed():
+    table = PagedTable(_doctors(400), page_size=2)
+
+    items = iter_parallel_scan(table, 2, max_buffered_pages=1)
+    first = next(items)
+    items.close()
+    time.sleep(0.2)
+    calls = len(table.calls)
+    time.sleep(0.1)
+
+    assert first["doctorId"] == "0"
+    # Each worker reads at most a couple of pages past the one consumed, not its 100-page segment
+    assert calls <= 6 and len(table.calls) == calls
+
+
+class WorkerTables(PagedTable):
+    """Table double that hands each scan worker its own handle."""
+
+    def __init__(self, items, page_size):
+        super().__init__(items, page_size)
+        self.workers = []
+
+    def worker_table(self):
+        worker = PagedTable(self.items, self.page_size)
+        self.workers.append(worker)
+        return worker
+
+    def scan(self, **kwargs):  # pragma: no cover - workers must scan through their own handle
+        raise AssertionError("shared table scanned")
+
+
+def test_iter_parallel_scan_gives_each_worker_its_own_table():
+    table = WorkerTables(_doctors(20), page_size=3)
+
+    assert sorted((item["doctorId"] for item in iter_parallel_scan(table, 4)), key=int) == [str(i) for i in range(20)]
+    assert sorted(call["Segment"] for worker in table.workers for call in worker.calls[:1]) == [0, 1, 2, 3]
+
+
+def test_iter_parallel_scan_raises_worker_errors():
+    class FailingTable(PagedTable):
+        def scan(self, **kwargs):
+            if kwargs["Segment"] == 1:
+                raise RuntimeError("throttled")
+            return super().scan(**kwargs)
+
+    with pytest.raises(RuntimeError, match="throttled"):
+        list(iter_parallel_scan(FailingTable(_doctors(20), page_size=3), 2))
+
+
+def test_scan_segments_reads_environment_override(monkeypatch):
+    monkeypatch.setenv("DOCTORS_SCAN_SEGMENTS", "8")
+    monkeypatch.delenv("CLINICS_SCAN_SEGMENTS", raising=False)
+
+    assert scan_segments("doctors") == 8
+    assert scan_segments("clinics") == 1
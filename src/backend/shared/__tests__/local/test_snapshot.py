@@ -0,0 +1,152 @@
+"""Tests for the warm-container reference table snapshots."""
+from shared.repositories import relations_repo
+from shared.repositories.relations_repo import RelationsRepository
+from shared.repositories.snapshot import ScanCache, TableSnapshot, bump_dataset_versions, write_dataset_version
+
+
+class FakeTable:
+    """Single-page table double that counts scans."""
+
+    name = "clinics-test"
+
+    def __init__(self, items):
+        self.items = items
+        self.scans = 0
+
+    def scan(self, **kwargs):
+        self.scans += 1
+        return {"Items": list(self.items)}
+
+
+class FakeVersions:
+    """Dataset-versions table double that counts reads."""
+
+    def __init__(self):
+        self.items = {}
+        self.gets = 0
+
+    def get_item(self, Key):
+        self.gets += 1
+        item = self.items.get(Key["tableName"])
+        return {"Item": item} if item else {}
+
+    def put_item(self, Item):
+        self.items[Item["tableName"]] = Item
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _tables(version="1"):
+    table = FakeTable([
+        {"clinicaId": "CLIN-1", "nombreClinica": "Clínica Angloamericana"},
+        {"clinicaId": "CLIN-2", "nombreClinica": "Clínica Bellavista"},
+    ])
+    versions = FakeVersions()
+    write_dataset_version(versions, table.name, version)
+    return table, versions
+
+
+def test_snapshot_loads_once_and_reads_version_by_key():
+    table, versions = _tables()
+    snapshot = TableSnapshot(table, "clinicaId", ttl_seconds=60, clock=FakeClock(), versions_table=versions)
+
+    assert snapshot.get("CLIN-1")["nombreClinica"] == "Clínica Angloamericana"
+    assert len(snapshot.items()) == 2
+    assert snapshot.version == "1"
+    assert (table.scans, versions.gets) == (1, 1)
+
+
+def test_snapshot_keeps_items_when_version_is_unchanged_after_ttl():
+    table, versions = _tables()
+    clock = FakeClock()
+    snapshot = TableSnapshot(table, "clinicaId", ttl_seconds=60, clock=clock, versions_table=versions)
+    snapshot.items()
+
+    clock.now = 61
+    snapshot.items()
+
+    assert table.scans == 1
+    assert versions.gets == 2
+
+
+def test_snapshot_reloads_when_version_changes():
+    table, versions = _tables()
+    clock = FakeClock()
+    snapshot = TableSnapshot(table, "clinicaId", ttl_seconds=60, clock=clock, versions_table=versions)
+    snapshot.items()
+
+    table.items = [{"clinicaId": "CLIN-3"}]
+    write_dataset_version(versions, table.name, "2")
+    clock.now = 61
+
+    assert [item["clinicaId"] for item in snapshot.items()] == ["CLIN-3"]
+    assert snapshot.version == "2"
+    assert table.scans == 2
+
+
+def test_loaders_bump_snapshot_tables_and_drop_legacy_markers():
+    class Resource:
+        def __init__(self):
+            self.versions = FakeVersions()
+            self.deleted = []
+
+        def Table(self, name):
+            if name == "dataset-versions-dev":
+                return self.versions
+            resource = self
+
+            class DataTable:
+                def delete_item(self, Key):
+                    resource.deleted.append((name, Key))
+
+            return DataTable()
+
+    dynamodb = Resource()
+
+    bumped = bump_dataset_versions(dynamodb, "dev", ["doctors", "clinic-doctors", "seguros"], "7")
+
+    assert bumped == ["doctors-dev", "seguros-dev"]
+    assert {name: item["version"] for name, item in dynamodb.versions.items.items()} == {"doctors-dev": "7", "seguros-dev": "7"}
+    assert dynamodb.deleted == [
+        ("doctors-dev", {"doctorId": "__dataset_version__"}),
+        ("seguros-dev", {"seguroId": "__dataset_version__"}),
+    ]
+
+
+def test_scan_cache_rebuilds_only_when_a_version_changes():
+    table, versions = _tables()
+    clock = FakeClock()
+    builds = []
+    cache = ScanCache([table], lambda: builds.append(len(builds)) or len(builds), ttl_seconds=60, clock=clock,
+                      versions_table=versions)
+
+    assert cache.get() == cache.get() == 1
+    assert versions.gets == 1
+
+    clock.now = 61
+    assert cache.get() == 1
+    assert versions.gets == 2
+
+    write_dataset_version(versions, table.name, "2")
+    clock.now = 122
+    assert cache.get() == 2
+
+
+def test_relations_without_snapshots_are_built_from_one_scan_per_table(monkeypatch):
+    monkeypatch.setenv("SNAPSHOT_CACHE_ENABLED", "false")
+    tables = {
+        "doctors-dev": FakeTable([{"doctorId": "D1", "especialidadId": "44", "clinicaId": "CLIN-1"}]),
+        "clinics-dev": FakeTable([{"clinicaId": "CLIN-1", "ubigeoId": "150132", "seguroIds": ["RIMAC"]}]),
+    }
+    monkeypatch.setattr(relations_repo, "get_table", tables.__getitem__)
+    repository = RelationsRepository()
+
+    assert repository.relations() is repository.relations()
+    assert repository.coverage({"seguroId": "RIMAC"}, ("especialidadId",))[0] == 1
+    assert [table.scans for table in tables.values()] == [1, 1]
@@ -0,0 +1,73 @@
+"""Tests for typo-tolerant specialty resolution."""
+from shared.repositories import specialties_repo
+from shared.repositories.specialties_repo import SpecialtiesRepository
+from shared.repositories.specialty_resolver import SpecialtyResolver, deletes, edit_distance
+
+
+SPECIALTIES = [
+    {"especialidadId": "8", "nombre": "Cardiología"},
+    {"especialidadId": "108", "nombre": "Cardiología Infantil"},
+    {"especialidadId": "41", "nombre": "Ortopedia Y Traumatología"},
+    {"especialidadId": "44", "nombre": "Pediatría"},
+    {"especialidadId": "12", "nombre": "Cirugía Plástica"},
+    {"especialidadId": "13", "nombre": "Cirugía General"},
+    {"especialidadId": "60", "nombre": "Otorrinolaringología"},
+]
+
+
+def test_edit_distance_counts_transpositions_and_stops_at_limit():
+    assert edit_distance("cardiologo", "cardiologia", 2) == 2
+    assert edit_distance("pedaitra", "pediatra", 1) == 1
+    assert edit_distance("urologia", "neumologia", 1) == 2
+    assert deletes("abc", 1) == {"abc", "bc", "ac", "ab"}
+
+
+def test_practitioner_forms_typos_and_synonyms_resolve():
+    resolver = SpecialtyResolver(SPECIALTIES)
+
+    assert resolver.resolve("cardiologo") == ["8", "108"]
+    assert resolver.resolve("Traumatólogo") == ["41"]
+    assert resolver.resolve("pediatar") == ["44"]
+    assert resolver.resolve("otorrino") == ["60"]
+    assert resolver.resolve("cardiologia", limit=1) == ["8"]
+
+
+def test_multi_word_queries_intersect_their_words():
+    resolver = SpecialtyResolver(SPECIALTIES)
+
+    assert resolver.resolve("cirujano plastico") == ["12"]
+    assert resolver.resolve("cirujano pediatra") == []
+    assert resolver.resolve("xyz") == []
+
+
+def test_terms_beyond_every_indexed_name_are_looked_up_exactly():
+    resolver = SpecialtyResolver(SPECIALTIES)
+
+    assert resolver.resolve("otorrinolaringologiaa") == ["60"]
+    assert resolver._lookup("x" * 40) == {}
+    assert resolver.resolve("cardiologia " * 10) == []
+
+
+class ScanTable:
+    """Single-page table double that counts scans."""
+
+    name = "especialidades-dev"
+
+    def __init__(self, items):
+        self.items = items
+        self.scans = 0
+
+    def scan(self, **kwargs):
+        self.scans += 1
+        return {"Items": list(self.items)}
+
+
+def test_repository_keeps_its_resolver_without_snapshots(monkeypatch):
+    monkeypatch.setenv("SNAPSHOT_CACHE_ENABLED", "false")
+    table = ScanTable(SPECIALTIES)
+    monkeypatch.setattr(specialties_repo, "get_table", lambda name: table)
+    repository = SpecialtiesRepository()
+
+    assert repository.resolve("cardiologo") == ["8", "108"]
+    assert repository.resolve("pediatar") == ["44"]
+    assert table.scans == 1
@@ -0,0 +1,95 @@
+"""Tests for the read-only SQLite catalog backend."""
+import pytest
+from boto3.dynamodb.conditions import Attr, Key
+
+from shared.backends.schemas import with_derived_tables
+from shared.backends.sqlite import SqliteBackend, build_catalog
+
+
+DOCTORS = [
+    {"doctorId": "271", "especialidadId": "44", "clinicaIds": ["CLIN-14", "CLIN-48"], "rimacEnsured": False},
+    {"doctorId": "617", "especialidadId": "57", "clinicaIds": ["CLIN-33"], "rimacEnsured": True},
+    {"doctorId": "1113", "especialidadId": "44", "clinicaIds": ["CLIN-48"], "rimacEnsured": True},
+]
+
+
+class FakeFallback:
+    """Stands in for shared.backends.dynamodb."""
+
+    def __init__(self):
+        self.requests = []
+
+    def get_table(self, name):
+        return f"dynamodb:{name}"
+
+    def get_resource(self):
+        return self
+
+    def batch_get_item(self, RequestItems):
+        self.requests.append(RequestItems)
+        return {"Responses": {name: [{"seguroId": "RIMAC"}] for name in RequestItems}}
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = tmp_path / "catalog.sqlite"
+    counts = build_catalog(with_derived_tables({"doctors": DOCTORS}), "v1", path)
+    assert counts == {"doctors": 3, "clinic-doctors": 4}
+    return path
+
+
+def test_get_item_scan_and_dataset_version(catalog):
+    backend = SqliteBackend(catalog)
+    table = backend.Table("doctors-dev")
+
+    assert backend.version == "v1"
+    assert table.get_item(Key={"doctorId": "617"})["Item"]["clinicaIds"] == ["CLIN-33"]
+    assert table.get_item(Key={"doctorId": "nope"}) == {}
+
+    rimac = table.scan(FilterExpression=Attr("rimacEnsured").eq(True) & Attr("clinicaIds").contains("CLIN-48"))
+    assert [item["doctorId"] for item in rimac["Items"]] == ["1113"]
+
+    segments = [table.scan(Segment=segment, TotalSegments=3)["Items"] for segment in range(3)]
+    assert sum(len(items) for items in segments) == 3
+    assert [item for items in segments for item in items] == table.scan()["Items"]
+    versions = backend.Table("dataset-versions-dev")
+    assert versions.get_item(Key={"tableName": "doctors-dev"})["Item"]["version"] == "v1"
+    assert versions.get_item(Key={"tableName": "seguros-dev"}) == {}
+
+
+def test_query_reads_gsi_and_adjacency_partitions(catalog):
+    backend = SqliteBackend(catalog)
+
+    by_specialty = backend.Table("doctors-dev").query(
+        IndexName="especialidadId-index",
+        KeyConditionExpression=Key("especialidadId").eq("44"),
+        ProjectionExpression="#p0",
+        ExpressionAttributeNames={"#p0": "doctorId"},
+    )
+    assert by_specialty["Items"] == [{"doctorId": "1113"}, {"doctorId": "271"}]
+
+    by_clinic = backend.Table("clinic-doctors-dev").query(KeyConditionExpression=Key("pk").eq("CLINIC#CLIN-48"))
+    assert sorted(item["doctorId"] for item in by_clinic["Items"]) == ["1113", "271"]
+
+
+def test_missing_tables_fall_back_to_dynamodb(catalog):
+    fallback = FakeFallback()
+    backend = SqliteBackend(catalog, fallback=fallback)
+
+    assert backend.Table("seguros-dev") == "dynamodb:seguros-dev"
+    response = backend.batch_get_item(
+        RequestItems={
+            "doctors-dev": {"Keys": [{"doctorId": "271"}, {"doctorId": "617"}]},
+            "seguros-dev": {"Keys": [{"seguroId": "RIMAC"}]},
+        }
+    )
+
+    assert sorted(item["doctorId"] for item in response["Responses"]["doctors-dev"]) == ["271", "617"]
+    assert response["Responses"]["seguros-dev"] == [{"seguroId": "RIMAC"}]
+    assert list(fallback.requests[0]) == ["seguros-dev"]
+
+
+def test_without_fallback_missing_tables_are_empty(catalog):
+    backend = SqliteBackend(catalog)
+
+    assert backend.Table("seguros-dev").scan()["Items"] == []
@@ -0,0 +1,53 @@
+"""Tests for nearby-district hop tables and ring-ordered doctor search."""
+from shared.repositories.doctor_index import DoctorIndex
+from shared.repositories.doctor_planner import DoctorQueryPlanner
+from shared.repositories.ubigeo_graph import adjacency, hop_tables, merge_rings, rings_from
+
+
+UBIGEOS = [
+    {"ubigeoId": "150101", "idCercanos": ["150105", "150113"]},
+    {"ubigeoId": "150105", "idCercanos": ["150122"]},
+    {"ubigeoId": "150122", "idCercanos": []},
+    {"ubigeoId": "150140"},
+]
+DOCTORS = [
+    {"doctorId": "1", "especialidadId": "44", "clinicaIds": ["CLIN-3"]},
+    {"doctorId": "2", "especialidadId": "44", "clinicaIds": ["CLIN-1", "CLIN-2"]},
+    {"doctorId": "3", "especialidadId": "57", "clinicaIds": ["CLIN-2"]},
+    {"doctorId": "4", "especialidadId": "44", "clinicaIds": ["CLIN-1"]},
+]
+
+
+def test_adjacency_is_symmetric_and_keeps_unknown_neighbours():
+    graph = adjacency(UBIGEOS)
+
+    assert graph["150122"] == {"150105"}
+    assert graph["150113"] == {"150101"}
+    assert graph["150140"] == set()
+
+
+def test_rings_are_breadth_first_and_stop_at_max_hops():
+    tables = hop_tables(UBIGEOS)
+
+    assert tables["150122"] == [["150122"], ["150105"], ["150101"], ["150113"]]
+    assert rings_from(adjacency(UBIGEOS), "150122", max_hops=1) == [["150122"], ["150105"]]
+    assert tables["150140"] == [["150140"]]
+
+
+def test_merged_rings_list_each_district_under_its_nearest_origin():
+    tables = hop_tables(UBIGEOS)
+
+    assert merge_rings([tables["150122"], tables["150113"]]) == [["150113", "150122"], ["150101", "150105"]]
+    assert merge_rings([]) == []
+
+
+def test_ring_search_lists_each_doctor_under_its_nearest_ring():
+    planner = DoctorQueryPlanner(DoctorIndex(DOCTORS), [])
+    rings = [["CLIN-1"], ["CLIN-2"], ["CLIN-3"]]
+
+    hits = planner.search_rings({"especialidadId": "44"}, rings)
+    assert [(hop, d["doctorId"]) for hop, d in hits] == [(0, "2"), (0, "4"), (2, "1")]
+
+    first = planner.search_rings({}, rings, limit=2)
+    rest = planner.search_rings({}, rings, after=(first[-1][0], 3))
+    assert [d["doctorId"] for _, d in first + rest] == ["2", "4", "3", "1"]
@@ -0,0 +1,99 @@
+"""Repository storage backends, selected with ``REPOSITORY_BACKEND``.
+
+The repositories talk to tables through the boto3 ``Table`` API subset they
+already use (``get_item``, ``scan``, ``query``) plus ``batch_get_item`` on the
+resource. A backend provides both:
+
+- ``dynamodb`` (default): the shared boto3 resource in :mod:`.dynamodb`.
+- ``memory``: :mod:`.memory`, loading ``shared/sample_data.py`` or, with
+  ``MEMORY_BACKEND_SOURCE=jsonl``, the ``final_tables/transformed`` exports.
+- ``sqlite``: :mod:`.sqlite`, the read-only catalog bundled with the package
+  (``SQLITE_CATALOG_PATH``). Tables it lacks, or a missing catalog file, fall
+  back to DynamoDB unless ``SQLITE_FALLBACK_ENABLED=false``.
+"""
+from __future__ import annotations
+
+import os
+import threading
+
+BACKENDS = ("dynamodb", "memory", "sqlite")
+
+_memory_backend = None
+_memory_lock = threading.Lock()
+_sqlite_backend = None
+_sqlite_lock = threading.Lock()
+
+
+def repository_backend() -> str:
+    name = os.environ.get("REPOSITORY_BACKEND", "dynamodb").lower()
+    if name not in BACKENDS:
+        raise ValueError(f"REPOSITORY_BACKEND must be one of {', '.join(BACKENDS)}, got {name!r}")
+    return name
+
+
+def _get_memory_backend():
+    global _memory_backend
+    if _memory_backend is None:
+        with _memory_lock:
+            if _memory_backend is None:
+                from .memory import MemoryBackend
+
+                _memory_backend = MemoryBackend.from_environment()
+    return _memory_backend
+
+
+def _get_sqlite_backend():
+    """Return the catalog backend, or None when falling back to DynamoDB entirely."""
+    global _sqlite_backend
+    if _sqlite_backend is None:
+        with _sqlite_lock:
+            if _sqlite_backend is None:
+                from . import dynamodb
+                from .sqlite import SqliteBackend, catalog_path, sqlite_fallback_enabled
+
+                fallback = dynamodb if sqlite_fallback_enabled() else None
+                path = catalog_path()
+                if not path.exists():
+                    if fallback is None:
+                        raise FileNotFoundError(f"SQLite catalog not found: {path}")
+                    return None
+                _sqlite_backend = SqliteBackend(path, fallback=fallback)
+    return _sqlite_backend
+
+
+def _selected_backend():
+    backend = repository_backend()
+    if backend == "memory":
+        return _get_memory_backend()
+    if backend == "sqlite":
+        return _get_sqlite_backend()
+    return None
+
+
+def get_resource():
+    """Return the object answering ``batch_get_item`` for the selected backend."""
+    backend = _selected_backend()
+    if backend is not None:
+        return backend
+    from .dynamodb import get_resource as get_dynamodb_resource
+
+    return get_dynamodb_resource()
+
+
+def get_table(name: str):
+    """Return a handle to table ``name`` on the selected backend."""
+    backend = _selected_backend()
+    if backend is not None:
+        return backend.Table(name)
+    from .dynamodb import get_table as get_dynamodb_table
+
+    return get_dynamodb_table(name)
+
+
+def reset_backends() -> None:
+    """Drop the loaded in-memory dataset and catalog (mainly for tests)."""
+    global _memory_backend, _sqlite_backend
+    with _memory_lock:
+        _memory_backend = None
+    with _sqlite_lock:
+        _sqlite_backend = None
@@ -0,0 +1,105 @@
+"""DynamoDB backend: one resource shared by every repository in the container.
+
+Repositories used to call ``boto3.resource("dynamodb")`` in their
+constructors, which runs at import time in each ``handler.py`` and gives every
+repository its own connection pool. Here one resource is created lazily on
+first use, configured with a larger pool and TCP keep-alive, and reused for the
+lifetime of the container.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Optional
+
+_resource = None
+_resource_lock = threading.Lock()
+_init_seconds: Optional[float] = None
+
+DEFAULT_MAX_POOL_CONNECTIONS = 32
+
+
+def _client_config():
+    from botocore.config import Config
+
+    try:
+        pool_size = int(os.environ.get("DYNAMODB_MAX_POOL_CONNECTIONS", DEFAULT_MAX_POOL_CONNECTIONS))
+    except ValueError:
+        pool_size = DEFAULT_MAX_POOL_CONNECTIONS
+    return Config(
+        max_pool_connections=pool_size,
+        tcp_keepalive=True,
+        retries={"max_attempts": 3, "mode": "standard"},
+    )
+
+
+def get_resource():
+    """Return the shared DynamoDB resource, creating it on first call."""
+    global _resource, _init_seconds
+    if _resource is None:
+        with _resource_lock:
+            if _resource is None:
+                start = time.perf_counter()
+                import boto3
+
+                _resource = boto3.resource(
+                    "dynamodb",
+                    endpoint_url=os.environ.get("DYNAMODB_ENDPOINT_URL"),
+                    config=_client_config(),
+                )
+                _init_seconds = time.perf_counter() - start
+    return _resource
+
+
+def resource_init_seconds() -> Optional[float]:
+    """Seconds spent creating the shared resource, or None if not created yet."""
+    return _init_seconds
+
+
+class LazyTable:
+    """Handle to a DynamoDB table that only touches boto3 when first used."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._table = None
+
+    def _resolve(self):
+        if self._table is None:
+            self._table = get_resource().Table(self.name)
+        return self._table
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._resolve(), attribute)
+
+    def worker_table(self) -> "ClientTable":
+        """Return a scan handle that a parallel scan worker can use on its own thread."""
+        return ClientTable(self.name, get_resource().meta.client)
+
+
+class ClientTable:
+    """Scan-only table handle over a low-level DynamoDB client.
+
+    boto3 clients are thread-safe where resource ``Table`` objects are not, so
+    parallel scan workers each get one of these around the shared client.
+    Items come back deserialized like the resource's (numbers as ``Decimal``);
+    ``LastEvaluatedKey`` stays in the wire format, to be passed back to
+    :meth:`scan` as ``ExclusiveStartKey``.
+    """
+
+    def __init__(self, name: str, client):
+        from boto3.dynamodb.types import TypeDeserializer
+
+        self.name = name
+        self._client = client
+        self._deserializer = TypeDeserializer()
+
+    def scan(self, **kwargs: Any) -> dict:
+        response = self._client.scan(TableName=self.name, **kwargs)
+        deserialize = self._deserializer.deserialize
+        items = [{name: deserialize(value) for name, value in item.items()} for item in response.get("Items", [])]
+        return {**response, "Items": items}
+
+
+def get_table(name: str) -> LazyTable:
+    return LazyTable(name)
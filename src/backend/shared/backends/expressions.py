@@ -0,0 +1,117 @@
+"""Evaluate boto3 condition objects and projections against plain dicts.
+
+Lets non-DynamoDB backends answer the same ``FilterExpression``,
+``KeyConditionExpression`` and ``ProjectionExpression`` arguments the
+repositories already pass to DynamoDB.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from boto3.dynamodb.conditions import AttributeBase, ConditionBase
+
+_MISSING = object()
+
+
+def _operand(value: Any, item: Dict[str, Any]) -> Any:
+    if isinstance(value, AttributeBase):
+        return item.get(value.name, _MISSING)
+    return value
+
+
+def _compare(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    def evaluate(left: Any, right: Any) -> bool:
+        if left is _MISSING:
+            return False
+        try:
+            return compare(left, right)
+        except TypeError:
+            return False
+
+    return evaluate
+
+
+def _contains(container: Any, value: Any) -> bool:
+    if container is _MISSING or container is None:
+        return False
+    if isinstance(container, str):
+        return isinstance(value, str) and value in container
+    return value in container
+
+
+_COMPARISONS: Dict[str, Callable[..., bool]] = {
+    "=": lambda left, right: left is not _MISSING and left == right,
+    "<>": lambda left, right: left is _MISSING or left != right,
+    "<": _compare(lambda left, right: left < right),
+    "<=": _compare(lambda left, right: left <= right),
+    ">": _compare(lambda left, right: left > right),
+    ">=": _compare(lambda left, right: left >= right),
+    "begins_with": _compare(lambda left, right: left.startswith(right)),
+    "contains": _contains,
+}
+
+
+def matches(condition: Optional[ConditionBase], item: Dict[str, Any]) -> bool:
+    """Return True when ``item`` satisfies the boto3 ``condition`` (None matches everything)."""
+    if condition is None:
+        return True
+    expression = condition.get_expression()
+    operator = expression["operator"]
+    values = expression["values"]
+
+    if operator == "AND":
+        return matches(values[0], item) and matches(values[1], item)
+    if operator == "OR":
+        return matches(values[0], item) or matches(values[1], item)
+    if operator == "NOT":
+        return not matches(values[0], item)
+    if operator == "attribute_exists":
+        return values[0].name in item
+    if operator == "attribute_not_exists":
+        return values[0].name not in item
+
+    operands = [_operand(value, item) for value in values]
+    if operator == "IN":
+        return operands[0] is not _MISSING and operands[0] in operands[1]
+    if operator == "BETWEEN":
+        return _compare(lambda left, bounds: bounds[0] <= left <= bounds[1])(operands[0], operands[1:])
+    if operator in _COMPARISONS:
+        return _COMPARISONS[operator](operands[0], operands[1])
+    raise NotImplementedError(f"Unsupported condition operator: {operator}")
+
+
+def equality_values(condition: Optional[ConditionBase]) -> Dict[str, Any]:
+    """Collect ``attribute = value`` terms of a condition joined by AND.
+
+    Backends use them to pick a partition out of a key index before running
+    the full condition through :func:`matches`.
+    """
+    if condition is None:
+        return {}
+    expression = condition.get_expression()
+    operator = expression["operator"]
+    values = expression["values"]
+    if operator == "AND":
+        return {**equality_values(values[0]), **equality_values(values[1])}
+    if operator == "=" and isinstance(values[0], AttributeBase):
+        return {values[0].name: values[1]}
+    return {}
+
+
+def projected_names(
+    projection_expression: Optional[str],
+    attribute_names: Optional[Dict[str, str]] = None,
+) -> Optional[List[str]]:
+    """Resolve a top-level ``ProjectionExpression`` into attribute names."""
+    if not projection_expression:
+        return None
+    attribute_names = attribute_names or {}
+    names = (name.strip() for name in projection_expression.split(","))
+    return [attribute_names.get(name, name) for name in names if name]
+
+
+def project(item: Dict[str, Any], names: Optional[Iterable[str]]) -> Dict[str, Any]:
+    """Return a copy of ``item`` holding only ``names`` (every attribute when None)."""
+    if names is None:
+        return dict(item)
+    return {name: item[name] for name in names if name in item}
@@ -0,0 +1,191 @@
+"""In-process repository backend serving ``shared/sample_data.py`` or the JSONL exports.
+
+Tables answer the subset of the boto3 ``Table`` API the repositories use
+(``get_item``, ``scan``, ``query``, ``put_item``) and the backend answers
+``batch_get_item`` like the DynamoDB resource does, so repositories run
+unchanged on top of it. Every table keeps a hash index on its partition key and
+on each configured GSI, which makes key lookups and queries O(1) per partition.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..repositories.snapshot import DATASET_VERSIONS_TABLE
+from .expressions import equality_values, matches, project, projected_names
+from .schemas import (
+    DEFAULT_DATA_DIR,
+    TABLE_SCHEMAS,
+    TableSchema,
+    base_table_name,
+    dataset_version_items,
+    jsonl_version,
+    load_jsonl_data,
+    with_derived_tables,
+)
+
+
+def memory_source() -> str:
+    return os.environ.get("MEMORY_BACKEND_SOURCE", "sample").lower()
+
+
+def memory_data_dir() -> Path:
+    return Path(os.environ.get("MEMORY_BACKEND_DATA_DIR") or DEFAULT_DATA_DIR)
+
+
+def load_sample_data() -> Dict[str, List[Dict[str, Any]]]:
+    """Return the tables of ``shared/sample_data.py``."""
+    from .. import sample_data
+
+    # Sample doctors predate the especialidadId attribute the repositories filter on
+    doctors = [
+        {**doctor, "especialidadId": doctor.get("especialidadId", doctor.get("especialidadPrincipalId"))}
+        for doctor in sample_data.DOCTORS
+    ]
+    return {
+        "clinics": list(sample_data.CLINICS),
+        "doctors": doctors,
+        "especialidades": list(sample_data.SPECIALTIES),
+        "subespecialidades": list(sample_data.SUBSPECIALTIES),
+        "seguros": list(sample_data.INSURERS),
+        "ubigeo": list(sample_data.UBIGEOS),
+    }
+
+
+class MemoryTable:
+    """Read-mostly table held in a list, with hash indexes on its keys."""
+
+    def __init__(self, name: str, schema: TableSchema, items: Iterable[Dict[str, Any]] = ()):
+        self.name = name
+        self.schema = schema
+        self._items: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        self._partitions: Dict[Optional[str], Dict[Any, List[Dict[str, Any]]]] = {}
+        for item in items:
+            self._items[self._key(item)] = item
+        self._reindex()
+
+    def _key(self, item: Dict[str, Any]) -> Tuple[Any, Any]:
+        sort_key = self.schema.sort_key
+        return item[self.schema.partition_key], item.get(sort_key) if sort_key else None
+
+    def _reindex(self) -> None:
+        key_schemas = {None: (self.schema.partition_key, self.schema.sort_key), **self.schema.indexes}
+        partitions: Dict[Optional[str], Dict[Any, List[Dict[str, Any]]]] = {}
+        for index_name, (partition_key, sort_key) in key_schemas.items():
+            by_partition: Dict[Any, List[Dict[str, Any]]] = {}
+            for item in self._items.values():
+                if partition_key in item:
+                    by_partition.setdefault(item[partition_key], []).append(item)
+            if sort_key:
+                for members in by_partition.values():
+                    members.sort(key=lambda member: str(member.get(sort_key, "")))
+            partitions[index_name] = by_partition
+        self._partitions = partitions
+        self._ordinals = {key: ordinal for ordinal, key in enumerate(self._items)}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get_item(self, Key: Dict[str, Any], ProjectionExpression: str | None = None,
+                 ExpressionAttributeNames: Dict[str, str] | None = None, **_options: Any) -> Dict[str, Any]:
+        item = self._items.get(self._key(Key))
+        if item is None:
+            return {}
+        return {"Item": project(item, projected_names(ProjectionExpression, ExpressionAttributeNames))}
+
+    def put_item(self, Item: Dict[str, Any], **_options: Any) -> Dict[str, Any]:
+        self._items[self._key(Item)] = dict(Item)
+        self._reindex()
+        return {}
+
+    def scan(self, FilterExpression=None, ProjectionExpression: str | None = None,
+             ExpressionAttributeNames: Dict[str, str] | None = None, Segment: int = 0,
+             TotalSegments: int = 1, ExclusiveStartKey: Dict[str, Any] | None = None,
+             **_options: Any) -> Dict[str, Any]:
+        names = projected_names(ProjectionExpression, ExpressionAttributeNames)
+        # Resume after the start key; an unknown key restarts the scan
+        last = self._ordinals.get(self._key(ExclusiveStartKey), -1) if ExclusiveStartKey else -1
+        # Segments are contiguous slices, as in DynamoDB, so they list items in the sequential order
+        size = len(self._items)
+        items = [
+            item
+            for ordinal, item in enumerate(self._items.values())
+            if ordinal > last and ordinal * TotalSegments // size == Segment
+        ]
+        selected = [project(item, names) for item in items if matches(FilterExpression, item)]
+        return {"Items": selected, "Count": len(selected), "ScannedCount": len(items)}
+
+    def query(self, KeyConditionExpression, IndexName: str | None = None, FilterExpression=None,
+              ProjectionExpression: str | None = None, ExpressionAttributeNames: Dict[str, str] | None = None,
+              ScanIndexForward: bool = True, ExclusiveStartKey: Dict[str, Any] | None = None,
+              **_options: Any) -> Dict[str, Any]:
+        if IndexName is not None and IndexName not in self.schema.indexes:
+            raise ValueError(f"Table {self.name} has no index {IndexName}")
+        partition_key, sort_key = self.schema.indexes[IndexName] if IndexName else (self.schema.partition_key, self.schema.sort_key)
+        equalities = equality_values(KeyConditionExpression)
+        if partition_key not in equalities:
+            raise ValueError(f"Query on {self.name} needs an equality condition on {partition_key}")
+        candidates = self._partitions[IndexName].get(equalities[partition_key], [])
+        if not ScanIndexForward:
+            candidates = list(reversed(candidates))
+        if ExclusiveStartKey:
+            if sort_key is None:
+                candidates = []
+            else:
+                start = str(ExclusiveStartKey.get(sort_key, ""))
+                candidates = [
+                    item for item in candidates
+                    if (str(item.get(sort_key, "")) > start) == ScanIndexForward and str(item.get(sort_key, "")) != start
+                ]
+        names = projected_names(ProjectionExpression, ExpressionAttributeNames)
+        keyed = [item for item in candidates if matches(KeyConditionExpression, item)]
+        selected = [project(item, names) for item in keyed if matches(FilterExpression, item)]
+        return {"Items": selected, "Count": len(selected), "ScannedCount": len(keyed)}
+
+
+class MemoryBackend:
+    """Stand-in for the DynamoDB resource: hands out tables and answers BatchGetItem."""
+
+    def __init__(self, tables: Dict[str, List[Dict[str, Any]]], version: str):
+        self.version = version
+        self._rows = with_derived_tables(tables)
+        self._tables: Dict[str, MemoryTable] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls) -> "MemoryBackend":
+        if memory_source() == "jsonl":
+            data_dir = memory_data_dir()
+            return cls(load_jsonl_data(data_dir), version=jsonl_version(data_dir))
+        return cls(load_sample_data(), version="sample")
+
+    def Table(self, name: str) -> MemoryTable:
+        with self._lock:
+            table = self._tables.get(name)
+            if table is None:
+                base = base_table_name(name)
+                schema = TABLE_SCHEMAS.get(base)
+                if schema is None:
+                    raise ValueError(f"Unknown table: {name}")
+                if base == DATASET_VERSIONS_TABLE:
+                    # Every table of the loaded dataset is at its version
+                    items = dataset_version_items(self.version, (t for t in TABLE_SCHEMAS if t != base))
+                else:
+                    items = list(self._rows.get(base, []))
+                table = MemoryTable(name, schema, items)
+                self._tables[name] = table
+            return table
+
+    def batch_get_item(self, RequestItems: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        responses = {}
+        for table_name, request in RequestItems.items():
+            table = self.Table(table_name)
+            options = {
+                "ProjectionExpression": request.get("ProjectionExpression"),
+                "ExpressionAttributeNames": request.get("ExpressionAttributeNames"),
+            }
+            found = (table.get_item(Key=key, **options).get("Item") for key in request["Keys"])
+            responses[table_name] = [item for item in found if item is not None]
+        return {"Responses": responses, "UnprocessedKeys": {}}
@@ -0,0 +1,98 @@
+"""Key schemas and JSONL sources of the tables, shared by the local backends."""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from ..repositories.doctor_cards import CARD_KEY, doctor_card_items
+from ..repositories.doctors_repo import ESPECIALIDAD_INDEX, clinic_doctor_items
+from ..repositories.snapshot import DATASET_VERSIONS_TABLE, VERSIONS_KEY
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parents[3] / "data" / "final_tables" / "transformed"
+
+
+class TableSchema(NamedTuple):
+    partition_key: str
+    sort_key: Optional[str] = None
+    indexes: Dict[str, Tuple[str, Optional[str]]] = {}
+    # Scalar attributes worth an index of their own in the SQLite catalog
+    columns: Tuple[str, ...] = ()
+
+
+# Key schemas of the tables defined in aws/backend.yml, by name without the -{env} suffix
+TABLE_SCHEMAS: Dict[str, TableSchema] = {
+    "clinics": TableSchema("clinicaId", columns=("ubigeoId",)),
+    "doctors": TableSchema(
+        "doctorId",
+        indexes={ESPECIALIDAD_INDEX: ("especialidadId", "doctorId")},
+        columns=("rimacEnsured",),
+    ),
+    "clinic-doctors": TableSchema("pk", "sk"),
+    "doctor-cards": TableSchema(CARD_KEY),
+    "especialidades": TableSchema("especialidadId"),
+    "subespecialidades": TableSchema("subEspecialidadId"),
+    "seguros": TableSchema("seguroId"),
+    "ubigeo": TableSchema("ubigeoId"),
+    DATASET_VERSIONS_TABLE: TableSchema(VERSIONS_KEY),
+}
+
+# JSONL export backing each table; tables without one start empty, as in production
+JSONL_FILES = {
+    "clinics": "clinicas.jsonl",
+    "doctors": "doctores.jsonl",
+    "especialidades": "especialidades.jsonl",
+    "ubigeo": "ubigeo.jsonl",
+}
+
+
+def base_table_name(table_name: str) -> str:
+    """Strip the ``-{env}`` suffix the repositories append to table names."""
+    env = os.environ.get("ENVIRONMENT", "dev")
+    suffix = f"-{env}"
+    return table_name[: -len(suffix)] if table_name.endswith(suffix) else table_name
+
+
+def dataset_version_items(version: str, tables: Iterable[str]) -> List[Dict[str, Any]]:
+    """Items of the dataset-versions table recording ``version`` for each of ``tables`` (base names)."""
+    env = os.environ.get("ENVIRONMENT", "dev")
+    return [{VERSIONS_KEY: f"{table}-{env}", "version": version} for table in tables]
+
+
+def with_derived_tables(tables: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Add the clinic-doctors adjacency items and doctor cards the populate scripts derive from doctors.
+
+    Cards carry insurer names, so they are only rendered when seguros rows are
+    at hand (the JSONL exports have none). Without them the table is left out,
+    and searches render cards from the insurers table like any other miss.
+    """
+    tables = dict(tables)
+    if "doctors" in tables and "clinic-doctors" not in tables:
+        tables["clinic-doctors"] = [item for doctor in tables["doctors"] for item in clinic_doctor_items(doctor)]
+    if "doctors" in tables and tables.get("seguros") and "doctor-cards" not in tables:
+        tables["doctor-cards"] = doctor_card_items(
+            tables["doctors"],
+            tables.get("clinics", []),
+            tables.get("especialidades", []),
+            tables["seguros"],
+        )
+    return tables
+
+
+def load_jsonl_data(data_dir: Path) -> Dict[str, List[Dict[str, Any]]]:
+    """Return the tables stored as ``final_tables/transformed/*.jsonl``."""
+    tables: Dict[str, List[Dict[str, Any]]] = {}
+    for table, filename in JSONL_FILES.items():
+        path = data_dir / filename
+        if not path.exists():
+            continue
+        with open(path, "r", encoding="utf-8") as handle:
+            tables[table] = [json.loads(line) for line in handle if line.strip()]
+    return tables
+
+
+def jsonl_version(data_dir: Path) -> str:
+    """Version string of a JSONL export, from the newest file modification time."""
+    stamps = [int((data_dir / name).stat().st_mtime) for name in JSONL_FILES.values() if (data_dir / name).exists()]
+    return f"jsonl-{max(stamps, default=0)}"
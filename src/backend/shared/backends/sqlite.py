@@ -0,0 +1,266 @@
+"""Read-only SQLite catalog backend, bundled with the Lambda package.
+
+``scripts/build_catalog.py`` compiles the ``final_tables/transformed`` JSONL
+exports into one SQLite file. Each table stores the item as JSON next to
+indexed columns for its keys, GSI keys and the scalar attributes listed in
+``TableSchema.columns``. Readers open the file as an immutable, memory-mapped
+URI connection (one per thread), so serving a request costs no network I/O.
+
+Tables answer the same boto3 ``Table`` API subset as the memory backend.
+Equality terms on indexed columns are pushed down into SQL; the full boto3
+condition is then checked in process. Tables the catalog does not hold are
+served by the ``fallback`` backend (DynamoDB) when one is given.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..repositories.snapshot import DATASET_VERSIONS_TABLE, VERSIONS_KEY
+from .expressions import equality_values, matches, project, projected_names
+from .schemas import TABLE_SCHEMAS, TableSchema, base_table_name
+
+DEFAULT_CATALOG_PATH = Path(__file__).resolve().parents[2] / "catalog.sqlite"
+DEFAULT_MMAP_BYTES = 64 * 1024 * 1024
+
+# SQLite caps bound parameters per statement; stay well below the old 999 limit
+MAX_IN_PARAMS = 500
+
+
+def catalog_path() -> Path:
+    return Path(os.environ.get("SQLITE_CATALOG_PATH") or DEFAULT_CATALOG_PATH)
+
+
+def sqlite_fallback_enabled() -> bool:
+    return os.environ.get("SQLITE_FALLBACK_ENABLED", "true").lower() in ("true", "1", "yes")
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def indexed_columns(schema: TableSchema) -> List[str]:
+    """Attributes stored as SQL columns: keys, GSI keys, then ``schema.columns``."""
+    names = [schema.partition_key, schema.sort_key]
+    for partition_key, sort_key in schema.indexes.values():
+        names += [partition_key, sort_key]
+    names += list(schema.columns)
+    return [name for name in dict.fromkeys(names) if name]
+
+
+def build_catalog(tables: Dict[str, List[Dict[str, Any]]], version: str, output: Path) -> Dict[str, int]:
+    """Write ``tables`` into a fresh SQLite catalog at ``output``; return row counts.
+
+    The file is built next to ``output`` and renamed into place, so readers
+    never observe a half-written catalog.
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    staging = output.with_suffix(output.suffix + ".tmp")
+    if staging.exists():
+        staging.unlink()
+
+    counts: Dict[str, int] = {}
+    connection = sqlite3.connect(staging)
+    try:
+        connection.execute("CREATE TABLE _catalog (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        for table, schema in TABLE_SCHEMAS.items():
+            if table == DATASET_VERSIONS_TABLE:
+                # Answered from the catalog version at runtime; see CatalogVersionsTable
+                continue
+            columns = indexed_columns(schema)
+            keys = [schema.partition_key] + ([schema.sort_key] if schema.sort_key else [])
+            column_sql = ", ".join(_quote(column) for column in columns)
+            key_sql = ", ".join(_quote(key) for key in keys)
+            connection.execute(f"CREATE TABLE {_quote(table)} ({column_sql}, item TEXT NOT NULL, PRIMARY KEY ({key_sql}))")
+            for index_name, (partition_key, sort_key) in schema.indexes.items():
+                index_columns = ", ".join(_quote(column) for column in (partition_key, sort_key) if column)
+                connection.execute(f"CREATE INDEX {_quote(f'{table}:{index_name}')} ON {_quote(table)} ({index_columns})")
+            for column in schema.columns:
+                connection.execute(f"CREATE INDEX {_quote(f'{table}:{column}')} ON {_quote(table)} ({_quote(column)})")
+
+            if table not in tables:
+                continue
+            rows = list(tables[table])
+            placeholders = ", ".join("?" for _ in range(len(columns) + 1))
+            connection.executemany(
+                f"INSERT OR REPLACE INTO {_quote(table)} VALUES ({placeholders})",
+                ([row.get(column) for column in columns] + [json.dumps(row, ensure_ascii=False)] for row in rows),
+            )
+            counts[table] = len(rows)
+
+        connection.executemany(
+            "INSERT INTO _catalog VALUES (?, ?)",
+            [("version", version), ("tables", json.dumps(sorted(counts)))],
+        )
+        connection.commit()
+        connection.execute("ANALYZE")
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+    os.replace(staging, output)
+    return counts
+
+
+class SqliteTable:
+    """One catalog table behind the boto3 ``Table`` read API."""
+
+    def __init__(self, backend: "SqliteBackend", name: str, schema: TableSchema):
+        self.name = name
+        self.schema = schema
+        self._backend = backend
+        self._sql_table = _quote(base_table_name(name))
+        self._columns = set(indexed_columns(schema))
+
+    def _select(self, where: Sequence[str], params: Sequence[Any], order_by: str = "rowid") -> Iterable[Dict[str, Any]]:
+        sql = f"SELECT item FROM {self._sql_table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        rows = self._backend.connection().execute(f"{sql} ORDER BY {order_by}", params)
+        return (json.loads(item) for (item,) in rows)
+
+    def _pushdown(self, condition) -> Tuple[List[str], List[Any]]:
+        where, params = [], []
+        for attribute, value in equality_values(condition).items():
+            if attribute in self._columns and isinstance(value, (str, int, float, bool)):
+                where.append(f"{_quote(attribute)} = ?")
+                params.append(value)
+        return where, params
+
+    def get_item(self, Key: Dict[str, Any], ProjectionExpression: str | None = None,
+                 ExpressionAttributeNames: Dict[str, str] | None = None, **_options: Any) -> Dict[str, Any]:
+        where = [f"{_quote(name)} = ?" for name in Key]
+        for item in self._select(where, list(Key.values())):
+            return {"Item": project(item, projected_names(ProjectionExpression, ExpressionAttributeNames))}
+        return {}
+
+    def get_items(self, keys: List[Any], names: Optional[List[str]]) -> List[Dict[str, Any]]:
+        """Fetch items by partition key with ``IN`` lookups (used for BatchGetItem)."""
+        found = []
+        for start in range(0, len(keys), MAX_IN_PARAMS):
+            chunk = keys[start:start + MAX_IN_PARAMS]
+            where = [f"{_quote(self.schema.partition_key)} IN ({', '.join('?' for _ in chunk)})"]
+            found.extend(project(item, names) for item in self._select(where, chunk))
+        return found
+
+    def scan(self, FilterExpression=None, ProjectionExpression: str | None = None,
+             ExpressionAttributeNames: Dict[str, str] | None = None, Segment: int = 0,
+             TotalSegments: int = 1, ExclusiveStartKey: Dict[str, Any] | None = None,
+             **_options: Any) -> Dict[str, Any]:
+        where, params = self._pushdown(FilterExpression)
+        if TotalSegments > 1:
+            # Contiguous rowid ranges, as in DynamoDB, so segments list rows in the sequential order
+            where.append(f"(rowid - 1) * ? / (SELECT MAX(rowid) FROM {self._sql_table}) = ?")
+            params += [TotalSegments, Segment]
+        if ExclusiveStartKey:
+            # Resume after the start key; an unknown key restarts the scan
+            key_sql = " AND ".join(f"{_quote(name)} = ?" for name in ExclusiveStartKey)
+            where.append(f"rowid > COALESCE((SELECT rowid FROM {self._sql_table} WHERE {key_sql}), 0)")
+            params += list(ExclusiveStartKey.values())
+        names = projected_names(ProjectionExpression, ExpressionAttributeNames)
+        selected = [project(item, names) for item in self._select(where, params) if matches(FilterExpression, item)]
+        return {"Items": selected, "Count": len(selected)}
+
+    def query(self, KeyConditionExpression, IndexName: str | None = None, FilterExpression=None,
+              ProjectionExpression: str | None = None, ExpressionAttributeNames: Dict[str, str] | None = None,
+              ScanIndexForward: bool = True, ExclusiveStartKey: Dict[str, Any] | None = None,
+              **_options: Any) -> Dict[str, Any]:
+        if IndexName is not None and IndexName not in self.schema.indexes:
+            raise ValueError(f"Table {self.name} has no index {IndexName}")
+        partition_key, sort_key = self.schema.indexes[IndexName] if IndexName else (self.schema.partition_key, self.schema.sort_key)
+        if partition_key not in equality_values(KeyConditionExpression):
+            raise ValueError(f"Query on {self.name} needs an equality condition on {partition_key}")
+        where, params = self._pushdown(KeyConditionExpression)
+        if ExclusiveStartKey:
+            if sort_key is None:
+                return {"Items": [], "Count": 0}
+            where.append(f"{_quote(sort_key)} {'>' if ScanIndexForward else '<'} ?")
+            params.append(ExclusiveStartKey.get(sort_key))
+        order_by = f"{_quote(sort_key)} {'ASC' if ScanIndexForward else 'DESC'}" if sort_key else "rowid"
+        names = projected_names(ProjectionExpression, ExpressionAttributeNames)
+        selected = [
+            project(item, names)
+            for item in self._select(where, params, order_by)
+            if matches(KeyConditionExpression, item) and matches(FilterExpression, item)
+        ]
+        return {"Items": selected, "Count": len(selected)}
+
+
+class CatalogVersionsTable:
+    """The dataset-versions table as seen through the catalog.
+
+    Tables the catalog holds are all at the catalog version; the versions of
+    tables left to DynamoDB come from its own dataset-versions table.
+    """
+
+    def __init__(self, backend: "SqliteBackend", name: str):
+        self.name = name
+        self._backend = backend
+
+    def get_item(self, Key: Dict[str, Any], **options: Any) -> Dict[str, Any]:
+        table_name = Key[VERSIONS_KEY]
+        if self._backend.holds(table_name):
+            return {"Item": {VERSIONS_KEY: table_name, "version": self._backend.version}}
+        if self._backend.fallback is not None:
+            return self._backend.fallback.get_table(self.name).get_item(Key=Key, **options)
+        return {}
+
+
+class SqliteBackend:
+    """Stand-in for the DynamoDB resource backed by a catalog file."""
+
+    def __init__(self, path: Path, fallback=None, mmap_bytes: int = DEFAULT_MMAP_BYTES):
+        self.path = Path(path)
+        self.fallback = fallback
+        self.mmap_bytes = mmap_bytes
+        self._local = threading.local()
+        metadata = dict(self.connection().execute("SELECT name, value FROM _catalog"))
+        self.version = metadata.get("version")
+        self.tables = set(json.loads(metadata.get("tables", "[]")))
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's read-only, memory-mapped connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro&immutable=1", uri=True)
+            connection.execute(f"PRAGMA mmap_size = {int(self.mmap_bytes)}")
+            connection.execute("PRAGMA query_only = 1")
+            self._local.connection = connection
+        return connection
+
+    def holds(self, table_name: str) -> bool:
+        return base_table_name(table_name) in self.tables
+
+    def Table(self, name: str):
+        base = base_table_name(name)
+        schema = TABLE_SCHEMAS.get(base)
+        if schema is None:
+            raise ValueError(f"Unknown table: {name}")
+        if base == DATASET_VERSIONS_TABLE:
+            return CatalogVersionsTable(self, name)
+        if base not in self.tables and self.fallback is not None:
+            return self.fallback.get_table(name)
+        return SqliteTable(self, name, schema)
+
+    def batch_get_item(self, RequestItems: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        responses: Dict[str, List[Dict[str, Any]]] = {}
+        remote = {}
+        for table_name, request in RequestItems.items():
+            if not self.holds(table_name) and self.fallback is not None:
+                remote[table_name] = request
+                continue
+            table = self.Table(table_name)
+            names = projected_names(request.get("ProjectionExpression"), request.get("ExpressionAttributeNames"))
+            keys = [key[table.schema.partition_key] for key in request["Keys"]]
+            responses[table_name] = table.get_items(keys, names)
+
+        unprocessed = {}
+        if remote:
+            response = self.fallback.get_resource().batch_get_item(RequestItems=remote)
+            responses.update(response.get("Responses", {}))
+            unprocessed = response.get("UnprocessedKeys") or {}
+        return {"Responses": responses, "UnprocessedKeys": unprocessed}
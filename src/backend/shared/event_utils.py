@@ -1,7 +1,9 @@
 """Helpers to work with API Gateway proxy events."""
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import base64
+import json
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from .exceptions import ValidationError
 
@@ -12,6 +14,19 @@ def get_query_params(event: Dict[str, Any]) -> Dict[str, str]:
     return {k: v for k, v in params.items() if v is not None}
 
 
+def get_json_body(event: Dict[str, Any]) -> Any:
+    """Decode the JSON request body, base64-encoded or not; raise ValidationError if missing or malformed."""
+    raw = event.get("body")
+    if not raw:
+        raise ValidationError("Request body is required")
+    try:
+        if event.get("isBase64Encoded"):
+            raw = base64.b64decode(raw).decode("utf-8")
+        return json.loads(raw)
+    except ValueError as exc:
+        raise ValidationError("Request body must be valid JSON") from exc
+
+
 def require_param(params: Dict[str, str], name: str) -> str:
     value = params.get(name)
     if not value:
@@ -35,3 +50,24 @@ def get_int_param(params: Dict[str, str], name: str, default: int, minimum: int)
 def optional_param(params: Dict[str, str], name: str) -> Optional[str]:
     value = params.get(name)
     return value if value else None
+
+
+def get_list_param(
+    params: Dict[str, str],
+    name: str,
+    allowed: Iterable[str] | None = None,
+) -> Optional[Tuple[str, ...]]:
+    """Split a comma-separated parameter into unique values, in order.
+
+    Returns None when the parameter is absent or empty. ``allowed`` rejects
+    values outside it with a ValidationError.
+    """
+    raw = params.get(name)
+    if not raw:
+        return None
+    values = tuple(dict.fromkeys(value.strip() for value in raw.split(",") if value.strip()))
+    if allowed is not None:
+        unknown = [value for value in values if value not in allowed]
+        if unknown:
+            raise ValidationError(f"Parameter {name} has unknown values: {', '.join(unknown)}")
+    return values or None
@@ -1,16 +1,84 @@
 """Utilities for building Lambda proxy integration responses."""
 from __future__ import annotations
 
+import base64
 import json
-from typing import Any, Dict
+import os
+from decimal import Decimal
+from typing import Any, Callable, Dict
 
 _DEFAULT_HEADERS = {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"}
 
+# Serializes a response body to JSON text
+JsonEncoder = Callable[[Any], str]
+
+_encoder: JsonEncoder | None = None
+
+
+def encode_default(value: Any) -> Any:
+    """Convert the values DynamoDB items carry that JSON has no type for.
+
+    boto3 returns every number as ``Decimal`` (integral ones become ints), string
+    and number sets as ``set``, and binary attributes as ``bytes`` (base64 text).
+    """
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        try:
+            return sorted(value)
+        except TypeError:
+            return list(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_stdlib(body: Any) -> str:
+    return json.dumps(body, ensure_ascii=False, separators=(",", ":"), default=encode_default)
+
+
+def _orjson_encoder() -> JsonEncoder | None:
+    try:
+        import orjson
+    except ImportError:
+        return None
+
+    def dumps_orjson(body: Any) -> str:
+        try:
+            return orjson.dumps(body, default=encode_default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # Integers beyond 64 bits and other values orjson rejects
+            return dumps_stdlib(body)
+
+    return dumps_orjson
+
+
+def json_encoder() -> JsonEncoder:
+    """Return the body serializer, picked once per container.
+
+    ``JSON_ENCODER=auto`` (default) uses orjson when it is installed and the
+    standard library otherwise; ``orjson`` and ``stdlib`` force one of them.
+    """
+    global _encoder
+    if _encoder is None:
+        choice = os.environ.get("JSON_ENCODER", "auto").lower()
+        fast = _orjson_encoder() if choice in ("auto", "orjson") else None
+        if choice == "orjson" and fast is None:
+            raise RuntimeError("JSON_ENCODER=orjson but orjson is not installed")
+        _encoder = fast or dumps_stdlib
+    return _encoder
+
+
+def set_json_encoder(encoder: JsonEncoder | None) -> None:
+    """Plug in another body serializer; None goes back to :func:`json_encoder`'s choice."""
+    global _encoder
+    _encoder = encoder
+
 
 def json_response(status_code: int, body: Any, headers: Dict[str, str] | None = None) -> Dict[str, Any]:
     """Return an API Gateway compatible JSON response."""
     final_headers = {**_DEFAULT_HEADERS, **(headers or {})}
-    serialised = body if isinstance(body, str) else json.dumps(body, ensure_ascii=False)
+    serialised = body if isinstance(body, str) else json_encoder()(body)
     return {
         "statusCode": status_code,
         "headers": final_headers,
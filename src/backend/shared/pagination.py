@@ -0,0 +1,140 @@
+"""Opaque, signed ``nextCursor`` tokens for the list endpoints.
+
+A cursor carries the resume point a repository handed out for the last item of
+a page (its key, plus its index position on in-memory paths) and a digest of
+the query filters. Tokens are HMAC-signed with ``CURSOR_SECRET`` so clients
+cannot forge resume points, and a cursor is rejected when replayed against a
+different query.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .exceptions import ValidationError
+
+CURSOR_VERSION = 1
+# Only used outside Lambda (local runs and tests); deployed functions must set CURSOR_SECRET
+DEFAULT_CURSOR_SECRET = "local-cursor-secret"
+SIGNATURE_BYTES = 16
+
+
+def cursor_secret() -> bytes:
+    secret = os.environ.get("CURSOR_SECRET")
+    if not secret:
+        if os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+            raise RuntimeError("CURSOR_SECRET must be set to sign pagination cursors")
+        secret = DEFAULT_CURSOR_SECRET
+    return secret.encode("utf-8")
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(cursor_secret(), payload, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+
+
+def query_scope(filters: Dict[str, Any]) -> str:
+    """Digest of the filters a cursor belongs to; None values are ignored."""
+    relevant = {key: value for key, value in filters.items() if value is not None}
+    encoded = json.dumps(relevant, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def encode_cursor(resume: Dict[str, Any], filters: Dict[str, Any]) -> str:
+    """Sign ``resume`` for the query described by ``filters``."""
+    payload = json.dumps(
+        {"v": CURSOR_VERSION, "s": query_scope(filters), "r": resume},
+        separators=(",", ":"),
+        default=str,
+    ).encode("utf-8")
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def decode_cursor(token: str, filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Verify ``token`` and return its resume point; raise ValidationError otherwise."""
+    try:
+        encoded_payload, encoded_signature = token.split(".", 1)
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except ValueError as exc:
+        raise ValidationError("Invalid cursor") from exc
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise ValidationError("Invalid cursor")
+
+    body = json.loads(payload)
+    if body.get("v") != CURSOR_VERSION or not isinstance(body.get("r"), dict):
+        raise ValidationError("Invalid cursor")
+    if body.get("s") != query_scope(filters):
+        raise ValidationError("Cursor does not belong to this query")
+    return body["r"]
+
+
+def resume_position(positions: Dict[str, int], resume: Dict[str, Any] | None) -> int | None:
+    """Return the index position a listing resumes after, or None to start at the top.
+
+    The key (``"k"``) survives index rebuilds, so its current position wins.
+    The position stored in the cursor (``"p"``) covers an item removed since:
+    the listing carries on with whatever now follows that position.
+    """
+    if resume is None:
+        return None
+    key = resume.get("k")
+    position = positions.get(key) if isinstance(key, str) else None
+    if position is not None:
+        return position
+    position = resume.get("p")
+    if position is None:
+        return None
+    if not isinstance(position, int) or isinstance(position, bool) or position < 0:
+        raise ValidationError("Invalid cursor")
+    return position
+
+
+def paginate(
+    fetch: Callable[[Optional[int], Optional[Dict[str, Any]]], List[Dict[str, Any]]],
+    resume_token: Callable[[Dict[str, Any]], Dict[str, Any]],
+    filters: Dict[str, Any],
+    page: int,
+    page_size: int,
+    cursor: str | None = None,
+    count: Callable[[], int] | None = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Return one page of items plus the pagination fields of the response.
+
+    ``fetch(limit, resume)`` reads matching items. With a ``cursor`` only
+    ``page_size + 1`` items after its resume point are read and ``total`` is
+    left out, so deep pages cost the same as the first one. Page-number
+    requests keep the ``page``/``total`` fields and read every match, unless
+    ``count()`` gives the total without reading them; then only the items up
+    to the end of the page are fetched. Both modes return ``nextCursor``, None
+    on the last page.
+    """
+    if cursor is not None:
+        fetched = fetch(page_size + 1, decode_cursor(cursor, filters))
+        items = fetched[:page_size]
+        has_more = len(fetched) > page_size
+        fields: Dict[str, Any] = {"pageSize": page_size}
+    else:
+        start = (page - 1) * page_size
+        if count is not None:
+            total = count()
+            items = fetch(start + page_size, None)[start:] if start < total else []
+        else:
+            matches = fetch(None, None)
+            total = len(matches)
+            items = matches[start:start + page_size]
+        has_more = start + page_size < total
+        fields = {"page": page, "pageSize": page_size, "total": total}
+    fields["nextCursor"] = encode_cursor(resume_token(items[-1]), filters) if has_more and items else None
+    return items, fields
@@ -0,0 +1,108 @@
+"""Prefix index behind type-ahead over specialties, clinics and surnames.
+
+Every suggestion is indexed under its normalized label and under each later
+word of it, so "fel" finds "Clínica San Felipe". The keys live in one sorted
+list; a prefix is a contiguous run of it located with two ``bisect`` calls,
+and the run is ranked by popularity (how many doctors the specialty, clinic
+or surname has) with ``heapq.nlargest``.
+"""
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+from ..text import normalize
+from .doctor_index import doctor_clinic_ids
+
+SUGGESTION_TYPES = ("specialty", "clinic", "surname")
+# Sorts after every character normalize() keeps, closing a prefix range
+_PREFIX_END = "\x7f"
+
+
+class Suggestion(NamedTuple):
+    type: str
+    id: str
+    label: str
+    popularity: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+
+class PrefixIndex:
+    """Sorted ``(key, suggestion position)`` arrays searched with bisect."""
+
+    def __init__(self, suggestions: Iterable[Suggestion]):
+        self.suggestions: List[Suggestion] = list(suggestions)
+        pairs: List[Tuple[str, int]] = []
+        for position, suggestion in enumerate(self.suggestions):
+            words = normalize(suggestion.label).split()
+            pairs.extend((" ".join(words[start:]), position) for start in range(len(words)))
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.positions = [position for _, position in pairs]
+
+    def __len__(self) -> int:
+        return len(self.suggestions)
+
+    def complete(self, prefix: str, limit: int, types: Iterable[str] | None = None) -> List[Suggestion]:
+        """Return at most ``limit`` suggestions starting with ``prefix``, most popular first."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        start = bisect_left(self.keys, prefix)
+        stop = bisect_left(self.keys, prefix + _PREFIX_END, start)
+        wanted = set(types) if types is not None else None
+        matches = {
+            position
+            for position in self.positions[start:stop]
+            if wanted is None or self.suggestions[position].type in wanted
+        }
+        ranked = heapq.nlargest(
+            limit,
+            matches,
+            key=lambda position: (self.suggestions[position].popularity, -position),
+        )
+        return [self.suggestions[position] for position in ranked]
+
+
+def build_suggestions(
+    doctors: Iterable[Dict[str, Any]],
+    clinics: Iterable[Dict[str, Any]],
+    specialties: Iterable[Dict[str, Any]],
+) -> List[Suggestion]:
+    """Turn the three tables into suggestions carrying their doctor counts."""
+    per_specialty: Counter = Counter()
+    per_clinic: Counter = Counter()
+    per_surname: Counter = Counter()
+    surname_labels: Dict[str, Counter] = {}
+    for doctor in doctors:
+        per_specialty[doctor.get("especialidadId")] += 1
+        per_clinic.update(set(doctor_clinic_ids(doctor)))
+        for field in ("apellidoPaterno", "apellidoMaterno"):
+            surname = doctor.get(field)
+            key = normalize(surname) if surname else ""
+            if key:
+                per_surname[key] += 1
+                surname_labels.setdefault(key, Counter())[surname.strip()] += 1
+
+    suggestions = [
+        Suggestion("specialty", specialty["especialidadId"], specialty["nombre"], per_specialty[specialty["especialidadId"]])
+        for specialty in specialties
+        if specialty.get("nombre")
+    ]
+    suggestions.extend(
+        Suggestion("clinic", clinic["clinicaId"], clinic["nombreClinica"], per_clinic[clinic["clinicaId"]])
+        for clinic in clinics
+        if clinic.get("nombreClinica")
+    )
+    # A surname is labelled with its most frequent spelling
+    suggestions.extend(
+        Suggestion("surname", key, surname_labels[key].most_common(1)[0][0], count)
+        for key, count in per_surname.items()
+    )
+    # Sorted by label so equally popular suggestions come out alphabetically
+    suggestions.sort(key=lambda suggestion: normalize(suggestion.label))
+    return suggestions
@@ -0,0 +1,57 @@
+"""Shared autocomplete repository."""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Iterable, List
+
+from ..backends import get_table
+from .autocomplete_index import PrefixIndex, Suggestion, build_suggestions
+from .projection import projection_kwargs
+from .scan import iter_scan
+from .snapshot import ScanCache, get_snapshot, snapshot_enabled
+
+# Attributes build_suggestions reads from each table
+DOCTOR_FIELDS = ("doctorId", "especialidadId", "clinicaId", "clinicaIds", "apellidoPaterno", "apellidoMaterno")
+CLINIC_FIELDS = ("clinicaId", "nombreClinica")
+SPECIALTY_FIELDS = ("especialidadId", "nombre")
+
+
+class AutocompleteRepository:
+    def __init__(self):
+        env = os.environ.get("ENVIRONMENT", "dev")
+        self.sources = (
+            (get_table(f"doctors-{env}"), "doctorId", DOCTOR_FIELDS),
+            (get_table(f"clinics-{env}"), "clinicaId", CLINIC_FIELDS),
+            (get_table(f"especialidades-{env}"), "especialidadId", SPECIALTY_FIELDS),
+        )
+        self._snapshots = (
+            [get_snapshot(table, key_name) for table, key_name, _ in self.sources] if snapshot_enabled() else None
+        )
+        # Without snapshots the index is still kept per container, not rebuilt from three scans per keystroke
+        self._scanned = (
+            ScanCache([table for table, _, _ in self.sources], self._build_from_scans) if self._snapshots is None else None
+        )
+        self._lock = threading.Lock()
+        self._index: tuple[tuple[int, ...], PrefixIndex] | None = None
+
+    def index(self) -> PrefixIndex:
+        """Return the prefix index, built once per container and rebuilt when the data changes."""
+        if self._scanned is not None:
+            return self._scanned.get()
+        generations = tuple(snapshot.generation for snapshot in self._snapshots)
+        with self._lock:
+            if self._index is None or self._index[0] != generations:
+                suggestions = build_suggestions(*(snapshot.items() for snapshot in self._snapshots))
+                self._index = (generations, PrefixIndex(suggestions))
+            return self._index[1]
+
+    def complete(self, prefix: str, limit: int, types: Iterable[str] | None = None) -> List[Suggestion]:
+        return self.index().complete(prefix, limit, types)
+
+    def _build_from_scans(self) -> PrefixIndex:
+        return PrefixIndex(build_suggestions(*(self._scan(table, fields) for table, _, fields in self.sources)))
+
+    @staticmethod
+    def _scan(table, fields: Iterable[str]):
+        return list(iter_scan(table, **projection_kwargs(fields)))
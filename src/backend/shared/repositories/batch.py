@@ -0,0 +1,44 @@
+"""BatchGetItem helper shared by the repositories."""
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, Iterable
+
+# DynamoDB accepts at most 100 keys per BatchGetItem request
+MAX_BATCH_KEYS = 100
+MAX_RETRIES = 5
+
+
+def batch_get_items(
+    dynamodb,
+    table_name: str,
+    key_name: str,
+    keys: Iterable[str],
+    sleep: Callable[[float], None] = time.sleep,
+    **request_options: Any,
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch many items of one table by partition key.
+
+    Keys are de-duplicated and sent in chunks of 100; ``UnprocessedKeys`` are
+    retried with exponential backoff. Returns the found items keyed by their
+    partition key; missing keys are simply absent.
+    """
+    unique_keys = list(dict.fromkeys(key for key in keys if key))
+    found: Dict[str, Dict[str, Any]] = {}
+
+    for start in range(0, len(unique_keys), MAX_BATCH_KEYS):
+        chunk = unique_keys[start:start + MAX_BATCH_KEYS]
+        request = {table_name: {"Keys": [{key_name: key} for key in chunk], **request_options}}
+        attempt = 0
+        while request:
+            response = dynamodb.batch_get_item(RequestItems=request)
+            for item in response.get("Responses", {}).get(table_name, []):
+                found[item[key_name]] = item
+            request = response.get("UnprocessedKeys") or {}
+            if request:
+                if attempt >= MAX_RETRIES:
+                    raise RuntimeError(f"BatchGetItem on {table_name} left keys unprocessed after {MAX_RETRIES} retries")
+                sleep(min(0.05 * (2 ** attempt), 1.0))
+                attempt += 1
+
+    return found
@@ -0,0 +1,68 @@
+"""Inverted index over the clinics table.
+
+Clinics carry the ``especialidadIds`` of their doctors (derived by the
+transform from ``doctores.jsonl``), so the clinic x specialty relation is a
+posting list per specialty. Ubigeo and insurer filters get posting lists too,
+and a filtered listing intersects them instead of testing every clinic.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Sequence
+
+from .doctor_index import intersect_postings, union_postings
+from .filters import filter_values
+
+
+class ClinicIndex:
+    """Posting lists keyed by ``especialidadId``, ``ubigeoId`` and ``seguroId``."""
+
+    def __init__(self, clinics: Iterable[Dict[str, Any]]):
+        self.clinics: List[Dict[str, Any]] = []
+        self.positions: Dict[str, int] = {}
+        self.by_especialidad: Dict[str, List[int]] = {}
+        self.by_ubigeo: Dict[str, List[int]] = {}
+        self.by_seguro: Dict[str, List[int]] = {}
+
+        for clinic in clinics:
+            position = len(self.clinics)
+            self.clinics.append(clinic)
+            self.positions[clinic["clinicaId"]] = position
+            for especialidad_id in dict.fromkeys(clinic.get("especialidadIds") or []):
+                self.by_especialidad.setdefault(especialidad_id, []).append(position)
+            if clinic.get("ubigeoId"):
+                self.by_ubigeo.setdefault(clinic["ubigeoId"], []).append(position)
+            for seguro_id in dict.fromkeys(clinic.get("seguroIds") or []):
+                self.by_seguro.setdefault(seguro_id, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.clinics)
+
+    def matching_positions(self, filters: Dict[str, Any]) -> Sequence[int]:
+        """Return the sorted positions of the clinics matching ``filters`` (IN-lists allowed)."""
+        postings = []
+        for name, by_value in (
+            ("especialidadId", self.by_especialidad),
+            ("ubigeoId", self.by_ubigeo),
+            ("seguroId", self.by_seguro),
+        ):
+            values = filter_values(filters.get(name))
+            if len(values) == 1:
+                postings.append(by_value.get(values[0], []))
+            elif values:
+                postings.append(union_postings(by_value.get(value, []) for value in values))
+        if not postings:
+            return range(len(self.clinics))
+        return intersect_postings(postings)
+
+    def search(
+        self,
+        filters: Dict[str, Any],
+        limit: int | None = None,
+        after: int | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Return the clinics matching ``filters`` in table order, only those stored after the position ``after``."""
+        positions = self.matching_positions(filters)
+        start = bisect_right(positions, after) if after is not None else 0
+        stop = None if limit is None else start + limit
+        return [self.clinics[position] for position in positions[start:stop]]
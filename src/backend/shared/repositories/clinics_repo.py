@@ -2,49 +2,111 @@
 from __future__ import annotations
 
 import os
-from typing import Dict, List
+from itertools import islice
+from typing import Any, Dict, Iterable, List
 
-import boto3
+from ..backends import get_resource, get_table
+from ..pagination import resume_position
+from .batch import batch_get_items
+from .clinic_index import ClinicIndex
+from .filters import filter_values
+from .projection import projection_kwargs
+from .scan import scan_matching, scan_segments
+from .snapshot import get_snapshot, snapshot_enabled
+
+# Attributes _matches_filters reads, always added to a projection
+FILTER_FIELDS = ("clinicaId", "ubigeoId", "especialidadIds", "seguroIds")
 
 
 class ClinicsRepository:
     def __init__(self):
         env = os.environ.get("ENVIRONMENT", "dev")
         self.table_name = f"clinics-{env}"
-        dynamodb = boto3.resource("dynamodb")
-        self.table = dynamodb.Table(self.table_name)
+        self.table = get_table(self.table_name)
+        self.scan_segments = scan_segments("clinics")
+        self._snapshot = get_snapshot(self.table, "clinicaId") if snapshot_enabled() else None
     
-    def list_clinics(self, filters: Dict[str, str]) -> List[Dict[str, str]]:
-        # If specific clinicaId requested, get item directly
+    def list_clinics(
+        self,
+        filters: Dict[str, str],
+        limit: int | None = None,
+        fields: Iterable[str] | None = None,
+        resume: Dict[str, Any] | None = None,
+    ) -> List[Dict[str, str]]:
+        """Return clinics matching ``filters``, restarting after ``resume`` (see :meth:`resume_token`)."""
+        after = resume.get("k") if resume else None
+        # Warm containers answer from the in-memory snapshot and its clinic x specialty index
+        if self._snapshot is not None:
+            if filters.get("clinicaId"):
+                candidates = [] if after else [self._snapshot.get(clinica_id) for clinica_id in filter_values(filters["clinicaId"])]
+                matches = (clinic for clinic in candidates if clinic and self._matches_filters(clinic, filters))
+                return list(islice(matches, limit))
+            index = self.index()
+            return index.search(filters, limit, after=resume_position(index.positions, resume))
+
+        projection = projection_kwargs(fields, FILTER_FIELDS)
+
+        # If specific clinicaIds are requested, get the items directly
         if filters.get("clinicaId"):
-            response = self.table.get_item(Key={"clinicaId": filters["clinicaId"]})
-            item = response.get("Item")
-            if item and self._matches_filters(item, filters):
-                return [item]
-            return []
-        
-        # Otherwise scan the table
-        response = self.table.scan()
-        items = response.get("Items", [])
+            if after:
+                return []
+            clinica_ids = filter_values(filters["clinicaId"])
+            found = batch_get_items(get_resource(), self.table_name, "clinicaId", clinica_ids, **projection)
+            items = (found.get(clinica_id) for clinica_id in clinica_ids)
+            return [item for item in items if item and self._matches_filters(item, filters)][:limit]
         
-        # Apply filters
-        results = []
-        for clinic in items:
-            if self._matches_filters(clinic, filters):
-                results.append(clinic)
-        
-        return results
+        # Otherwise scan every page of the table, filtering as pages arrive
+        return scan_matching(
+            self.table,
+            lambda clinic: self._matches_filters(clinic, filters),
+            limit,
+            segments=self.scan_segments,
+            after={"clinicaId": after} if after else None,
+            **projection,
+        )
+
+    def index(self) -> ClinicIndex | None:
+        """Return the container-wide clinic index, rebuilt when the snapshot reloads."""
+        if self._snapshot is None:
+            return None
+        return self._snapshot.derived("clinic_index", ClinicIndex)
+
+    def resume_token(self, clinic: Dict[str, Any]) -> Dict[str, Any]:
+        """Return where a page ending with ``clinic`` resumes: its id, plus its index position."""
+        token: Dict[str, Any] = {"k": clinic["clinicaId"]}
+        index = self.index()
+        position = index.positions.get(clinic["clinicaId"]) if index is not None else None
+        if position is not None:
+            token["p"] = position
+        return token
 
     def get_clinic(self, clinica_id: str) -> Dict[str, str] | None:
+        if self._snapshot is not None:
+            return self._snapshot.get(clinica_id)
         response = self.table.get_item(Key={"clinicaId": clinica_id})
         return response.get("Item")
     
-    def _matches_filters(self, clinic: Dict[str, str], filters: Dict[str, str]) -> bool:
-        """Check if clinic matches all provided filters."""
-        if filters.get("ubigeoId") and clinic.get("ubigeoId") != filters["ubigeoId"]:
+    def get_clinics_many(
+        self,
+        clinica_ids: Iterable[str],
+        fields: Iterable[str] | None = None,
+    ) -> Dict[str, Dict[str, str]]:
+        """Return the clinics with the given ids keyed by clinicaId, in one round trip."""
+        if self._snapshot is not None:
+            clinics = {clinica_id: self._snapshot.get(clinica_id) for clinica_id in clinica_ids if clinica_id}
+            return {clinica_id: clinic for clinica_id, clinic in clinics.items() if clinic}
+        projection = projection_kwargs(fields, ("clinicaId",))
+        return batch_get_items(get_resource(), self.table_name, "clinicaId", clinica_ids, **projection)
+    
+    def _matches_filters(self, clinic: Dict[str, str], filters: Dict[str, Any]) -> bool:
+        """Check if clinic matches all provided filters; IN-lists match any of their values."""
+        ubigeo_ids = filter_values(filters.get("ubigeoId"))
+        if ubigeo_ids and clinic.get("ubigeoId") not in ubigeo_ids:
             return False
-        if filters.get("especialidadId") and filters["especialidadId"] not in clinic.get("especialidadIds", []):
+        especialidad_ids = filter_values(filters.get("especialidadId"))
+        if especialidad_ids and not any(value in especialidad_ids for value in clinic.get("especialidadIds", [])):
             return False
-        if filters.get("seguroId") and filters["seguroId"] not in clinic.get("seguroIds", []):
+        seguro_ids = filter_values(filters.get("seguroId"))
+        if seguro_ids and not any(value in seguro_ids for value in clinic.get("seguroIds", [])):
             return False
         return True
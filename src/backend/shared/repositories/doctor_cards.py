@@ -0,0 +1,100 @@
+"""Pre-rendered doctor cards, one per doctor and clinic.
+
+A card is what ``/search/doctors`` returns for a doctor shown at one of their
+clinics: the display name, photo, specialty name, clinic name and address and
+the names of the insurers the clinic accepts. The populate scripts render
+every doctor x clinic card into the doctor-cards table, so a search only looks
+cards up by ``cardId`` instead of joining doctors, clinics, specialties and
+insurers per request.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Mapping
+
+from .doctor_index import doctor_clinic_ids
+
+# Partition key of the doctor-cards table
+CARD_KEY = "cardId"
+
+
+def card_id(doctor_id: str, clinica_id: str | None) -> str:
+    """Key of the card of ``doctor_id`` shown at ``clinica_id`` (None for no clinic)."""
+    return f"{doctor_id}#{clinica_id or ''}"
+
+
+def pick_clinic_id(doctor: Dict[str, Any], clinic_lookup: Mapping[str, Any]) -> str | None:
+    """Choose the clinic a card shows: the first of the doctor's clinics in ``clinic_lookup``.
+
+    ``clinic_lookup`` holds the clinics that passed the search filters, so the
+    card shows a clinic the user asked for; otherwise the first clinic is used.
+    """
+    # Handle both clinicaId (old) and clinicaIds (new array format)
+    if "clinicaId" in doctor:
+        return doctor["clinicaId"]
+    clinic_ids = doctor_clinic_ids(doctor)
+    for clinica_id in clinic_ids:
+        if clinica_id in clinic_lookup:
+            return clinica_id
+    return clinic_ids[0] if clinic_ids else None
+
+
+def render_card(
+    doctor: Dict[str, Any],
+    clinic: Dict[str, Any] | None,
+    specialty_name: str | None,
+    insurer_names: Mapping[str, str],
+) -> Dict[str, Any]:
+    """Render the card of ``doctor`` at ``clinic``."""
+    # Build seguros list
+    seguros = []
+    if clinic:
+        for seguro_id in clinic.get("seguroIds", []):
+            seguros.append({
+                "seguroId": seguro_id,
+                "nombre": insurer_names.get(seguro_id, seguro_id),
+            })
+
+    # Handle both nombreCompleto and separated name fields
+    doctor_name = doctor.get("nombreCompleto")
+    if not doctor_name:
+        nombres = doctor.get("nombres", "")
+        apellido_paterno = doctor.get("apellidoPaterno", "")
+        apellido_materno = doctor.get("apellidoMaterno", "")
+        doctor_name = f"{nombres} {apellido_paterno} {apellido_materno}".strip()
+
+    # Handle both ubicacion and direccion
+    clinic_address = None
+    if clinic:
+        clinic_address = clinic.get("ubicacion") or clinic.get("direccion", "")
+
+    return {
+        "doctorId": doctor["doctorId"],
+        "doctorName": doctor_name,
+        "photoUrl": doctor.get("photoUrl") or doctor.get("fotoUrl"),
+        "mainSpecialty": specialty_name,
+        "clinicId": clinic["clinicaId"] if clinic else None,
+        "clinicName": clinic["nombreClinica"] if clinic else None,
+        "clinicAddress": clinic_address,
+        "seguros": seguros,
+    }
+
+
+def doctor_card_items(
+    doctors: Iterable[Dict[str, Any]],
+    clinics: Iterable[Dict[str, Any]],
+    specialties: Iterable[Dict[str, Any]],
+    insurers: Iterable[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Render the doctor-cards items: one per doctor and clinic, or one without a clinic."""
+    clinics_by_id = {clinic["clinicaId"]: clinic for clinic in clinics}
+    specialty_names = {specialty["especialidadId"]: specialty.get("nombre") for specialty in specialties}
+    insurer_names = {insurer["seguroId"]: insurer["nombre"] for insurer in insurers}
+    items = []
+    for doctor in doctors:
+        specialty_name = specialty_names.get(doctor.get("especialidadId"))
+        for clinica_id in list(dict.fromkeys(doctor_clinic_ids(doctor))) or [None]:
+            items.append({
+                CARD_KEY: card_id(doctor["doctorId"], clinica_id),
+                "card": render_card(doctor, clinics_by_id.get(clinica_id), specialty_name, insurer_names),
+            })
+    return items
@@ -0,0 +1,31 @@
+"""Shared doctor cards repository."""
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Iterable
+
+from ..backends import get_resource, get_table
+from .batch import batch_get_items
+from .doctor_cards import CARD_KEY
+from .snapshot import get_snapshot, snapshot_enabled
+
+
+def doctor_cards_enabled() -> bool:
+    return os.environ.get("DOCTOR_CARDS_ENABLED", "true").lower() in ("true", "1", "yes")
+
+
+class DoctorCardsRepository:
+    def __init__(self):
+        env = os.environ.get("ENVIRONMENT", "dev")
+        self.table_name = f"doctor-cards-{env}"
+        self.table = get_table(self.table_name)
+        self._snapshot = get_snapshot(self.table, CARD_KEY) if snapshot_enabled() else None
+
+    def get_cards(self, card_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the cards with the given ids keyed by cardId; ids without a card are left out."""
+        card_ids = [card_id for card_id in dict.fromkeys(card_ids) if card_id]
+        if self._snapshot is not None:
+            items = {card_id: self._snapshot.get(card_id) for card_id in card_ids}
+        else:
+            items = batch_get_items(get_resource(), self.table_name, CARD_KEY, card_ids)
+        return {card_id: item["card"] for card_id, item in items.items() if item and item.get("card")}
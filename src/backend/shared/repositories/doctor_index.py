@@ -0,0 +1,131 @@
+"""Inverted index over the doctors table.
+
+Doctors are stored once in a list and every filterable attribute maps to a
+sorted posting list of positions in that list. Answering a filter is an
+intersection of posting lists, so its cost depends on the shortest list
+involved rather than on the size of the table.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Sequence
+
+from .filters import filter_values
+
+
+def doctor_clinic_ids(doctor: Dict[str, Any]) -> List[str]:
+    """Return the clinic ids of a doctor in either the old or the new format."""
+    if "clinicaId" in doctor:
+        return [doctor["clinicaId"]] if doctor["clinicaId"] else []
+    clinica_ids = doctor.get("clinicaIds") or []
+    return list(clinica_ids) if isinstance(clinica_ids, list) else [clinica_ids]
+
+
+def intersect_postings(postings: Sequence[Sequence[int]]) -> List[int]:
+    """Intersect sorted posting lists, starting from the shortest one."""
+    if not postings:
+        return []
+    ordered = sorted(postings, key=len)
+    result = list(ordered[0])
+    for other in ordered[1:]:
+        if not result:
+            break
+        size = len(other)
+        kept = []
+        for position in result:
+            found = bisect_left(other, position)
+            if found < size and other[found] == position:
+                kept.append(position)
+        result = kept
+    return result
+
+
+def union_postings(postings: Iterable[Sequence[int]]) -> List[int]:
+    """Merge posting lists into one sorted list without duplicates."""
+    merged = set()
+    for posting in postings:
+        merged.update(posting)
+    return sorted(merged)
+
+
+class DoctorIndex:
+    """Posting lists keyed by ``especialidadId``, clinic id and ``rimacEnsured``."""
+
+    def __init__(self, doctors: Iterable[Dict[str, Any]]):
+        self.doctors: List[Dict[str, Any]] = []
+        self.positions: Dict[str, int] = {}
+        self.by_especialidad: Dict[str, List[int]] = {}
+        self.by_clinica: Dict[str, List[int]] = {}
+        self.by_rimac: Dict[bool, List[int]] = {}
+
+        for doctor in doctors:
+            position = len(self.doctors)
+            self.doctors.append(doctor)
+            self.positions[doctor["doctorId"]] = position
+            especialidad_id = doctor.get("especialidadId")
+            if especialidad_id:
+                self.by_especialidad.setdefault(especialidad_id, []).append(position)
+            for clinica_id in dict.fromkeys(doctor_clinic_ids(doctor)):
+                self.by_clinica.setdefault(clinica_id, []).append(position)
+            rimac = doctor.get("rimacEnsured")
+            if rimac is not None:
+                self.by_rimac.setdefault(bool(rimac), []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.doctors)
+
+    def get(self, doctor_id: str) -> Dict[str, Any] | None:
+        position = self.positions.get(doctor_id)
+        return self.doctors[position] if position is not None else None
+
+    def postings_for(self, filters: Dict[str, Any]) -> List[List[int]] | None:
+        """Return the posting lists selected by ``filters``, or None when unfiltered.
+
+        ``especialidadId`` and ``clinicaId`` may be IN-lists (see :func:`filter_values`).
+        """
+        postings = []
+        for name, by_value in (("especialidadId", self.by_especialidad), ("clinicaId", self.by_clinica)):
+            values = filter_values(filters.get(name))
+            if len(values) == 1:
+                postings.append(by_value.get(values[0], []))
+            elif values:
+                # An IN-list is the union of the posting lists of its values
+                postings.append(union_postings(by_value.get(value, []) for value in values))
+        if filters.get("rimacEnsured") is not None:
+            postings.append(self.by_rimac.get(bool(filters["rimacEnsured"]), []))
+        return postings or None
+
+    def matching_positions(
+        self,
+        filters: Dict[str, Any],
+        clinic_ids: Iterable[str] | None = None,
+    ) -> Sequence[int]:
+        """Return the sorted positions of the doctors matching ``filters``.
+
+        ``clinic_ids`` restricts the result to doctors working in any of those
+        clinics (the union of their posting lists).
+        """
+        postings = self.postings_for(filters) or []
+        if clinic_ids is not None:
+            postings.append(union_postings(self.by_clinica.get(clinica_id, []) for clinica_id in clinic_ids))
+        if not postings:
+            return range(len(self.doctors))
+        return intersect_postings(postings)
+
+    def search(
+        self,
+        filters: Dict[str, Any],
+        limit: int | None = None,
+        clinic_ids: Iterable[str] | None = None,
+        after: int | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Return doctors matching ``filters`` in table order.
+
+        ``after`` is a position: only doctors stored after it are returned, which
+        lets a cursor resume with a binary search instead of re-reading the
+        earlier pages.
+        """
+        positions = self.matching_positions(filters, clinic_ids)
+        start = bisect_right(positions, after) if after is not None else 0
+        stop = None if limit is None else start + limit
+        return [self.doctors[position] for position in positions[start:stop]]
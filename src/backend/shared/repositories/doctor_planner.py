@@ -0,0 +1,172 @@
+"""Bitmap query planner for doctor searches.
+
+Doctors keep the dense positions :class:`DoctorIndex` gives them, and every
+filterable value maps to a bitmap with one bit per doctor. Python integers are
+the bitmaps: ``&`` and ``|`` run in C over machine words, and ``bit_count``
+gives the exact selectivity of a term. Insurer and ubigeo filters are resolved
+through clinic membership: their bitmap is the union of the bitmaps of the
+clinics that accept the insurer or sit in the ubigeo.
+
+A query is planned as an AND of terms, one per filter, evaluated from the most
+selective (fewest bits) to the least, stopping as soon as the result is empty.
+A filter listing several values is a single term, the OR of their bitmaps.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from .doctor_index import DoctorIndex
+from .filters import filter_values
+from .facets import sorted_counts
+
+# Below this many results, peeling the lowest set bit beats rendering the bitmap as text
+_SMALL_LIMIT = 64
+
+
+def to_bitmap(positions: Iterable[int], size: int) -> int:
+    """Build a bitmap from positions in O(size / 8 + len(positions))."""
+    raw = bytearray((size + 7) // 8)
+    for position in positions:
+        raw[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(raw, "little")
+
+
+def iter_bits(bitmap: int, after: int | None = None, limit: int | None = None) -> Iterator[int]:
+    """Yield the set positions of ``bitmap`` in ascending order.
+
+    ``after`` skips positions up to and including it; ``limit`` stops early.
+    """
+    if after is not None:
+        bitmap &= ~((1 << (after + 1)) - 1)
+    if limit is not None and limit <= _SMALL_LIMIT:
+        for _ in range(limit):
+            if not bitmap:
+                return
+            lowest = bitmap & -bitmap
+            yield lowest.bit_length() - 1
+            bitmap ^= lowest
+        return
+    text = bin(bitmap)[:1:-1]  # least significant bit first
+    produced = 0
+    position = text.find("1")
+    while position != -1 and (limit is None or produced < limit):
+        yield position
+        produced += 1
+        position = text.find("1", position + 1)
+
+
+class DoctorQueryPlanner:
+    """Bitmaps per especialidadId, clinic, insurer, ubigeo and ``rimacEnsured``."""
+
+    def __init__(self, index: DoctorIndex, clinics: Iterable[Dict[str, Any]]):
+        self.index = index
+        size = len(index)
+        self.size = size
+        self.by_especialidad = {key: to_bitmap(posting, size) for key, posting in index.by_especialidad.items()}
+        self.by_clinica = {key: to_bitmap(posting, size) for key, posting in index.by_clinica.items()}
+        self.by_rimac = {key: to_bitmap(posting, size) for key, posting in index.by_rimac.items()}
+        self.by_seguro: Dict[str, int] = {}
+        self.by_ubigeo: Dict[str, int] = {}
+        for clinic in clinics:
+            members = self.by_clinica.get(clinic.get("clinicaId"), 0)
+            if clinic.get("ubigeoId"):
+                self.by_ubigeo[clinic["ubigeoId"]] = self.by_ubigeo.get(clinic["ubigeoId"], 0) | members
+            for seguro_id in clinic.get("seguroIds") or []:
+                self.by_seguro[seguro_id] = self.by_seguro.get(seguro_id, 0) | members
+
+    def clinics_bitmap(self, clinic_ids: Iterable[str]) -> int:
+        """Return the bitmap of doctors working in any of ``clinic_ids``."""
+        result = 0
+        for clinica_id in clinic_ids:
+            result |= self.by_clinica.get(clinica_id, 0)
+        return result
+
+    def plan(self, filters: Dict[str, Any]) -> List[Tuple[str, int]]:
+        """Return the ``(filter, bitmap)`` terms of ``filters``, most selective first.
+
+        Every filter but ``rimacEnsured`` may be an IN-list (see :func:`filter_values`).
+        """
+        terms = []
+        for name, bitmaps in (
+            ("especialidadId", self.by_especialidad),
+            ("clinicaId", self.by_clinica),
+            ("seguroId", self.by_seguro),
+            ("ubigeoId", self.by_ubigeo),
+        ):
+            values = filter_values(filters.get(name))
+            if values:
+                # An IN-list is one term: the OR of the bitmaps of its values
+                bitmap = 0
+                for value in values:
+                    bitmap |= bitmaps.get(value, 0)
+                terms.append((name, bitmap))
+        if filters.get("rimacEnsured") is not None:
+            terms.append(("rimacEnsured", self.by_rimac.get(bool(filters["rimacEnsured"]), 0)))
+        return sorted(terms, key=lambda term: term[1].bit_count())
+
+    def match(self, filters: Dict[str, Any]) -> int:
+        """Return the bitmap of doctors matching every filter."""
+        terms = self.plan(filters)
+        if not terms:
+            return (1 << self.size) - 1
+        result = terms[0][1]
+        for _, bitmap in terms[1:]:
+            if not result:
+                break
+            result &= bitmap
+        return result
+
+    def count(self, filters: Dict[str, Any]) -> int:
+        return self.match(filters).bit_count()
+
+    def facet_counts(self, bitmap: int, names: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        """Count the doctors of ``bitmap`` per value of each facet, one AND and popcount per value."""
+        sources = {
+            "especialidadId": self.by_especialidad,
+            "clinicaId": self.by_clinica,
+            "seguroId": self.by_seguro,
+            "ubigeoId": self.by_ubigeo,
+        }
+        return {
+            name: sorted_counts({value: (bitmap & members).bit_count() for value, members in sources[name].items()})
+            for name in names
+        }
+
+    def search(
+        self,
+        filters: Dict[str, Any],
+        limit: int | None = None,
+        after: int | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Return doctors matching ``filters`` in table order, after position ``after``."""
+        doctors: Sequence[Dict[str, Any]] = self.index.doctors
+        return [doctors[position] for position in iter_bits(self.match(filters), after, limit)]
+
+    def search_rings(
+        self,
+        filters: Dict[str, Any],
+        clinic_rings: Sequence[Iterable[str]],
+        limit: int | None = None,
+        after: Tuple[int, int] | None = None,
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """Return ``(ring, doctor)`` pairs for doctors in the clinics of each ring, nearest ring first.
+
+        A doctor working in several rings is listed once, under the nearest
+        one. ``after`` is the ``(ring, position)`` of the last pair returned
+        by the previous page.
+        """
+        doctors: Sequence[Dict[str, Any]] = self.index.doctors
+        base = self.match(filters)
+        seen = 0
+        hits: List[Tuple[int, Dict[str, Any]]] = []
+        for ring, clinic_ids in enumerate(clinic_rings):
+            members = base & self.clinics_bitmap(clinic_ids) & ~seen
+            seen |= members
+            if after is not None and ring < after[0]:
+                continue
+            start = after[1] if after is not None and ring == after[0] else None
+            remaining = None if limit is None else limit - len(hits)
+            hits.extend((ring, doctors[position]) for position in iter_bits(members, start, remaining))
+            if limit is not None and len(hits) >= limit:
+                break
+        return hits
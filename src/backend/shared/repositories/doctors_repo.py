@@ -1,60 +1,438 @@
 """Shared doctors repository."""
 from __future__ import annotations
 
+import copy
+import heapq
 import os
-from typing import Dict, List
+import threading
+from bisect import bisect_right
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
 
-import boto3
+from boto3.dynamodb.conditions import Key
+
+from ..backends import get_table
+from ..exceptions import ValidationError
+from ..pagination import resume_position
+from .doctor_index import DoctorIndex, doctor_clinic_ids
+from .doctor_planner import DoctorQueryPlanner
+from .doctor_sort import DoctorOrder
+from .filters import filter_values
+from .name_index import NAME_FIELDS, NameIndex
+from .projection import projection_kwargs
+from .scan import iter_parallel_scan, iter_query, scan_matching, scan_segments
+from .snapshot import ScanCache, StaticSnapshot, get_snapshot, read_dataset_version, snapshot_enabled
+
+# GSI on doctors-{env} keyed by especialidadId (sort key doctorId)
+ESPECIALIDAD_INDEX = "especialidadId-index"
+
+# Attributes _matches_filters reads, always added to a projection
+FILTER_FIELDS = ("doctorId", "especialidadId", "clinicaId", "clinicaIds", "rimacEnsured")
+
+
+def doctor_index_enabled() -> bool:
+    return os.environ.get("DOCTOR_INDEX_ENABLED", "true").lower() in ("true", "1", "yes")
+
+
+def doctor_queries_enabled() -> bool:
+    return os.environ.get("DOCTOR_QUERIES_ENABLED", "true").lower() in ("true", "1", "yes")
+
+
+def clinic_doctor_items(doctor: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Build the ``CLINIC#<clinicaId>`` / ``DOCTOR#<doctorId>`` adjacency items of a doctor.
+
+    Each item carries a full copy of the doctor so a clinic query needs no
+    follow-up reads. Written by the populate scripts into clinic-doctors-{env}.
+    """
+    return [
+        {**doctor, "pk": f"CLINIC#{clinica_id}", "sk": f"DOCTOR#{doctor['doctorId']}"}
+        for clinica_id in dict.fromkeys(doctor_clinic_ids(doctor))
+    ]
 
 
 class DoctorsRepository:
     def __init__(self):
         env = os.environ.get("ENVIRONMENT", "dev")
         self.table_name = f"doctors-{env}"
-        dynamodb = boto3.resource("dynamodb")
-        self.table = dynamodb.Table(self.table_name)
-    
-    def list_doctors(self, filters: Dict[str, str]) -> List[Dict[str, str]]:
+        self.clinic_doctors_table_name = f"clinic-doctors-{env}"
+        self.table = get_table(self.table_name)
+        self.clinic_doctors_table = get_table(self.clinic_doctors_table_name)
+        self.scan_segments = scan_segments("doctors")
+        self.queries_enabled = doctor_queries_enabled()
+        self._snapshot = (
+            get_snapshot(self.table, "doctorId", segments=self.scan_segments) if doctor_index_enabled() else None
+        )
+        self.clinics_table = get_table(f"clinics-{env}")
+        # Clinic membership resolves insurer and ubigeo filters in the planner
+        self._clinics_snapshot = get_snapshot(self.clinics_table, "clinicaId") if self._snapshot else None
+        self._planner_lock = threading.Lock()
+        self._planner: tuple[DoctorIndex, int, DoctorQueryPlanner] | None = None
+        # Name indexes built from scans when there is no doctor index, by projected fields
+        self._name_indexes_lock = threading.Lock()
+        self._name_indexes: Dict[Tuple[str, ...] | None, ScanCache[NameIndex]] = {}
+
+    def pinned(self) -> "DoctorsRepository":
+        """Return a copy answering every search from one read of the doctors table.
+
+        Without the container index each search reads DynamoDB on its own; a
+        batch of searches shares this copy so the table is scanned once and
+        indexed for the batch. With the index this repository is returned as is.
+        """
+        if self._snapshot is not None:
+            return self
+        pinned = copy.copy(self)
+        pinned._snapshot = StaticSnapshot.read(self.table, "doctorId", self.scan_segments)
+        if snapshot_enabled():
+            pinned._clinics_snapshot = get_snapshot(self.clinics_table, "clinicaId")
+        else:
+            pinned._clinics_snapshot = StaticSnapshot.read(self.clinics_table, "clinicaId")
+        pinned._planner_lock = threading.Lock()
+        pinned._planner = None
+        return pinned
+
+    def index(self) -> DoctorIndex | None:
+        """Return the container-wide doctor index, building it on first use."""
+        if self._snapshot is None:
+            return None
+        return self._snapshot.derived("doctor_index", DoctorIndex)
+
+    def order(self) -> DoctorOrder | None:
+        """Return the presorted orders of the indexed doctors, built once per snapshot load."""
+        if self._snapshot is None:
+            return None
+        return self._snapshot.derived("doctor_order", DoctorOrder)
+
+    def planner(self) -> DoctorQueryPlanner | None:
+        """Return the bitmap planner, rebuilt when the doctors or clinics snapshot reloads."""
+        index = self.index()
+        if index is None:
+            return None
+        clinics_generation = self._clinics_snapshot.generation
+        with self._planner_lock:
+            cached = self._planner
+            if cached is None or cached[0] is not index or cached[1] != clinics_generation:
+                cached = (index, clinics_generation, DoctorQueryPlanner(index, self._clinics_snapshot.items()))
+                self._planner = cached
+            return cached[2]
+
+    def dataset_version(self) -> Tuple[Any, Any]:
+        """Identify the doctors and clinics data being served, for caches of search results.
+
+        With the index this is the snapshot generations, bumped on every reload;
+        otherwise the recorded dataset versions, one ``GetItem`` per table.
+        """
+        if self._snapshot is not None:
+            return self._snapshot.generation, self._clinics_snapshot.generation
+        return read_dataset_version(self.table), read_dataset_version(self.clinics_table)
+
+    def name_index(self, fields: Iterable[str] | None = None) -> NameIndex:
+        """Return the trigram name index: container-wide with the doctor index, else built from a scan.
+
+        ``fields`` limits the attributes a scan reads, like in :meth:`list_doctors`.
+        A scanned index is kept per container too, and rebuilt when the
+        recorded doctors dataset version changes (see :class:`ScanCache`).
+        """
+        if self._snapshot is not None:
+            return self._snapshot.derived("name_index", NameIndex)
+        key = tuple(fields) if fields is not None else None
+        with self._name_indexes_lock:
+            cache = self._name_indexes.get(key)
+            if cache is None:
+                projection = projection_kwargs(key, FILTER_FIELDS, NAME_FIELDS)
+                cache = ScanCache(
+                    [self.table],
+                    lambda: NameIndex(iter_parallel_scan(self.table, self.scan_segments, **projection)),
+                )
+                self._name_indexes[key] = cache
+        return cache.get()
+
+    def search_names(
+        self,
+        query: str,
+        filters: Dict[str, Any],
+        limit: int | None = None,
+        clinic_ids: Iterable[str] | None = None,
+        fields: Iterable[str] | None = None,
+        resume: Dict[str, Any] | None = None,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """Return ``(score, doctor)`` pairs whose name matches ``query``, best first.
+
+        ``filters`` and ``clinic_ids`` narrow the candidates like in
+        :meth:`list_doctors_in_clinics`. ``resume`` holds the doctorId (``"k"``)
+        and score (``"s"``) of the last pair of the previous page.
+        """
+        wanted = set(clinic_ids) if clinic_ids is not None else None
+
+        def accept(doctor: Dict[str, Any]) -> bool:
+            if wanted is not None and not any(clinica_id in wanted for clinica_id in doctor_clinic_ids(doctor)):
+                return False
+            return self._matches_filters(doctor, filters)
+
+        after = (resume["s"], resume["k"]) if resume else None
+        return self.name_index(fields).search(query, limit, accept=accept, after=after)
+
+    def search_doctors(
+        self,
+        filters: Dict[str, Any],
+        limit: int | None = None,
+        resume: Dict[str, Any] | None = None,
+        sort: str | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Answer a search by bitmap planning over especialidadId, clinicaId, seguroId, ubigeoId and rimacEnsured.
+
+        Matches come in table order, or in one of the presorted ``sort`` orders
+        (see :mod:`doctor_sort`). Only available with the in-memory index;
+        callers check :meth:`planner` first.
+        """
+        planner = self.planner()
+        if planner is None:
+            raise RuntimeError("Doctor planner requires DOCTOR_INDEX_ENABLED")
+        after = self._after_position(planner.index, resume)
+        if sort is None:
+            return planner.search(filters, limit, after=after)
+        positions = self.order().select(sort, planner.match(filters), limit, after=after)
+        return [planner.index.doctors[position] for position in positions]
+
+    def count_doctors(self, filters: Dict[str, Any]) -> int:
+        """Count the matches of :meth:`search_doctors` with one popcount."""
+        planner = self.planner()
+        if planner is None:
+            raise RuntimeError("Doctor planner requires DOCTOR_INDEX_ENABLED")
+        return planner.count(filters)
+
+    def facet_counts(self, filters: Dict[str, Any], names: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        """Count the matches of :meth:`search_doctors` per facet value from the planner bitmaps."""
+        planner = self.planner()
+        if planner is None:
+            raise RuntimeError("Doctor planner requires DOCTOR_INDEX_ENABLED")
+        return planner.facet_counts(planner.match(filters), names)
+
+    def search_doctors_near(
+        self,
+        filters: Dict[str, Any],
+        clinic_rings: Sequence[Iterable[str]],
+        limit: int | None = None,
+        fields: Iterable[str] | None = None,
+        resume: Dict[str, Any] | None = None,
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """Return ``(ring, doctor)`` pairs for doctors matching ``filters`` in the clinics of each ring.
+
+        Rings are listed nearest first and a doctor appears once, under the
+        nearest ring holding one of its clinics. ``resume`` is a
+        :meth:`resume_token` extended with the ring (``"h"``) of the last pair.
+        """
+        planner = self.planner()
+        if planner is not None:
+            after = None
+            if resume is not None:
+                after = (resume.get("h", 0), self._after_position(planner.index, resume))
+            return planner.search_rings(filters, clinic_rings, limit, after=after)
+
+        # Later rings are deduplicated against earlier ones, so every ring is read in full. Each ring is
+        # listed by doctorId, so a cursor resumes in (ring, doctorId) order even if its doctor is gone.
+        hits: List[Tuple[int, Dict[str, Any]]] = []
+        seen: set[str] = set()
+        for ring, clinic_ids in enumerate(clinic_rings):
+            clinic_ids = list(clinic_ids)
+            if not clinic_ids:
+                continue
+            doctors = self.list_doctors_in_clinics(clinic_ids, filters, fields=fields)
+            for doctor in sorted(doctors, key=lambda doctor: doctor["doctorId"]):
+                if doctor["doctorId"] not in seen:
+                    seen.add(doctor["doctorId"])
+                    hits.append((ring, doctor))
+        if resume is not None:
+            after = (resume.get("h", 0), resume.get("k"))
+            if not isinstance(after[0], int) or not isinstance(after[1], str):
+                raise ValidationError("Invalid cursor")
+            hits = hits[bisect_right(hits, after, key=lambda hit: (hit[0], hit[1]["doctorId"])):]
+        return hits[:limit] if limit is not None else hits
+
+    def resume_token(self, doctor: Dict[str, Any]) -> Dict[str, Any]:
+        """Return where a page ending with ``doctor`` resumes: its id, plus its index position."""
+        token: Dict[str, Any] = {"k": doctor["doctorId"]}
+        index = self.index()
+        position = index.positions.get(doctor["doctorId"]) if index is not None else None
+        if position is not None:
+            token["p"] = position
+        return token
+
+    @staticmethod
+    def _after_position(index: DoctorIndex, resume: Dict[str, Any] | None) -> int | None:
+        return resume_position(index.positions, resume)
+
+    def list_doctors(
+        self,
+        filters: Dict[str, str],
+        limit: int | None = None,
+        fields: Iterable[str] | None = None,
+        resume: Dict[str, Any] | None = None,
+    ) -> List[Dict[str, str]]:
+        """Return doctors matching ``filters``.
+
+        ``fields`` limits the attributes read from DynamoDB; the in-memory index
+        already holds full items and returns them as they are. ``resume`` is a
+        :meth:`resume_token` of the last doctor of the previous page; reading
+        restarts right after it.
+        """
+        projection = projection_kwargs(fields, FILTER_FIELDS)
+        after = resume.get("k") if resume else None
+        index = self.index()
+        if index is not None:
+            if filters.get("doctorId"):
+                item = index.get(filters["doctorId"])
+                return [item] if item and not resume and self._matches_filters(item, filters) else []
+            return index.search(filters, limit, after=self._after_position(index, resume))
+
         # If specific doctorId requested, get item directly
         if filters.get("doctorId"):
-            response = self.table.get_item(Key={"doctorId": filters["doctorId"]})
+            if resume:
+                return []
+            response = self.table.get_item(Key={"doctorId": filters["doctorId"]}, **projection)
             item = response.get("Item")
             if item and self._matches_filters(item, filters):
                 return [item]
             return []
-        
-        # Otherwise scan the table with filters
-        response = self.table.scan()
-        items = response.get("Items", [])
-        
-        # Apply filters
-        results = []
-        for doctor in items:
-            if self._matches_filters(doctor, filters):
-                results.append(doctor)
-        
-        return results
-    
-    def _matches_filters(self, doctor: Dict[str, str], filters: Dict[str, str]) -> bool:
-        """Check if doctor matches all provided filters."""
+
+        # Read only the specialty or clinic partitions when they are requested
+        especialidad_ids = filter_values(filters.get("especialidadId"))
+        clinica_ids = filter_values(filters.get("clinicaId"))
+        if self.queries_enabled and especialidad_ids:
+            doctors = self._query_especialidades(especialidad_ids, projection, after)
+            return self._filter(doctors, filters, limit)
+        if self.queries_enabled and len(clinica_ids) == 1:
+            return self._filter(self._query_clinic(clinica_ids[0], projection, after), filters, limit)
+        if self.queries_enabled and clinica_ids:
+            return self._filter(self._query_clinics(clinica_ids, projection, after), filters, limit)
+
+        # Otherwise scan every page of the table, filtering as pages arrive
+        return scan_matching(
+            self.table,
+            lambda doctor: self._matches_filters(doctor, filters),
+            limit,
+            segments=self.scan_segments,
+            after={"doctorId": after} if after else None,
+            **projection,
+        )
+
+    def list_doctors_in_clinics(
+        self,
+        clinic_ids: Iterable[str],
+        filters: Dict[str, str],
+        limit: int | None = None,
+        fields: Iterable[str] | None = None,
+        resume: Dict[str, Any] | None = None,
+    ) -> List[Dict[str, str]]:
+        """Return doctors matching ``filters`` that work in any of ``clinic_ids``."""
+        clinic_ids = list(dict.fromkeys(clinic_ids))
+        projection = projection_kwargs(fields, FILTER_FIELDS)
+        after = resume.get("k") if resume else None
+        index = self.index()
+        if index is not None:
+            return index.search(filters, limit, clinic_ids=clinic_ids, after=self._after_position(index, resume))
+
+        wanted = set(clinic_ids)
+
+        def in_clinics(doctor: Dict[str, Any]) -> bool:
+            return any(clinica_id in wanted for clinica_id in doctor_clinic_ids(doctor))
+
+        especialidad_ids = filter_values(filters.get("especialidadId"))
+        if self.queries_enabled and especialidad_ids:
+            doctors = (
+                doctor
+                for doctor in self._query_especialidades(especialidad_ids, projection, after)
+                if in_clinics(doctor)
+            )
+            return self._filter(doctors, filters, limit)
+        if self.queries_enabled:
+            return self._filter(self._query_clinics(clinic_ids, projection, after), filters, limit)
+
+        return scan_matching(
+            self.table,
+            lambda doctor: in_clinics(doctor) and self._matches_filters(doctor, filters),
+            limit,
+            segments=self.scan_segments,
+            after={"doctorId": after} if after else None,
+            **projection,
+        )
+
+    def _query_especialidad(
+        self,
+        especialidad_id: str,
+        projection: Dict[str, Any],
+        after: str | None = None,
+    ) -> Iterable[Dict[str, Any]]:
+        if after:
+            projection = {**projection, "ExclusiveStartKey": {"especialidadId": especialidad_id, "doctorId": after}}
+        return iter_query(
+            self.table,
+            IndexName=ESPECIALIDAD_INDEX,
+            KeyConditionExpression=Key("especialidadId").eq(especialidad_id),
+            **projection,
+        )
+
+    def _query_especialidades(
+        self,
+        especialidad_ids: Sequence[str],
+        projection: Dict[str, Any],
+        after: str | None = None,
+    ) -> Iterable[Dict[str, Any]]:
+        # Each GSI partition is sorted by doctorId, so merging keeps a cursor's ExclusiveStartKey valid in all of them
+        if len(especialidad_ids) == 1:
+            return self._query_especialidad(especialidad_ids[0], projection, after)
+        return heapq.merge(
+            *(self._query_especialidad(especialidad_id, projection, after) for especialidad_id in especialidad_ids),
+            key=lambda doctor: doctor["doctorId"],
+        )
+
+    def _query_clinic(
+        self,
+        clinica_id: str,
+        projection: Dict[str, Any],
+        after: str | None = None,
+    ) -> Iterable[Dict[str, Any]]:
+        if after:
+            projection = {**projection, "ExclusiveStartKey": {"pk": f"CLINIC#{clinica_id}", "sk": f"DOCTOR#{after}"}}
+        items = iter_query(
+            self.clinic_doctors_table,
+            KeyConditionExpression=Key("pk").eq(f"CLINIC#{clinica_id}"),
+            **projection,
+        )
+        for item in items:
+            item.pop("pk", None)
+            item.pop("sk", None)
+            yield item
+
+    def _query_clinics(
+        self,
+        clinic_ids: Iterable[str],
+        projection: Dict[str, Any],
+        after: str | None = None,
+    ) -> Iterable[Dict[str, Any]]:
+        # Partitions are sorted by doctorId, so the merge resumes from the cursor in each of them and a
+        # doctor working in several of the clinics comes out once, from adjacent copies
+        last = None
+        partitions = (self._query_clinic(clinica_id, projection, after) for clinica_id in clinic_ids)
+        for doctor in heapq.merge(*partitions, key=lambda doctor: doctor["doctorId"]):
+            if doctor["doctorId"] != last:
+                last = doctor["doctorId"]
+                yield doctor
+
+    def _filter(self, doctors: Iterable[Dict[str, Any]], filters: Dict[str, str], limit: int | None) -> List[Dict[str, Any]]:
+        return list(islice((doctor for doctor in doctors if self._matches_filters(doctor, filters)), limit))
+
+    def _matches_filters(self, doctor: Dict[str, str], filters: Dict[str, Any]) -> bool:
+        """Check if doctor matches all provided filters; IN-lists match any of their values."""
         # Handle clinicaId filter with both old (clinicaId) and new (clinicaIds array) format
-        if filters.get("clinicaId"):
-            if "clinicaId" in doctor and doctor.get("clinicaId") != filters["clinicaId"]:
-                return False
-            elif "clinicaIds" in doctor:
-                clinica_ids = doctor.get("clinicaIds", [])
-                if isinstance(clinica_ids, list):
-                    if filters["clinicaId"] not in clinica_ids:
-                        return False
-                elif clinica_ids != filters["clinicaId"]:
-                    return False
-        
+        clinica_ids = filter_values(filters.get("clinicaId"))
+        if clinica_ids and not any(clinica_id in clinica_ids for clinica_id in doctor_clinic_ids(doctor)):
+            return False
+
         # Use especialidadId (the actual field in the data)
-        if filters.get("especialidadId"):
-            doctor_especialidad = doctor.get("especialidadId")
-            if doctor_especialidad != filters["especialidadId"]:
-                return False
-        
+        especialidad_ids = filter_values(filters.get("especialidadId"))
+        if especialidad_ids and doctor.get("especialidadId") not in especialidad_ids:
+            return False
+
         if filters.get("rimacEnsured") is not None and doctor.get("rimacEnsured") != filters["rimacEnsured"]:
             return False
         return True
@@ -0,0 +1,53 @@
+"""Facet counts for doctor searches.
+
+A facet counts how many matching doctors fall under each value of a filter
+attribute. Insurer and ubigeo facets go through clinic membership, like the
+filters themselves: a doctor counts once for every insurer accepted, and every
+ubigeo covered, by any of their clinics.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Dict, Iterable, Mapping
+
+from .doctor_index import doctor_clinic_ids
+
+FACETS = ("especialidadId", "clinicaId", "seguroId", "ubigeoId")
+
+
+def sorted_counts(counts: Mapping[str, int]) -> Dict[str, int]:
+    """Drop zero counts and order values by count, then by value."""
+    return dict(sorted(((key, count) for key, count in counts.items() if count), key=lambda entry: (-entry[1], entry[0])))
+
+
+def count_facets(
+    doctors: Iterable[Dict[str, Any]],
+    names: Iterable[str],
+    clinics: Mapping[str, Dict[str, Any]],
+) -> Dict[str, Dict[str, int]]:
+    """Fill every requested facet in one pass over ``doctors``.
+
+    ``clinics`` maps clinicaId to a clinic carrying ``seguroIds`` and ``ubigeoId``.
+    """
+    counters: Dict[str, Counter] = {name: Counter() for name in names}
+    especialidades = counters.get("especialidadId")
+    clinicas = counters.get("clinicaId")
+    seguros = counters.get("seguroId")
+    ubigeos = counters.get("ubigeoId")
+    for doctor in doctors:
+        if especialidades is not None and doctor.get("especialidadId"):
+            especialidades[doctor["especialidadId"]] += 1
+        clinic_ids = set(doctor_clinic_ids(doctor))
+        if clinicas is not None:
+            clinicas.update(clinic_ids)
+        if seguros is not None:
+            seguros.update({
+                seguro_id for clinica_id in clinic_ids for seguro_id in clinics.get(clinica_id, {}).get("seguroIds") or ()
+            })
+        if ubigeos is not None:
+            ubigeos.update({
+                clinics[clinica_id]["ubigeoId"]
+                for clinica_id in clinic_ids
+                if clinics.get(clinica_id, {}).get("ubigeoId")
+            })
+    return {name: sorted_counts(counter) for name, counter in counters.items()}
@@ -0,0 +1,18 @@
+"""Filter values: a filter holds one id or an IN-list of ids.
+
+The repositories accept either form for ``especialidadId``, ``clinicaId``,
+``seguroId`` and ``ubigeoId``, and a record matches an IN-list when it matches
+any of its values.
+"""
+from __future__ import annotations
+
+from typing import Any, Tuple
+
+
+def filter_values(value: Any) -> Tuple[str, ...]:
+    """Return the ids of a filter value in order, without duplicates; () when unset."""
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(dict.fromkeys(item for item in value if item))
@@ -4,30 +4,40 @@ from __future__ import annotations
 import os
 from typing import Dict, List
 
-import boto3
 from boto3.dynamodb.conditions import Attr
 
+from ..backends import get_table
+from .scan import iter_scan
+from .snapshot import get_snapshot, snapshot_enabled
+
 
 class InsurersRepository:
     def __init__(self):
         env = os.environ.get("ENVIRONMENT", "dev")
         self.seguros_table_name = f"seguros-{env}"
         self.clinics_table_name = f"clinics-{env}"
-        dynamodb = boto3.resource("dynamodb")
-        self.seguros_table = dynamodb.Table(self.seguros_table_name)
-        self.clinics_table = dynamodb.Table(self.clinics_table_name)
+        self.seguros_table = get_table(self.seguros_table_name)
+        self.clinics_table = get_table(self.clinics_table_name)
+        if snapshot_enabled():
+            self._seguros_snapshot = get_snapshot(self.seguros_table, "seguroId")
+            self._clinics_snapshot = get_snapshot(self.clinics_table, "clinicaId")
+        else:
+            self._seguros_snapshot = self._clinics_snapshot = None
     
     def list_insurers(self, seguro_id: str | None = None) -> List[Dict[str, str]]:
+        if self._seguros_snapshot is not None:
+            if seguro_id:
+                item = self._seguros_snapshot.get(seguro_id)
+                return [item] if item else []
+            return self._seguros_snapshot.items()
         if seguro_id:
             response = self.seguros_table.get_item(Key={"seguroId": seguro_id})
             item = response.get("Item")
             return [item] if item else []
         else:
-            response = self.seguros_table.scan()
-            return response.get("Items", [])
+            return list(iter_scan(self.seguros_table))
 
     def list_clinics_by_insurer(self, seguro_id: str) -> List[Dict[str, str]]:
-        response = self.clinics_table.scan(
-            FilterExpression=Attr("seguroIds").contains(seguro_id)
-        )
-        return response.get("Items", [])
+        if self._clinics_snapshot is not None:
+            return [clinic for clinic in self._clinics_snapshot.items() if seguro_id in clinic.get("seguroIds", [])]
+        return list(iter_scan(self.clinics_table, FilterExpression=Attr("seguroIds").contains(seguro_id)))
@@ -0,0 +1,93 @@
+"""Trigram inverted index over doctor names.
+
+Full names are normalized with :func:`shared.text.normalize` and split into
+trigrams; every trigram maps to the positions of the doctors whose name holds
+it. A query keeps names that contain at least ``MIN_CONTAINMENT`` of its
+trigrams and ranks them by Dice similarity, so closer and shorter names come
+first.
+
+Counting shared trigrams uses prefix filtering: a name sharing ``needed`` of
+the query's ``n`` trigrams must appear in one of its ``n - needed + 1`` rarest
+postings, so only those are counted in full. The common postings are then
+intersected with that candidate set instead of being walked.
+"""
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from itertools import chain
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Tuple
+
+from ..text import normalize, trigrams
+
+# Attributes a name index is built from
+NAME_FIELDS = ("nombreCompleto", "nombres", "apellidoPaterno", "apellidoMaterno")
+# Share of the query trigrams a name must contain to be a candidate
+MIN_CONTAINMENT = 0.5
+
+
+def doctor_full_name(doctor: Dict[str, Any]) -> str:
+    """Return ``nombreCompleto`` or the name assembled from its parts."""
+    if doctor.get("nombreCompleto"):
+        return doctor["nombreCompleto"]
+    parts = (doctor.get(field) for field in ("nombres", "apellidoPaterno", "apellidoMaterno"))
+    return " ".join(part for part in parts if part)
+
+
+class NameIndex:
+    """Trigram postings over the normalized full names of ``doctors``."""
+
+    def __init__(self, doctors: Iterable[Dict[str, Any]]):
+        self.doctors: List[Dict[str, Any]] = list(doctors)
+        self.sizes: List[int] = []
+        postings: Dict[str, List[int]] = {}
+        for position, doctor in enumerate(self.doctors):
+            grams = trigrams(normalize(doctor_full_name(doctor)))
+            self.sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+        self.postings: Dict[str, FrozenSet[int]] = {gram: frozenset(posting) for gram, posting in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.doctors)
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = None,
+        accept: Callable[[Dict[str, Any]], bool] | None = None,
+        after: Tuple[float, str] | None = None,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """Return ``(score, doctor)`` pairs for ``query``, best first.
+
+        Ties are broken by doctorId, so ``after`` — the ``(score, doctorId)``
+        of the last pair of the previous page — resumes the ranking exactly.
+        ``accept`` drops candidates that fail the other search filters.
+        """
+        grams = trigrams(normalize(query))
+        if not grams:
+            return []
+        needed = max(1, round(len(grams) * MIN_CONTAINMENT))
+        postings = sorted((self.postings.get(gram, frozenset()) for gram in grams), key=len)
+        prefix = len(postings) - needed + 1
+        counts = Counter(chain.from_iterable(postings[:prefix]))
+        candidates = set(counts)
+        for posting in postings[prefix:]:
+            counts.update(candidates & posting)
+        doctors, sizes, size = self.doctors, self.sizes, len(grams)
+        after_key = (-after[0], after[1]) if after is not None else None
+
+        ranked = []
+        for position in [position for position, shared in counts.items() if shared >= needed]:
+            doctor = doctors[position]
+            if accept is not None and not accept(doctor):
+                continue
+            key = (-2 * counts[position] / (size + sizes[position]), doctor["doctorId"])
+            if after_key is not None and key <= after_key:
+                continue
+            ranked.append((key, doctor))
+        if limit is not None:
+            ranked = heapq.nsmallest(limit, ranked, key=lambda entry: entry[0])
+        else:
+            ranked.sort(key=lambda entry: entry[0])
+        return [(-key[0], doctor) for key, doctor in ranked]
@@ -0,0 +1,22 @@
+"""ProjectionExpression helpers for reading only the attributes a caller renders."""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable
+
+
+def projection_kwargs(fields: Iterable[str] | None, *required: Iterable[str]) -> Dict[str, Any]:
+    """Build ``ProjectionExpression`` request arguments for ``fields``.
+
+    Every attribute goes through an ``#pN`` placeholder, so reserved words such
+    as ``status`` or ``name`` need no special casing. ``required`` adds
+    attributes the repository itself needs (keys, client-side filter inputs).
+    Returns an empty dict when ``fields`` is None, meaning "read everything".
+    """
+    if fields is None:
+        return {}
+    names = list(dict.fromkeys(name for group in (fields, *required) for name in group))
+    placeholders = {f"#p{position}": name for position, name in enumerate(names)}
+    return {
+        "ProjectionExpression": ", ".join(placeholders),
+        "ExpressionAttributeNames": placeholders,
+    }
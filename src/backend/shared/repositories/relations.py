@@ -0,0 +1,222 @@
+"""Sparse doctor x clinic, clinic x insurer and clinic x ubigeo relations.
+
+Each relation is a boolean matrix in CSR form (``indptr``/``indices`` NumPy
+arrays) between two id spaces. Joins are sparse products: doctor x ubigeo is
+doctor x clinic times clinic x ubigeo, computed for every nonzero at once with
+``np.repeat`` instead of nested loops over ``clinicaIds`` and ``seguroIds``.
+Group counts are one ``np.bincount`` over the joined pairs.
+
+NumPy is imported with this module only, so Lambdas that never run a coverage
+query do not pay for it at cold start.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .doctor_index import doctor_clinic_ids
+from .facets import FACETS, sorted_counts
+from .filters import filter_values
+
+# Dimensions a doctor relates to through its clinics
+CLINIC_DIMENSIONS = ("clinicaId", "seguroId", "ubigeoId")
+DIMENSIONS = FACETS
+
+
+def _codes(ids: Iterable[str]) -> Dict[str, int]:
+    return {value: code for code, value in enumerate(dict.fromkeys(ids))}
+
+
+class Relation:
+    """Boolean sparse matrix between ``row_ids`` and ``col_ids``, in CSR form."""
+
+    def __init__(self, row_ids: Sequence[str], col_ids: Sequence[str], indptr: np.ndarray, indices: np.ndarray):
+        self.row_ids = list(row_ids)
+        self.col_ids = list(col_ids)
+        self.indptr = indptr
+        self.indices = indices
+
+    @classmethod
+    def from_pairs(cls, row_ids: Sequence[str], col_ids: Sequence[str], rows: np.ndarray, cols: np.ndarray) -> "Relation":
+        """Build the relation from ``(row, col)`` code pairs; duplicate pairs collapse."""
+        n_cols = max(len(col_ids), 1)
+        keys = np.unique(rows.astype(np.int64) * n_cols + cols)
+        rows, cols = keys // n_cols, keys % n_cols
+        indptr = np.zeros(len(row_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(row_ids)), out=indptr[1:])
+        return cls(row_ids, col_ids, indptr, cols.astype(np.int64))
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.row_ids), len(self.col_ids)
+
+    @property
+    def nnz(self) -> int:
+        return int(self.indices.size)
+
+    def row_codes(self) -> np.ndarray:
+        """Row code of every nonzero, aligned with ``indices``."""
+        return np.repeat(np.arange(len(self.row_ids), dtype=np.int64), np.diff(self.indptr))
+
+    def compose(self, other: "Relation") -> "Relation":
+        """Boolean product ``self x other``: row r relates to column c if any middle id links them."""
+        rows = self.row_codes()
+        middle = self.indices
+        lengths = np.diff(other.indptr)[middle]
+        total = int(lengths.sum())
+        out_rows = np.repeat(rows, lengths)
+        # Gather other's column runs for each middle id: run start + offset inside the run
+        run_starts = np.repeat(other.indptr[middle] - (np.cumsum(lengths) - lengths), lengths)
+        out_cols = other.indices[run_starts + np.arange(total, dtype=np.int64)]
+        return Relation.from_pairs(self.row_ids, other.col_ids, out_rows, out_cols)
+
+    def any_of(self, col_mask: np.ndarray) -> np.ndarray:
+        """Rows related to at least one column selected by ``col_mask``."""
+        hits = np.bincount(self.row_codes(), weights=col_mask[self.indices], minlength=len(self.row_ids))
+        return hits > 0
+
+    def col_counts(self, row_mask: np.ndarray) -> np.ndarray:
+        """Number of rows selected by ``row_mask`` related to each column."""
+        return np.bincount(self.indices[row_mask[self.row_codes()]], minlength=len(self.col_ids))
+
+
+class CoverageRelations:
+    """The doctors and clinics tables as sparse relations, for coverage and join counts."""
+
+    def __init__(self, doctors: Iterable[Dict[str, Any]], clinics: Iterable[Dict[str, Any]]):
+        doctors = list(doctors)
+        clinics = list(clinics)
+        self.doctor_ids = [doctor["doctorId"] for doctor in doctors]
+        clinic_codes = _codes(clinic["clinicaId"] for clinic in clinics)
+        clinic_ids = list(clinic_codes)
+        especialidad_codes = _codes(doctor["especialidadId"] for doctor in doctors if doctor.get("especialidadId"))
+        seguro_codes = _codes(seguro_id for clinic in clinics for seguro_id in clinic.get("seguroIds") or ())
+        ubigeo_codes = _codes(clinic["ubigeoId"] for clinic in clinics if clinic.get("ubigeoId"))
+
+        # Doctors without a specialty get -1 and are left out of specialty groups
+        self.especialidad_codes = especialidad_codes
+        self.especialidad_ids = list(especialidad_codes)
+        self.especialidad = np.array(
+            [especialidad_codes.get(doctor.get("especialidadId"), -1) for doctor in doctors], dtype=np.int64
+        )
+        # rimacEnsured as 1/0, and -1 when unknown so neither filter value matches it
+        self.rimac = np.array(
+            [-1 if doctor.get("rimacEnsured") is None else int(bool(doctor["rimacEnsured"])) for doctor in doctors],
+            dtype=np.int8,
+        )
+
+        clinic_pairs = [
+            (position, clinic_codes[clinica_id])
+            for position, doctor in enumerate(doctors)
+            for clinica_id in doctor_clinic_ids(doctor)
+            if clinica_id in clinic_codes
+        ]
+        self.doctor_clinic = self._relation(self.doctor_ids, clinic_ids, clinic_pairs)
+
+        seguro_pairs = [
+            (clinic_codes[clinic["clinicaId"]], seguro_codes[seguro_id])
+            for clinic in clinics
+            for seguro_id in clinic.get("seguroIds") or ()
+        ]
+        self.clinic_seguro = self._relation(clinic_ids, list(seguro_codes), seguro_pairs)
+        ubigeo_pairs = [
+            (clinic_codes[clinic["clinicaId"]], ubigeo_codes[clinic["ubigeoId"]]) for clinic in clinics if clinic.get("ubigeoId")
+        ]
+        self.clinic_ubigeo = self._relation(clinic_ids, list(ubigeo_codes), ubigeo_pairs)
+
+        # Doctor x insurer and doctor x ubigeo, joined once through the clinics
+        self.through_clinics: Dict[str, Relation] = {
+            "clinicaId": self.doctor_clinic,
+            "seguroId": self.doctor_clinic.compose(self.clinic_seguro),
+            "ubigeoId": self.doctor_clinic.compose(self.clinic_ubigeo),
+        }
+
+    @staticmethod
+    def _relation(row_ids: List[str], col_ids: List[str], pairs: List[Tuple[int, int]]) -> Relation:
+        rows = np.array([row for row, _ in pairs], dtype=np.int64)
+        cols = np.array([col for _, col in pairs], dtype=np.int64)
+        return Relation.from_pairs(row_ids, col_ids, rows, cols)
+
+    def __len__(self) -> int:
+        return len(self.doctor_ids)
+
+    def mask(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Boolean mask of the doctors matching ``filters``; every filter but rimacEnsured may be an IN-list."""
+        mask = np.ones(len(self.doctor_ids), dtype=bool)
+        especialidades = filter_values(filters.get("especialidadId"))
+        if especialidades:
+            wanted = [self.especialidad_codes[value] for value in especialidades if value in self.especialidad_codes]
+            mask &= np.isin(self.especialidad, wanted)
+        for name in CLINIC_DIMENSIONS:
+            values = filter_values(filters.get(name))
+            if values:
+                relation = self.through_clinics[name]
+                col_codes = _codes(relation.col_ids)
+                selected = np.zeros(len(relation.col_ids), dtype=bool)
+                selected[[col_codes[value] for value in values if value in col_codes]] = True
+                mask &= relation.any_of(selected)
+        if filters.get("rimacEnsured") is not None:
+            mask &= self.rimac == int(bool(filters["rimacEnsured"]))
+        return mask
+
+    def count(self, filters: Dict[str, Any]) -> int:
+        return int(self.mask(filters).sum())
+
+    def group_counts(self, filters: Dict[str, Any], group_by: Sequence[str]) -> List[Dict[str, Any]]:
+        """Count distinct matching doctors per group, largest groups first.
+
+        ``group_by`` holds at most one of :data:`CLINIC_DIMENSIONS`, optionally
+        with ``especialidadId``: "RIMAC-covered doctors per specialty per
+        district" is ``group_counts({"seguroId": "RIMAC"}, ("especialidadId", "ubigeoId"))``.
+        """
+        mask = self.mask(filters)
+        through = [name for name in group_by if name in CLINIC_DIMENSIONS]
+        if len(through) > 1 or any(name not in DIMENSIONS for name in group_by):
+            raise ValueError(f"group_by takes especialidadId and at most one of {', '.join(CLINIC_DIMENSIONS)}")
+
+        if through:
+            relation = self.through_clinics[through[0]]
+            doctors = relation.row_codes()
+            keep = mask[doctors]
+            doctors, values = doctors[keep], relation.indices[keep]
+            value_ids = relation.col_ids
+        else:
+            doctors = np.flatnonzero(mask)
+            values, value_ids = np.zeros(doctors.size, dtype=np.int64), [None]
+
+        by_especialidad = "especialidadId" in group_by
+        if by_especialidad:
+            especialidades = self.especialidad[doctors]
+            known = especialidades >= 0
+            keys = especialidades[known] * len(value_ids) + values[known]
+            counts = np.bincount(keys, minlength=len(self.especialidad_ids) * len(value_ids))
+        else:
+            counts = np.bincount(values, minlength=len(value_ids))
+
+        groups = []
+        for key in np.flatnonzero(counts):
+            group: Dict[str, Any] = {}
+            if by_especialidad:
+                group["especialidadId"] = self.especialidad_ids[key // len(value_ids)]
+            if through:
+                group[through[0]] = value_ids[key % len(value_ids)]
+            group["doctors"] = int(counts[key])
+            groups.append(group)
+        groups.sort(key=lambda group: (-group["doctors"], [str(group.get(name)) for name in group_by]))
+        return groups
+
+    def facet_counts(self, filters: Dict[str, Any], names: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        """Facet counters of the doctors matching ``filters``, like :func:`facets.count_facets`."""
+        mask = self.mask(filters)
+        facets = {}
+        for name in names:
+            if name == "especialidadId":
+                codes = self.especialidad[mask]
+                counts = np.bincount(codes[codes >= 0], minlength=len(self.especialidad_ids))
+                value_ids = self.especialidad_ids
+            else:
+                relation = self.through_clinics[name]
+                counts, value_ids = relation.col_counts(mask), relation.col_ids
+            facets[name] = sorted_counts({value_ids[code]: int(counts[code]) for code in np.flatnonzero(counts)})
+        return facets
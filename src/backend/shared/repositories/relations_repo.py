@@ -0,0 +1,65 @@
+"""Shared coverage relations repository."""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Sequence, TYPE_CHECKING
+
+from ..backends import get_table
+from .doctors_repo import FILTER_FIELDS
+from .projection import projection_kwargs
+from .scan import iter_scan
+from .snapshot import ScanCache, get_snapshot, snapshot_enabled
+
+if TYPE_CHECKING:
+    from .relations import CoverageRelations
+
+# Attributes CoverageRelations reads from each table
+DOCTOR_FIELDS = FILTER_FIELDS
+CLINIC_FIELDS = ("clinicaId", "seguroIds", "ubigeoId")
+
+
+class RelationsRepository:
+    def __init__(self):
+        env = os.environ.get("ENVIRONMENT", "dev")
+        self.sources = (
+            (get_table(f"doctors-{env}"), "doctorId", DOCTOR_FIELDS),
+            (get_table(f"clinics-{env}"), "clinicaId", CLINIC_FIELDS),
+        )
+        self._snapshots = (
+            [get_snapshot(table, key_name) for table, key_name, _ in self.sources] if snapshot_enabled() else None
+        )
+        # Without snapshots the relations are still kept per container, not rebuilt from two scans per request
+        self._scanned = (
+            ScanCache([table for table, _, _ in self.sources], self._build_from_scans) if self._snapshots is None else None
+        )
+        self._lock = threading.Lock()
+        self._relations: tuple[tuple[int, ...], "CoverageRelations"] | None = None
+
+    def relations(self) -> "CoverageRelations":
+        """Return the sparse relations, built once per container and rebuilt when the data changes."""
+        if self._scanned is not None:
+            return self._scanned.get()
+        # Imported here so NumPy loads on the first coverage query, not at Lambda cold start
+        from .relations import CoverageRelations
+
+        generations = tuple(snapshot.generation for snapshot in self._snapshots)
+        with self._lock:
+            if self._relations is None or self._relations[0] != generations:
+                relations = CoverageRelations(*(snapshot.items() for snapshot in self._snapshots))
+                self._relations = (generations, relations)
+            return self._relations[1]
+
+    def coverage(self, filters: Dict[str, Any], group_by: Sequence[str]) -> tuple[int, List[Dict[str, Any]]]:
+        """Return the number of doctors matching ``filters`` and their counts per ``group_by`` group."""
+        relations = self.relations()
+        return relations.count(filters), relations.group_counts(filters, group_by)
+
+    def _build_from_scans(self) -> "CoverageRelations":
+        from .relations import CoverageRelations
+
+        return CoverageRelations(*(self._scan(table, fields) for table, _, fields in self.sources))
+
+    @staticmethod
+    def _scan(table, fields: Iterable[str]):
+        return list(iter_scan(table, **projection_kwargs(fields)))
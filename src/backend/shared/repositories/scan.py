@@ -0,0 +1,185 @@
+"""Paginated scan helpers shared by the DynamoDB repositories."""
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List
+
+
+# Parallel scan segments per logical table, overridable with <TABLE>_SCAN_SEGMENTS
+DEFAULT_SCAN_SEGMENTS = {
+    "doctors": 4,
+    "clinics": 1,
+}
+# Pages each parallel scan segment reads ahead of the consumer
+DEFAULT_BUFFERED_PAGES = 4
+# How often a worker blocked on a full queue checks whether the scan was abandoned
+_PUT_POLL_SECONDS = 0.05
+
+
+def scan_segments(table_key: str) -> int:
+    """Return how many parallel segments should be used to scan ``table_key``."""
+    raw = os.environ.get(f"{table_key.upper()}_SCAN_SEGMENTS")
+    if raw is None:
+        return DEFAULT_SCAN_SEGMENTS.get(table_key, 1)
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return DEFAULT_SCAN_SEGMENTS.get(table_key, 1)
+
+
+def _iter_pages(operation: Callable[..., Dict[str, Any]], prefetch: bool, kwargs: Dict[str, Any]) -> Iterator[List[Dict[str, Any]]]:
+    """Yield the ``Items`` of every page returned by a scan or query operation."""
+    kwargs = dict(kwargs)
+    if not prefetch:
+        while True:
+            response = operation(**kwargs)
+            yield response.get("Items", [])
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            kwargs["ExclusiveStartKey"] = last_key
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        future = executor.submit(operation, **kwargs)
+        while future is not None:
+            response = future.result()
+            last_key = response.get("LastEvaluatedKey")
+            if last_key:
+                kwargs["ExclusiveStartKey"] = last_key
+                future = executor.submit(operation, **kwargs)
+            else:
+                future = None
+            yield response.get("Items", [])
+    finally:
+        # Do not block on a prefetched page nobody is going to read
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_scan_pages(table, prefetch: bool = True, **scan_kwargs: Any) -> Iterator[List[Dict[str, Any]]]:
+    """Yield every page of a scan, following ``LastEvaluatedKey`` until the end.
+
+    With ``prefetch`` enabled the next page is requested on a background thread
+    while the caller is still processing the current one.
+    """
+    return _iter_pages(table.scan, prefetch, scan_kwargs)
+
+
+def iter_query(table, prefetch: bool = True, **query_kwargs: Any) -> Iterator[Dict[str, Any]]:
+    """Yield every item returned by a (possibly multi-page) query."""
+    for page in _iter_pages(table.query, prefetch, query_kwargs):
+        yield from page
+
+
+def iter_scan(table, prefetch: bool = True, **scan_kwargs: Any) -> Iterator[Dict[str, Any]]:
+    """Yield scanned items one by one across all pages."""
+    for page in iter_scan_pages(table, prefetch=prefetch, **scan_kwargs):
+        yield from page
+
+
+def _worker_table(table):
+    """Return a handle to ``table`` that one scan worker can use from its own thread.
+
+    boto3 resource ``Table`` objects are not thread-safe, so DynamoDB handles
+    provide ``worker_table()`` (a view over the thread-safe low-level client);
+    other backends are shared as they are.
+    """
+    worker_table = getattr(type(table), "worker_table", None)
+    return worker_table(table) if worker_table is not None else table
+
+
+def iter_parallel_scan(
+    table,
+    total_segments: int,
+    max_buffered_pages: int = DEFAULT_BUFFERED_PAGES,
+    **scan_kwargs: Any,
+) -> Iterator[Dict[str, Any]]:
+    """Scan ``table`` with ``total_segments`` parallel workers.
+
+    Segments are read concurrently on a thread pool, but items are yielded
+    segment by segment (0, 1, ...) so the merged order is the same on every
+    call and offset pagination over it stays stable. Each worker hands its
+    pages over through a queue holding at most ``max_buffered_pages``, so
+    segment 0 streams as it is read and the others read ahead by that much.
+    Closing the iterator early stops every worker at its next page.
+    """
+    if total_segments <= 1:
+        yield from iter_scan(table, **scan_kwargs)
+        return
+
+    stop = threading.Event()
+    # Each queue carries item pages, then None when the segment is done or the exception that ended it
+    queues: List[queue.Queue] = [queue.Queue(maxsize=max(1, max_buffered_pages)) for _ in range(total_segments)]
+
+    def hand_over(segment: int, entry: Any) -> bool:
+        while not stop.is_set():
+            try:
+                queues[segment].put(entry, timeout=_PUT_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def read_segment(segment: int) -> None:
+        try:
+            pages = iter_scan_pages(
+                _worker_table(table),
+                prefetch=False,
+                Segment=segment,
+                TotalSegments=total_segments,
+                **scan_kwargs,
+            )
+            for page in pages:
+                if not hand_over(segment, page) or stop.is_set():
+                    return
+        except Exception as exc:
+            hand_over(segment, exc)
+            return
+        hand_over(segment, None)
+
+    executor = ThreadPoolExecutor(max_workers=total_segments)
+    try:
+        for segment in range(total_segments):
+            executor.submit(read_segment, segment)
+        for pages in queues:
+            while True:
+                entry = pages.get()
+                if entry is None:
+                    break
+                if isinstance(entry, Exception):
+                    raise entry
+                yield from entry
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def scan_matching(
+    table,
+    predicate: Callable[[Dict[str, Any]], bool],
+    limit: int | None = None,
+    segments: int = 1,
+    after: Dict[str, Any] | None = None,
+    **scan_kwargs: Any,
+) -> List[Dict[str, Any]]:
+    """Return scanned items accepted by ``predicate``.
+
+    When ``limit`` is given the scan stops as soon as that many items matched,
+    so no further pages are read. ``segments`` > 1 switches to a parallel scan.
+    ``after`` is the primary key of the last item already returned: reading
+    resumes right after it with one sequential scan (``ExclusiveStartKey``),
+    also when earlier pages came from a parallel scan. Segments are
+    contiguous ranges of the sequential order, so both list items alike, and
+    DynamoDB resumes from where the key sorts even once its item is deleted.
+    """
+    if after:
+        items = iter_scan(table, ExclusiveStartKey=after, **scan_kwargs)
+    elif segments > 1:
+        items = iter_parallel_scan(table, segments, **scan_kwargs)
+    else:
+        items = iter_scan(table, **scan_kwargs)
+    return list(islice((item for item in items if predicate(item)), limit))
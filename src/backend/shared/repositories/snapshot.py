@@ -0,0 +1,277 @@
+"""Warm-container snapshots of the small reference tables.
+
+Clinics, insurers, specialties and ubigeos hold a few dozen rows and change
+only when the loaders run, so each container reads them once and serves
+lookups from memory. The doctors table is snapshotted the same way to back
+its in-memory index. A snapshot is refreshed after ``SNAPSHOT_TTL_SECONDS``;
+if the populate scripts recorded a version for the table in the
+``dataset-versions`` table, an unchanged version only costs one ``GetItem``
+and the snapshot is kept. That table is only ever read by key, so data-table
+scans never see the versions.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Sequence, TypeVar
+
+from ..backends import get_table
+from .doctor_cards import CARD_KEY
+from .scan import iter_parallel_scan
+
+T = TypeVar("T")
+
+# One {"tableName": <data table name>, "version": ...} item per loaded data table
+DATASET_VERSIONS_TABLE = "dataset-versions"
+VERSIONS_KEY = "tableName"
+# Tables served from snapshots (base name -> partition key); loaders bump the version of each one they load
+SNAPSHOT_TABLES = {
+    "clinics": "clinicaId",
+    "doctors": "doctorId",
+    "doctor-cards": CARD_KEY,
+    "especialidades": "especialidadId",
+    "seguros": "seguroId",
+    "ubigeo": "ubigeoId",
+}
+# Partition key value of the marker row loaders used to write into each data table
+LEGACY_VERSION_MARKER_KEY = "__dataset_version__"
+DEFAULT_TTL_SECONDS = 300.0
+
+
+def snapshot_enabled() -> bool:
+    return os.environ.get("SNAPSHOT_CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+
+
+def snapshot_ttl() -> float:
+    try:
+        return float(os.environ.get("SNAPSHOT_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+    except ValueError:
+        return DEFAULT_TTL_SECONDS
+
+
+class TableSnapshot:
+    """In-memory copy of a whole table keyed by its partition key.
+
+    Returned items are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        table,
+        key_name: str,
+        ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        segments: int = 1,
+        versions_table=None,
+    ):
+        self.table = table
+        self.key_name = key_name
+        self.versions_table = versions_table
+        self.ttl_seconds = snapshot_ttl() if ttl_seconds is None else ttl_seconds
+        self.segments = segments
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._items: Dict[str, Dict[str, Any]] | None = None
+        self._version: Optional[str] = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self._derived: Dict[str, tuple[int, Any]] = {}
+
+    @property
+    def version(self) -> Optional[str]:
+        self._ensure_fresh()
+        return self._version
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every reload, for caches built from several snapshots."""
+        self._ensure_fresh()
+        return self._generation
+
+    def items(self) -> List[Dict[str, Any]]:
+        self._ensure_fresh()
+        return list(self._items.values())
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        self._ensure_fresh()
+        return self._items.get(key)
+
+    def derived(self, name: str, build: Callable[[List[Dict[str, Any]]], T]) -> T:
+        """Return a structure built from the items, rebuilt whenever the snapshot reloads."""
+        with self._lock:
+            self._ensure_fresh()
+            generation, value = self._derived.get(name, (-1, None))
+            if generation != self._generation:
+                value = build(list(self._items.values()))
+                self._derived[name] = (self._generation, value)
+            return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._items = None
+            self._expires_at = 0.0
+
+    def _ensure_fresh(self) -> None:
+        if self._items is not None and self._clock() < self._expires_at:
+            return
+        with self._lock:
+            now = self._clock()
+            if self._items is not None and now < self._expires_at:
+                return
+            if self._items is not None:
+                version = self._read_version()
+                if version is not None and version == self._version:
+                    self._expires_at = now + self.ttl_seconds
+                    return
+            self._load(now)
+
+    def _load(self, now: float) -> None:
+        # Read before the scan: a load finishing mid-scan leaves an older version and a reload next time
+        version = self._read_version()
+        self._items = {item[self.key_name]: item for item in iter_parallel_scan(self.table, self.segments)}
+        self._version = version
+        self._expires_at = now + self.ttl_seconds
+        self._generation += 1
+
+    def _read_version(self) -> Optional[str]:
+        return read_dataset_version(self.table, self.versions_table)
+
+
+class StaticSnapshot:
+    """Items read once and never reloaded, behind the read interface of :class:`TableSnapshot`.
+
+    Backs request-scoped work such as a batch search answered from a single
+    scan when the container keeps no snapshot of the table.
+    """
+
+    generation = 1
+    version = None
+
+    def __init__(self, items: Iterable[Dict[str, Any]], key_name: str):
+        self.key_name = key_name
+        self._items = {item[key_name]: item for item in items}
+        self._lock = threading.Lock()
+        self._derived: Dict[str, Any] = {}
+
+    @classmethod
+    def read(cls, table, key_name: str, segments: int = 1) -> "StaticSnapshot":
+        return cls(iter_parallel_scan(table, segments), key_name)
+
+    def items(self) -> List[Dict[str, Any]]:
+        return list(self._items.values())
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        return self._items.get(key)
+
+    def derived(self, name: str, build: Callable[[List[Dict[str, Any]]], T]) -> T:
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = build(self.items())
+            return self._derived[name]
+
+
+class ScanCache(Generic[T]):
+    """A structure built from scans of ``tables``, kept by a warm container without snapshots.
+
+    With ``SNAPSHOT_CACHE_ENABLED=false`` indexes over whole tables would
+    otherwise be rebuilt from fresh scans on every request. The value is kept
+    like a :class:`TableSnapshot`: after ``ttl_seconds`` the recorded dataset
+    versions of ``tables`` are read (one ``GetItem`` each), and the value is
+    rebuilt only when one changed or none was recorded.
+    """
+
+    def __init__(
+        self,
+        tables: Sequence[Any],
+        build: Callable[[], T],
+        ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        versions_table=None,
+    ):
+        self.tables = list(tables)
+        self.ttl_seconds = snapshot_ttl() if ttl_seconds is None else ttl_seconds
+        self.versions_table = versions_table
+        self._build = build
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._value: tuple[tuple[Optional[str], ...], T] | None = None
+        self._expires_at = 0.0
+
+    def get(self) -> T:
+        with self._lock:
+            now = self._clock()
+            if self._value is not None and now < self._expires_at:
+                return self._value[1]
+            versions = tuple(read_dataset_version(table, self.versions_table) for table in self.tables)
+            if self._value is None or self._value[0] != versions or None in versions:
+                self._value = (versions, self._build())
+            self._expires_at = now + self.ttl_seconds
+            return self._value[1]
+
+
+def dataset_versions_table():
+    """Return the dataset-versions table of the current environment."""
+    env = os.environ.get("ENVIRONMENT", "dev")
+    return get_table(f"{DATASET_VERSIONS_TABLE}-{env}")
+
+
+def read_dataset_version(table, versions_table=None) -> Optional[str]:
+    """Return the dataset version recorded for ``table``, or None when none was recorded."""
+    if versions_table is None:
+        versions_table = dataset_versions_table()
+    item = versions_table.get_item(Key={VERSIONS_KEY: table.name}).get("Item")
+    return item.get("version") if item else None
+
+
+def write_dataset_version(versions_table, table_name: str, version: str) -> None:
+    """Record ``version`` as the dataset version of ``table_name``.
+
+    Called by the populate scripts after a load so warm containers notice the
+    change on their next TTL check.
+    """
+    versions_table.put_item(Item={VERSIONS_KEY: table_name, "version": version})
+
+
+def remove_legacy_version_marker(table, key_name: str) -> None:
+    """Delete the marker row older loaders wrote into ``table``, so scans stop returning it."""
+    table.delete_item(Key={key_name: LEGACY_VERSION_MARKER_KEY})
+
+
+def bump_dataset_versions(dynamodb, env: str, loaded: Iterable[str], version: str) -> List[str]:
+    """Record ``version`` for every snapshot table among ``loaded`` (base names); return their table names.
+
+    Shared by the populate scripts so both version the same tables.
+    """
+    versions_table = dynamodb.Table(f"{DATASET_VERSIONS_TABLE}-{env}")
+    bumped = []
+    for base in loaded:
+        key_name = SNAPSHOT_TABLES.get(base)
+        if key_name is None:
+            continue
+        table_name = f"{base}-{env}"
+        write_dataset_version(versions_table, table_name, version)
+        remove_legacy_version_marker(dynamodb.Table(table_name), key_name)
+        bumped.append(table_name)
+    return bumped
+
+
+# One snapshot per table name, shared by every repository in the container
+_SNAPSHOTS: Dict[str, TableSnapshot] = {}
+_SNAPSHOTS_LOCK = threading.Lock()
+
+
+def get_snapshot(table, key_name: str, segments: int = 1) -> TableSnapshot:
+    """Return the container-wide snapshot of ``table``, creating it lazily."""
+    with _SNAPSHOTS_LOCK:
+        snapshot = _SNAPSHOTS.get(table.name)
+        if snapshot is None:
+            snapshot = TableSnapshot(table, key_name, segments=segments)
+            _SNAPSHOTS[table.name] = snapshot
+        return snapshot
+
+
+def clear_snapshots() -> None:
+    """Drop every cached snapshot (mainly for tests)."""
+    with _SNAPSHOTS_LOCK:
+        _SNAPSHOTS.clear()
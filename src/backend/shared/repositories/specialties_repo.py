@@ -2,42 +2,77 @@
 from __future__ import annotations
 
 import os
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
-import boto3
 from boto3.dynamodb.conditions import Attr
 
+from ..backends import get_resource, get_table
+from .batch import batch_get_items
+from .projection import projection_kwargs
+from .scan import iter_scan
+from .snapshot import ScanCache, get_snapshot, snapshot_enabled
+from .specialty_resolver import SpecialtyResolver
+
 
 class SpecialtiesRepository:
     def __init__(self):
         env = os.environ.get("ENVIRONMENT", "dev")
         self.table_name = f"especialidades-{env}"
-        dynamodb = boto3.resource("dynamodb")
-        self.table = dynamodb.Table(self.table_name)
+        self.table = get_table(self.table_name)
+        self._snapshot = get_snapshot(self.table, "especialidadId") if snapshot_enabled() else None
+        self._resolver = (
+            ScanCache([self.table], lambda: SpecialtyResolver(self.list_specialties(None)))
+            if self._snapshot is None
+            else None
+        )
     
     def list_specialties(self, especialidad_id: str | None = None) -> List[Dict[str, str]]:
+        if self._snapshot is not None:
+            if especialidad_id:
+                item = self._snapshot.get(especialidad_id)
+                return [item] if item else []
+            return self._snapshot.items()
         if especialidad_id:
             response = self.table.get_item(Key={"especialidadId": especialidad_id})
             item = response.get("Item")
             return [item] if item else []
         else:
-            response = self.table.scan()
-            return response.get("Items", [])
+            return list(iter_scan(self.table))
+
+    def get_specialties_many(
+        self,
+        especialidad_ids: Iterable[str],
+        fields: Iterable[str] | None = None,
+    ) -> Dict[str, Dict[str, str]]:
+        """Return the specialties with the given ids keyed by especialidadId, in one round trip."""
+        if self._snapshot is not None:
+            specialties = {key: self._snapshot.get(key) for key in especialidad_ids if key}
+            return {key: specialty for key, specialty in specialties.items() if specialty}
+        projection = projection_kwargs(fields, ("especialidadId",))
+        return batch_get_items(get_resource(), self.table_name, "especialidadId", especialidad_ids, **projection)
+
+    def resolve(self, text: str, limit: int = 5) -> List[str]:
+        """Map free text such as "cardiologo" to candidate especialidadIds, best first.
+
+        The resolver is built once per snapshot load; without snapshots it is
+        kept per container and rebuilt only when the table's dataset version
+        changes.
+        """
+        if self._resolver is not None:
+            resolver = self._resolver.get()
+        else:
+            resolver = self._snapshot.derived("specialty_resolver", SpecialtyResolver)
+        return resolver.resolve(text, limit)
 
 
 class SubSpecialtiesRepository:
     def __init__(self):
         env = os.environ.get("ENVIRONMENT", "dev")
         self.table_name = f"subespecialidades-{env}"
-        dynamodb = boto3.resource("dynamodb")
-        self.table = dynamodb.Table(self.table_name)
+        self.table = get_table(self.table_name)
     
     def list_subspecialties(self, especialidad_id: str | None = None) -> List[Dict[str, str]]:
         if especialidad_id:
-            response = self.table.scan(
-                FilterExpression=Attr("especialidadId").eq(especialidad_id)
-            )
-            return response.get("Items", [])
+            return list(iter_scan(self.table, FilterExpression=Attr("especialidadId").eq(especialidad_id)))
         else:
-            response = self.table.scan()
-            return response.get("Items", [])
+            return list(iter_scan(self.table))
@@ -0,0 +1,185 @@
+"""Typo-tolerant resolution of free-text specialties to ``especialidadId``s.
+
+Terms are the normalized specialty names, their significant words, the
+practitioner forms of those words ("cardiologia" -> "cardiologo",
+"pediatria" -> "pediatra", "cirugia" -> "cirujano") and a few lay synonyms.
+Lookups use a symmetric-delete index: every term is stored under each string
+obtained by deleting up to ``max_distance`` characters from it, so a query
+only generates its own deletes and looks them up, and the handful of hits are
+confirmed with an optimal-string-alignment edit distance.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from ..text import normalize
+
+# Lay terms users type, mapped to the normalized name of a specialty
+SYNONYMS = {
+    "otorrino": "otorrinolaringologia",
+    "oculista": "oftalmologia",
+    "corazon": "cardiologia",
+    "ninos": "pediatria",
+    "huesos": "ortopedia y traumatologia",
+    "rinones": "nefrologia",
+    "pulmones": "neumologia",
+    "alergias": "alergologia",
+    "cancer": "oncologia clinica",
+    "piel": "dermatologia",
+}
+# Words too common or short to identify a specialty on their own
+STOPWORDS = {"de", "del", "en", "la", "y"}
+_MIN_WORD_LENGTH = 4
+# Resolved queries remembered per resolver; the table is small and queries repeat
+_MEMO_SIZE = 1024
+# Longest normalized free-text query accepted; deletes grow with the cube of the length
+MAX_QUERY_LENGTH = 64
+
+
+def max_distance(term: str) -> int:
+    """Edits tolerated for a term: none for short words, two for long ones."""
+    if len(term) <= 4:
+        return 0
+    return 1 if len(term) <= 8 else 2
+
+
+def edit_distance(left: str, right: str, limit: int) -> int:
+    """Optimal string alignment distance, or ``limit + 1`` once it is exceeded.
+
+    Only the diagonal band ``|i - j| <= limit`` of the table is filled, since
+    cells outside it already exceed ``limit``.
+    """
+    if left == right:
+        return 0
+    if abs(len(left) - len(right)) > limit:
+        return limit + 1
+    beyond = limit + 1
+    width = len(right) + 1
+    previous2: List[int] = []
+    previous = [j if j <= limit else beyond for j in range(width)]
+    for i, left_char in enumerate(left, 1):
+        current = [beyond] * width
+        if i <= limit:
+            current[0] = i
+        for j in range(max(1, i - limit), min(width - 1, i + limit) + 1):
+            right_char = right[j - 1]
+            best = previous[j - 1] if left_char == right_char else previous[j - 1] + 1
+            if previous[j] + 1 < best:
+                best = previous[j] + 1
+            if current[j - 1] + 1 < best:
+                best = current[j - 1] + 1
+            if i > 1 and j > 1 and left_char == right[j - 2] and left[i - 2] == right_char and previous2[j - 2] + 1 < best:
+                best = previous2[j - 2] + 1
+            current[j] = best if best < beyond else beyond
+        if min(current) > limit:
+            return beyond
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def deletes(term: str, distance: int) -> Set[str]:
+    """Every string obtained by removing up to ``distance`` characters from ``term``."""
+    variants = {term}
+    frontier = {term}
+    for _ in range(distance):
+        frontier = {word[:index] + word[index + 1:] for word in frontier for index in range(len(word))}
+        variants |= frontier
+    return variants
+
+
+def practitioner_forms(word: str) -> List[str]:
+    """Forms people use for the practitioner of a specialty word."""
+    if word.endswith("logia"):
+        return [word[:-1], word[:-2] + "o", word[:-2] + "a"]  # cardiologi, cardiologo, cardiologa
+    if word.endswith("iatria"):
+        return [word[:-3] + "ra"]  # pediatra, psiquiatra
+    if word.endswith("cirugia"):
+        return [word[:-4] + "jano", word[:-4] + "jana"]  # cirujano, neurocirujana
+    return []
+
+
+class SpecialtyResolver:
+    """Symmetric-delete index from specialty terms to ``especialidadId``s."""
+
+    def __init__(self, specialties: Iterable[Dict[str, Any]]):
+        # term -> {especialidadId: 0 for a whole-name term, 1 for a word of the name}
+        self.terms: Dict[str, Dict[str, int]] = {}
+        self.names: Dict[str, str] = {}
+        for specialty in specialties:
+            name = normalize(specialty.get("nombre") or "")
+            if not name:
+                continue
+            especialidad_id = specialty["especialidadId"]
+            self.names[especialidad_id] = name
+            self._add(name, especialidad_id, 0)
+            for word in name.split():
+                if len(word) < _MIN_WORD_LENGTH or word in STOPWORDS:
+                    continue
+                for term in (word, *practitioner_forms(word)):
+                    self._add(term, especialidad_id, 1)
+        by_name = {name: especialidad_id for especialidad_id, name in self.names.items()}
+        for synonym, name in SYNONYMS.items():
+            if name in by_name:
+                self._add(synonym, by_name[name], 1)
+
+        self._memo: Dict[str, List[str]] = {}
+        self.longest_term = max((len(term) for term in self.terms), default=0)
+        self.deletes: Dict[str, Set[str]] = {}
+        for term in self.terms:
+            for variant in deletes(term, max_distance(term)):
+                self.deletes.setdefault(variant, set()).add(term)
+
+    def _add(self, term: str, especialidad_id: str, kind: int) -> None:
+        matches = self.terms.setdefault(term, {})
+        matches[especialidad_id] = min(kind, matches.get(especialidad_id, kind))
+
+    def _lookup(self, term: str) -> Dict[str, Tuple[int, int]]:
+        """Return ``{especialidadId: (distance, kind)}`` for terms within reach of ``term``."""
+        limit = max_distance(term)
+        if len(term) - limit > self.longest_term:
+            # No indexed term is within reach; an exact lookup is all that is left
+            limit = 0
+        found: Dict[str, Tuple[int, int]] = {}
+        candidates = set()
+        for variant in deletes(term, limit):
+            candidates.update(self.deletes.get(variant, ()))
+        for candidate in candidates:
+            distance = edit_distance(term, candidate, limit)
+            if distance > limit:
+                continue
+            for especialidad_id, kind in self.terms[candidate].items():
+                found[especialidad_id] = min((distance, kind), found.get(especialidad_id, (distance, kind)))
+        return found
+
+    def resolve(self, text: str, limit: int = 5) -> List[str]:
+        """Return up to ``limit`` candidate ``especialidadId``s for ``text``, best first.
+
+        The whole text is matched first; failing that, every significant word
+        must match and the candidates of all words are intersected. Closer
+        matches, whole-name matches and shorter names rank first.
+        """
+        query = normalize(text)
+        if not query or len(query) > MAX_QUERY_LENGTH:
+            return []
+        ranked = self._memo.get(query)
+        if ranked is None:
+            ranked = self._rank(query)
+            if len(self._memo) >= _MEMO_SIZE:
+                self._memo.clear()
+            self._memo[query] = ranked
+        return ranked[:limit]
+
+    def _rank(self, query: str) -> List[str]:
+        scores = self._lookup(query)
+        words = [word for word in query.split() if word not in STOPWORDS]
+        if not scores and len(words) > 1:
+            scores = self._lookup(words[0])
+            for word in words[1:]:
+                if not scores:
+                    break
+                found = self._lookup(word)
+                scores = {
+                    key: (scores[key][0] + found[key][0], max(scores[key][1], found[key][1]))
+                    for key in scores.keys() & found.keys()
+                }
+        return sorted(scores, key=lambda key: (*scores[key], len(self.names[key]), key))
@@ -0,0 +1,64 @@
+"""Hop tables over the ubigeo ``idCercanos`` adjacency graph.
+
+Every district lists its nearby districts in ``idCercanos``. Nearness is
+symmetric, so the graph is made undirected before walking it: a district that
+only appears in a neighbour's list is still reachable from it. For each
+district, a breadth-first walk yields its rings, where ring ``n`` holds the
+districts exactly ``n`` hops away. Ring 0 is the district itself.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Sequence, Set
+
+# Largest search radius the API accepts; hop tables are precomputed up to it
+MAX_RADIUS = 3
+
+
+def adjacency(ubigeos: Iterable[Dict[str, Any]]) -> Dict[str, Set[str]]:
+    """Return the undirected neighbour sets of the ``idCercanos`` graph."""
+    graph: Dict[str, Set[str]] = {}
+    for ubigeo in ubigeos:
+        ubigeo_id = ubigeo.get("ubigeoId")
+        if not ubigeo_id:
+            continue
+        graph.setdefault(ubigeo_id, set())
+        for neighbour in ubigeo.get("idCercanos") or []:
+            if neighbour and neighbour != ubigeo_id:
+                graph[ubigeo_id].add(neighbour)
+                graph.setdefault(neighbour, set()).add(ubigeo_id)
+    return graph
+
+
+def rings_from(graph: Dict[str, Set[str]], origin: str, max_hops: int = MAX_RADIUS) -> List[List[str]]:
+    """Breadth-first rings around ``origin``; each ring is sorted for stable output."""
+    rings = [[origin]]
+    seen = {origin}
+    frontier = [origin]
+    for _ in range(max_hops):
+        ring = sorted({n for node in frontier for n in graph.get(node, ()) if n not in seen})
+        if not ring:
+            break
+        seen.update(ring)
+        rings.append(ring)
+        frontier = ring
+    return rings
+
+
+def hop_tables(ubigeos: Iterable[Dict[str, Any]], max_hops: int = MAX_RADIUS) -> Dict[str, List[List[str]]]:
+    """Precompute the rings of every district, up to ``max_hops``."""
+    graph = adjacency(ubigeos)
+    return {ubigeo_id: rings_from(graph, ubigeo_id, max_hops) for ubigeo_id in graph}
+
+
+def merge_rings(ring_lists: Iterable[Sequence[Sequence[str]]]) -> List[List[str]]:
+    """Merge the rings of several origins, listing each district under its nearest origin."""
+    hop_by_ubigeo: Dict[str, int] = {}
+    for rings in ring_lists:
+        for hop, ring in enumerate(rings):
+            for ubigeo_id in ring:
+                if hop < hop_by_ubigeo.get(ubigeo_id, hop + 1):
+                    hop_by_ubigeo[ubigeo_id] = hop
+    merged: List[List[str]] = [[] for _ in range(max(hop_by_ubigeo.values(), default=-1) + 1)]
+    for ubigeo_id, hop in hop_by_ubigeo.items():
+        merged[hop].append(ubigeo_id)
+    return [sorted(ring) for ring in merged]
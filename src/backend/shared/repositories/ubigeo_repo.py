@@ -2,23 +2,46 @@
 from __future__ import annotations
 
 import os
-from typing import Optional
+from typing import Iterable, List, Optional
 
-import boto3
+from ..backends import get_table
+from .filters import filter_values
+from .scan import iter_scan
+from .snapshot import get_snapshot, snapshot_enabled
+from .ubigeo_graph import MAX_RADIUS, hop_tables, merge_rings
 
 
 class UbigeoRepository:
     def __init__(self):
         env = os.environ.get("ENVIRONMENT", "dev")
         self.table_name = f"ubigeo-{env}"
-        dynamodb = boto3.resource("dynamodb")
-        self.table = dynamodb.Table(self.table_name)
+        self.table = get_table(self.table_name)
+        self._snapshot = get_snapshot(self.table, "ubigeoId") if snapshot_enabled() else None
     
     def exists(self, ubigeo_id: str) -> bool:
+        if self._snapshot is not None:
+            return self._snapshot.get(ubigeo_id) is not None
         response = self.table.get_item(Key={"ubigeoId": ubigeo_id})
         return "Item" in response
 
     def get_name(self, ubigeo_id: str) -> Optional[str]:
+        if self._snapshot is not None:
+            item = self._snapshot.get(ubigeo_id)
+            return item.get("nombreDistrito") if item else None
         response = self.table.get_item(Key={"ubigeoId": ubigeo_id})
         item = response.get("Item")
         return item.get("nombreDistrito") if item else None
+
+    def rings(self, ubigeo_ids: str | Iterable[str], radius: int) -> List[List[str]]:
+        """Return the districts within ``radius`` hops of ``ubigeo_ids``, one list per hop.
+
+        With several origins a district is listed under the nearest one. Hop
+        tables for every district are computed once per snapshot load.
+        """
+        radius = min(radius, MAX_RADIUS)
+        if self._snapshot is not None:
+            tables = self._snapshot.derived("hop_tables", hop_tables)
+        else:
+            tables = hop_tables(iter_scan(self.table))
+        origins = filter_values(ubigeo_ids)
+        return merge_rings(tables.get(origin, [[origin]])[:radius + 1] for origin in origins)
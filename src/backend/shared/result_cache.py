@@ -0,0 +1,98 @@
+"""Bounded LRU cache of query results for warm containers.
+
+Entries expire after a TTL and are tagged with the dataset version they were
+computed from, so a reload of the underlying tables invalidates them on the
+next lookup. Hit and miss counters are kept for :meth:`ResultCache.stats`.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL_SECONDS = 60.0
+
+
+def result_cache_enabled() -> bool:
+    return os.environ.get("SEARCH_CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+
+
+def result_cache_size() -> int:
+    try:
+        return max(0, int(os.environ.get("SEARCH_CACHE_SIZE", DEFAULT_MAX_ENTRIES)))
+    except ValueError:
+        return DEFAULT_MAX_ENTRIES
+
+
+def result_cache_ttl() -> float:
+    try:
+        return float(os.environ.get("SEARCH_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+    except ValueError:
+        return DEFAULT_TTL_SECONDS
+
+
+class ResultCache(Generic[V]):
+    """LRU map from a normalized query key to its result, with TTL and version checks.
+
+    Cached values are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = result_cache_size() if max_entries is None else max_entries
+        self.ttl_seconds = result_cache_ttl() if ttl_seconds is None else ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple[Hashable, float, V]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, version: Hashable) -> Optional[V]:
+        """Return the value cached for ``key`` at ``version``, or None (a miss)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, expires_at, value = entry
+                if entry_version == version and self._clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, version: Hashable, value: V) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (version, self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxEntries": self.max_entries,
+            }
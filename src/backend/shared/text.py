@@ -0,0 +1,29 @@
+"""Text normalization shared by the name and specialty lookups."""
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Set
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str) -> str:
+    """Fold ``text`` for accent- and case-insensitive matching.
+
+    NFKD splits accented letters into a base letter plus combining marks,
+    which are dropped ("Ñúñez" -> "nunez"). Anything that is not a letter or
+    digit becomes a single space.
+    """
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(_NON_ALNUM.sub(" ", stripped.casefold()).split())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Return the trigrams of normalized ``text``, padding each word like pg_trgm."""
+    grams: Set[str] = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
@@ -99,6 +99,44 @@ def transform_ubigeo(csv_row: Dict[str, str]) -> Dict[str, Any]:
     }
 
 
+def add_clinic_specialties(output_dir: Path) -> int:
+    """
+    Store each clinic's specialty set and doctor count on its clinicas.jsonl item.
+    
+    The API filters clinics by especialidadId, which only doctors carry, so the
+    clinic -> specialties reverse index is built here in one pass over
+    doctores.jsonl instead of joining doctors per request.
+    
+    Returns:
+        int: Number of clinics with at least one doctor
+    """
+    especialidades_by_clinica: Dict[str, Set[str]] = {}
+    doctors_by_clinica: Dict[str, Set[str]] = {}
+    with open(output_dir / 'doctores.jsonl', 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            doctor = json.loads(line)
+            for clinica_id in doctor.get('clinicaIds') or []:
+                especialidades_by_clinica.setdefault(clinica_id, set()).add(doctor['especialidadId'])
+                doctors_by_clinica.setdefault(clinica_id, set()).add(doctor['doctorId'])
+    
+    clinicas_file = output_dir / 'clinicas.jsonl'
+    with open(clinicas_file, 'r', encoding='utf-8') as f:
+        clinicas = [json.loads(line) for line in f if line.strip()]
+    with open(clinicas_file, 'w', encoding='utf-8') as f:
+        for clinica in clinicas:
+            clinica_id = clinica['clinicaId']
+            # Numeric ids sort numerically ("9" before "44")
+            clinica['especialidadIds'] = sorted(
+                especialidades_by_clinica.get(clinica_id, ()), key=lambda value: (len(value), value)
+            )
+            clinica['doctorCount'] = len(doctors_by_clinica.get(clinica_id, ()))
+            f.write(json.dumps(clinica, ensure_ascii=False) + '\n')
+    
+    return sum(1 for clinica in clinicas if clinica['doctorCount'])
+
+
 def analyze_data_relationships() -> tuple[Set[str], Set[str], Set[str]]:
     """
     Pre-analyze data to identify valid relationships.
@@ -320,6 +358,11 @@ def main():
             print(f"  ✅ Included: {included} items")
         print(f"     Output: {output_file}")
     
+    if (output_dir / 'doctores.jsonl').exists() and (output_dir / 'clinicas.jsonl').exists():
+        print("\n📄 Deriving clinic specialties from doctores.jsonl...")
+        staffed = add_clinic_specialties(output_dir)
+        print(f"  ✅ Clinics with doctors: {staffed}")
+    
     print("\n" + "=" * 80)
     print("TRANSFORMATION COMPLETE")
     print("=" * 80)
@@ -333,6 +376,7 @@ def main():
     print("✓ Only specialties used by doctors with clinics were included")
     print("✓ Only clinics with valid location data were included")
     print("✓ Only ubigeos used by clinics were included")
+    print("✓ Clinics carry the especialidadIds and doctorCount of their doctors")
     print("\n💡 This ensures all data represents doctors actively working at physical clinics")
     print("\nNext steps:")
     print("1. Review transformed data in the 'transformed/' directory")